@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-tick collection cost of the psutil and procfs backends.
+
+Usage: python scripts/bench_collectors.py [ticks]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.collectors import create_sources, resolve_backend
+
+
+def bench(backend, ticks):
+    """Return (mean, best) seconds per tick for one backend"""
+    sources = create_sources(backend)
+    per_tick = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        now = time.monotonic()
+        for source in sources:
+            source.sample(now)
+        per_tick.append(time.perf_counter() - start)
+    return sum(per_tick) / len(per_tick), min(per_tick)
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'Backend':<10} {'Mean/tick':>12} {'Best/tick':>12}  ({ticks} ticks)")
+    print("=" * 40)
+    results = {}
+    for backend in ('psutil', 'procfs'):
+        if resolve_backend(backend) != backend:
+            print(f"{backend:<10} {'unavailable on this platform':>26}")
+            continue
+        mean, best = bench(backend, ticks)
+        results[backend] = mean
+        print(f"{backend:<10} {mean * 1e6:>10.1f}us {best * 1e6:>10.1f}us")
+    if len(results) == 2:
+        print(f"\nprocfs speedup: {results['psutil'] / results['procfs']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
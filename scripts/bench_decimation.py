@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-frame cost of drawing-side decimation across window sizes.
+
+For each window (in samples) the store is filled, then every frame appends
+one sample and reduces the series for an 1000-pixel plot.  "full" reduces
+from scratch every frame; "cached" reuses the completed buckets.
+
+Usage: python scripts/bench_decimation.py [frames]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.decimate import Decimator
+from sysmon.store import TimeSeriesStore
+
+PIXELS = 1000
+INTERVAL = 0.05  # Seconds between samples
+WINDOWS = (5000, 20000, 100000, 500000)
+
+
+def bench(method, samples, frames, cached):
+    """Return (mean seconds per frame, points drawn) for one configuration"""
+    rng = np.random.default_rng(0)
+    store = TimeSeriesStore(('time', 'cpu'), samples)
+    t = 0.0
+    for _ in range(samples):
+        t += INTERVAL
+        store.append({'time': t, 'cpu': rng.random() * 100})
+    span = samples * INTERVAL
+    decimator = Decimator(method)
+    decimator.decimate('cpu', store['time'], store['cpu'], span, PIXELS, store, store.appended)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        t += INTERVAL
+        store.append({'time': t, 'cpu': rng.random() * 100})
+        appended = store.appended if cached else None
+        x, _ = decimator.decimate('cpu', store['time'], store['cpu'], span, PIXELS,
+                                  store, appended)
+    return (time.perf_counter() - start) / frames, len(x)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{'Samples':>8} {'Method':<6} {'Full/frame':>12} {'Cached/frame':>14} {'Points':>8}"
+          f"  ({PIXELS} px, {frames} frames)")
+    print("=" * 56)
+    for samples in WINDOWS:
+        for method in ('m4', 'lttb'):
+            full, _ = bench(method, samples, frames, cached=False)
+            cached, points = bench(method, samples, frames, cached=True)
+            print(f"{samples:>8} {method:<6} {full * 1e3:>10.2f}ms {cached * 1e3:>12.2f}ms {points:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Benchmark: procfs reads and wall time per process scan, before and after
+the shared process snapshot.
+
+"per-call" repeats what the three drill-down workers used to do: every
+view walks the process list and calls cpu_times(), memory_percent(),
+io_counters(), connections() and cmdline() one at a time, so each call
+re-opens the process's stat/status/io files.  "snapshot" is one
+ProcessSnapshotSource scan: the views' declared attrs read together under
+oneshot(), one system-wide socket table, command lines only for the rows
+shown (and cached between scans).
+
+Reads are counted by wrapping psutil's procfs helpers (every file it
+opens, plus the directory listings and readlinks of the fd walk), so
+each counted read stands for an open/read/close of one procfs entry;
+the figure is the same whether or not strace is available.  Linux only.
+
+The second table compares the ways of counting sockets per process:
+connections() per process (the old network worker, which re-parses the
+socket tables for every process), psutil.net_connections() grouped by
+pid, and sysmon.procfs.SocketTable reading /proc/net or netlink
+sock_diag.  ``--sockets N`` opens N extra bound UDP sockets first to
+make the socket tables look like a busy host's.
+
+Usage: python scripts/bench_process_scan.py [scans] [--sockets N]
+"""
+
+import collections
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psutil
+
+import sysmon.procfs
+from sysmon.procfs import SocketTable
+from sysmon.processes import ProcessSnapshotSource, connection_counts
+
+READS = collections.Counter()
+
+
+def count_reads():
+    """Wrap psutil's procfs readers so every file or fd-dir access is counted"""
+    import psutil._common
+    import psutil._pslinux
+
+    def counted(kind, func):
+        def wrapper(path, *args, **kwargs):
+            # Socket tables (/proc/net/*) are per scan, not per process
+            READS['socket tables' if '/net/' in str(path) else kind] += 1
+            return func(path, *args, **kwargs)
+        return wrapper
+
+    for module in (psutil._common, psutil._pslinux):
+        for name in ('open_binary', 'open_text'):
+            if hasattr(module, name):
+                setattr(module, name, counted('process files', getattr(module, name)))
+    # The fd walks (psutil's and SocketTable's) go through os directly
+    counted_os = type(os)('os_counted')
+    counted_os.__dict__.update(os.__dict__)
+    counted_os.listdir = counted('fd walk', os.listdir)
+    counted_os.readlink = counted('fd walk', os.readlink)
+    counted_os.readv = counted('socket tables', os.readv)
+    psutil._pslinux.os = sysmon.procfs.os = counted_os
+
+
+def connections(proc):
+    # Renamed to net_connections() in psutil 6
+    return getattr(proc, 'net_connections', proc.connections)(kind='inet')
+
+
+def per_call_scan():
+    """The old workers: one walk per view, one attribute call at a time"""
+    for view in ('cpu', 'disk', 'net'):
+        for proc in psutil.process_iter(['pid', 'name']):
+            try:
+                if view == 'cpu':
+                    proc.cpu_times()
+                    proc.memory_percent()
+                elif view == 'disk':
+                    proc.io_counters()
+                elif not connections(proc):
+                    continue
+                proc.cmdline()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+
+def per_process_counts():
+    """The old network worker: connections() for every process"""
+    counts = {}
+    for proc in psutil.process_iter(['pid']):
+        try:
+            counts[proc.pid] = len(connections(proc))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return counts
+
+
+def open_sockets(count):
+    """Bind ``count`` UDP sockets on loopback; returns them (keep them open)"""
+    sockets = []
+    for _ in range(count):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        sockets.append(sock)
+    return sockets
+
+
+def time_ms(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000.0 / repeat
+
+
+def bench(scan, scans):
+    """Return (procfs reads per process, ms per scan, reads per process by kind)"""
+    scan()  # Warm up: first sight of every process, caches filled
+    READS.clear()
+    processes = 0
+    start = time.perf_counter()
+    for _ in range(scans):
+        processes += len(psutil.pids())
+        scan()
+    elapsed = time.perf_counter() - start
+    breakdown = {kind: count / processes for kind, count in sorted(READS.items())}
+    return sum(breakdown.values()), elapsed * 1000.0 / scans, breakdown
+
+
+def main():
+    if not sys.platform.startswith('linux'):
+        print("procfs read counting needs Linux")
+        return
+    args = sys.argv[1:]
+    extra = 0
+    if '--sockets' in args:
+        at = args.index('--sockets')
+        extra = int(args[at + 1])
+        del args[at:at + 2]
+    scans = int(args[0]) if args else 5
+    held = open_sockets(extra)
+    count_reads()
+    source = ProcessSnapshotSource()
+    print(f"{len(psutil.pids())} processes, {scans} scans each\n")
+    print(f"{'Scan':<10} {'Reads/proc':>11} {'ms/scan':>10}  breakdown")
+    print("=" * 60)
+    results = {}
+    for name, scan in (('per-call', per_call_scan),
+                       ('snapshot', lambda: source.sample(time.monotonic()))):
+        reads, ms, breakdown = bench(scan, scans)
+        results[name] = (reads, ms)
+        print(f"{name:<10} {reads:>11.1f} {ms:>10.1f}  " +
+              ", ".join(f"{kind} {count:.1f}" for kind, count in breakdown.items()))
+    (before, before_ms), (after, after_ms) = results['per-call'], results['snapshot']
+    print(f"\nsnapshot: {before / after:.1f}x fewer procfs reads, "
+          f"{before_ms / after_ms:.1f}x faster per scan")
+
+    sockets = len(SocketTable().read_inodes())
+    print(f"\n{sockets} sockets with an owner ({len(held)} opened by this benchmark)\n")
+    print(f"{'Socket counts':<28} {'ms/scan':>10}")
+    print("=" * 40)
+    netlink, tables = SocketTable(), SocketTable()
+    tables.netlink = False
+    for name, func in (('connections() per process', per_process_counts),
+                       ('net_connections() grouped', connection_counts),
+                       ('SocketTable, /proc/net', tables.counts),
+                       ('SocketTable, sock_diag', netlink.counts)):
+        print(f"{name:<28} {time_ms(func, scans):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
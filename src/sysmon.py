@@ -10,15 +10,17 @@ Professional system monitoring with XDG compliance and advanced features
 import sys
 import os
 import atexit
-import time
-from collections import deque
+
+# Headless recording must not import Qt, so dispatch before the GUI imports
+if __name__ == '__main__' and '--headless' in sys.argv[1:]:
+    from sysmon.headless import main as headless_main
+    sys.exit(headless_main(sys.argv[1:]))
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                               QHBoxLayout, QLabel)
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QPalette
 import pyqtgraph as pg
-import psutil
 
 # --- Modular imports ---
 from sysmon.constants import (VERSION, RELEASE_DATE, RELEASE_TIME, FULL_VERSION,
@@ -35,9 +37,17 @@ from sysmon.menu import MenuMixin
 from sysmon.updates import UpdatesMixin
 from sysmon.markdown_render import MarkdownMixin
 from sysmon.data import DataMixin
+from sysmon.store import MetricStore, METRIC_GROUPS
+from sysmon.curves import CurvePool, Envelope, ScrollingCurve
+from sysmon.smoothing import Smoother
+from sysmon.decimate import Decimator
+from sysmon.ranking import ProcessRankings
 from sysmon.window import WindowMixin
 from sysmon.settings import SettingsMixin
 from sysmon.about import AboutMixin
+from sysmon.replay import ReplayMixin
+from sysmon.rendering import RenderingMixin
+from sysmon.profiler import FrameProfiler, ProfilerMixin
 
 # Apply stderr filtering at startup
 filter_stderr_gdkpixbuf()
@@ -45,7 +55,7 @@ filter_stderr_gdkpixbuf()
 
 class SystemMonitor(ThemeMixin, MenuMixin, UpdatesMixin, MarkdownMixin,
                     DataMixin, WindowMixin, SettingsMixin, AboutMixin,
-                    QMainWindow):
+                    ReplayMixin, RenderingMixin, ProfilerMixin, QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"SysMon {VERSION}")
@@ -82,9 +92,26 @@ class SystemMonitor(ThemeMixin, MenuMixin, UpdatesMixin, MarkdownMixin,
         self.smoothing_window = 1  # Number of data points to average (1 = no smoothing)
         self.min_smoothing = 1     # Minimum smoothing (raw data)
         self.max_smoothing = 20    # Maximum smoothing (20-point moving average)
+        self.smoothing_mode = 'sma'  # Filter used when smoothing_window > 1 (SMOOTHING_MODES)
+        self.smoother = Smoother()   # Per-series smoothed copies, updated incrementally
+        self.decimation = 'm4'       # 'm4', 'lttb' or 'off' (DECIMATION_METHODS)
+        self.decimator = Decimator()  # Per-series reduction to a few points per pixel
+        self.use_opengl = False       # OpenGL rendering preference (opt-in)
+        self.opengl_active = False    # Whether the plots currently draw through OpenGL
+        self._opengl_probe = None     # Cached probe_opengl() result
+        self._benchmark = None        # Render benchmark state while one is running
+        self._time_buffers = {}      # Source group -> reusable relative-time buffer
+        self.profiler = FrameProfiler()  # Per-section wall times of the sample/render pipeline
+        self.show_frame_timings = False  # Frame timing overlay (View menu)
+        self.time_axes = {}          # Source group -> (axis drawn last frame, store, appended)
         self.current_theme = 'dark'  # ThemeManager theme name
         self.theme_actions = {}      # Populated by setup_menu_bar()
         self.line_thickness = 2    # Graph line thickness (1-10, default 2)
+        self.collector_backend = 'auto'  # 'auto', 'psutil' or 'procfs' (Linux only)
+        self.cpu_per_core = False  # Per-core CPU heatmap instead of the aggregate curve
+        self.per_device = {'disk': False, 'net': False}  # Per-disk / per-NIC breakdowns
+        self.device_columns = {'disk': None, 'net': None}
+        self._device_ranking = {'disk': ([], 0.0), 'net': ([], 0.0)}
 
         # Update checking configuration
         self.auto_check_updates = False  # Auto-check for updates on startup
@@ -94,19 +121,25 @@ class SystemMonitor(ThemeMixin, MenuMixin, UpdatesMixin, MarkdownMixin,
 
         self.max_points = int((self.time_window * 1000) / self.update_interval)
 
-        # Data storage
-        self.cpu_data = deque(maxlen=self.max_points)
-        self.disk_read_data = deque(maxlen=self.max_points)
-        self.disk_write_data = deque(maxlen=self.max_points)
-        self.disk_read_mb_data = deque(maxlen=self.max_points)
-        self.disk_write_mb_data = deque(maxlen=self.max_points)
-        self.net_sent_data = deque(maxlen=self.max_points)
-        self.net_recv_data = deque(maxlen=self.max_points)
-        self.net_sent_mb_data = deque(maxlen=self.max_points)
-        self.net_recv_mb_data = deque(maxlen=self.max_points)
-        self.time_data = deque(maxlen=self.max_points)
-        self.ram_percent_data = deque(maxlen=self.max_points)
-        self.swap_percent_data = deque(maxlen=self.max_points)
+        # Data storage (preallocated ring buffers, one table per metric source)
+        self.store = MetricStore(METRIC_GROUPS, self.max_points)
+        self.plot_store = self.store  # What the plots and hover show: live store or a history page
+
+        # Persistent on-disk history (opened with the sampler), scrolled with PageUp/PageDown
+        self.history = None
+        self.rollups = None  # Min/max/avg/last tiers used for wide time windows
+        self.history_view_end = None  # Epoch end of the history page on screen; None = live
+        self.plot_detail = True  # False while plots show history or rollups (aggregates only)
+
+        # Top-N processes per interval, drawn by View > Process Timeline
+        self.process_rankings = ProcessRankings()
+
+        # Recording replay (File > Open Recording or --replay FILE)
+        self.replay = None
+        self.replay_store = None
+        self.replay_timer = None
+        self.replay_speed = 1
+        self.replay_paused = False
 
         # Memory data storage
         self.ram_total = 0
@@ -116,15 +149,6 @@ class SystemMonitor(ThemeMixin, MenuMixin, UpdatesMixin, MarkdownMixin,
         self.swap_available = 0
         self.swap_percent = 0
 
-        # Previous values for rate calculation
-        self.prev_disk_io = psutil.disk_io_counters()
-        self.prev_net_io = psutil.net_io_counters()
-        self.prev_time = time.time()
-
-        # Async process analysis attributes
-        self.process_worker = None
-        self.process_thread = None
-
         self.setup_ui()
         self.setup_hover_tracking()
         self.setup_menu_bar()
@@ -169,6 +193,11 @@ class SystemMonitor(ThemeMixin, MenuMixin, UpdatesMixin, MarkdownMixin,
         self.cpu_plot.setXRange(-self.time_window, 0)
         self.cpu_plot.showGrid(x=True, y=True, alpha=0.3)
         self.cpu_curve = self.cpu_plot.plot(pen=pg.mkPen(color='#00ff00', width=self.line_thickness))
+        # Per-core heatmap (cores x time), shown instead of the curve in per-core mode
+        self.cpu_heatmap = pg.ImageItem()
+        self.cpu_heatmap.setColorMap(pg.colormap.get('inferno'))
+        self.cpu_heatmap.setVisible(False)
+        self.cpu_plot.addItem(self.cpu_heatmap)
         self.cpu_plot.scene().sigMouseClicked.connect(
             lambda evt: self.show_realtime_processes('cpu') if evt.button() == Qt.MiddleButton else None)
         main_layout.addWidget(self.cpu_plot)
@@ -196,6 +225,7 @@ class SystemMonitor(ThemeMixin, MenuMixin, UpdatesMixin, MarkdownMixin,
         self.disk_read_curve = self.disk_plot.plot(pen=pg.mkPen(color='#ff6b6b', width=self.line_thickness), name='Read')
         self.disk_write_curve = self.disk_plot.plot(pen=pg.mkPen(color='#4ecdc4', width=self.line_thickness), name='Write')
         self.disk_plot.addLegend()
+        self.disk_curve_pool = CurvePool(self.disk_plot, self.line_thickness)
         self.disk_plot.scene().sigMouseClicked.connect(
             lambda evt: self.show_realtime_disk() if evt.button() == Qt.MiddleButton else None)
         main_layout.addWidget(self.disk_plot)
@@ -209,13 +239,43 @@ class SystemMonitor(ThemeMixin, MenuMixin, UpdatesMixin, MarkdownMixin,
         self.net_sent_curve = self.net_plot.plot(pen=pg.mkPen(color='#ff9ff3', width=self.line_thickness), name='Sent')
         self.net_recv_curve = self.net_plot.plot(pen=pg.mkPen(color='#54a0ff', width=self.line_thickness), name='Received')
         self.net_plot.addLegend()
+        self.net_curve_pool = CurvePool(self.net_plot, self.line_thickness)
+        self.curve_pools = {'disk': self.disk_curve_pool, 'net': self.net_curve_pool}
         self.net_plot.scene().sigMouseClicked.connect(
             lambda evt: self.show_realtime_network() if evt.button() == Qt.MiddleButton else None)
         main_layout.addWidget(self.net_plot)
 
+        # Min/max bands drawn behind the curves when plotting rollup buckets
+        self.envelopes = {
+            'cpu': Envelope(self.cpu_plot, self.cpu_curve),
+            'ram_percent': Envelope(self.memory_plot, self.mem_ram_curve),
+            'swap_percent': Envelope(self.memory_plot, self.mem_swap_curve),
+            'disk_read': Envelope(self.disk_plot, self.disk_read_curve),
+            'disk_write': Envelope(self.disk_plot, self.disk_write_curve),
+            'net_sent': Envelope(self.net_plot, self.net_sent_curve),
+            'net_recv': Envelope(self.net_plot, self.net_recv_curve),
+        }
+
+        # Append-only twins of the curves, used while the live store is drawn undecimated
+        self.scrolling_curves = {}
+        for column, plot, curve in (('cpu', self.cpu_plot, self.cpu_curve),
+                                    ('ram_percent', self.memory_plot, self.mem_ram_curve),
+                                    ('swap_percent', self.memory_plot, self.mem_swap_curve),
+                                    ('disk_read', self.disk_plot, self.disk_read_curve),
+                                    ('disk_write', self.disk_plot, self.disk_write_curve),
+                                    ('net_sent', self.net_plot, self.net_sent_curve),
+                                    ('net_recv', self.net_plot, self.net_recv_curve)):
+            self.scrolling_curves[column] = ScrollingCurve(curve)
+            plot.addItem(self.scrolling_curves[column])
+
         # Apply plot theme now that plots exist
         self.apply_system_theme_to_plots()
 
+        # Frame timing instrumentation: paint times and the (hidden) overlay
+        for plot in (self.cpu_plot, self.memory_plot, self.disk_plot, self.net_plot):
+            self.instrument_paint(plot)
+        self.setup_profiler_hud()
+
         # Connect to state change signals to auto-save when user inverts axes
         # All graphs share the same invert_axis setting
         self.cpu_plot.getPlotItem().getViewBox().sigStateChanged.connect(self.on_axis_changed)
@@ -273,6 +333,12 @@ def main():
     # Register cleanup for single instance resources
     atexit.register(cleanup_single_instance)
 
+    # --replay FILE: play a headless recording instead of the live view
+    if '--replay' in sys.argv[1:]:
+        index = sys.argv.index('--replay')
+        if index + 1 < len(sys.argv):
+            monitor.open_recording(sys.argv[index + 1])
+
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
@@ -1,14 +1,33 @@
 """
 SysMon - PyQtGraph-based System Monitor
 Modular package providing real-time CPU, Disk I/O, and Network monitoring.
+
+The Qt mixins are imported on first access so that the collection modules
+(collectors, sampler, store, recording, headless) can be used on hosts
+without PyQt5 or pyqtgraph.
 """
 
+from importlib import import_module
+
 from .constants import VERSION, FULL_VERSION
-from .theme import ThemeMixin
-from .menu import MenuMixin
-from .updates import UpdatesMixin
-from .markdown_render import MarkdownMixin
-from .data import DataMixin
-from .window import WindowMixin
-from .settings import SettingsMixin
-from .about import AboutMixin
+
+_LAZY_EXPORTS = {
+    'ThemeMixin': '.theme',
+    'MenuMixin': '.menu',
+    'UpdatesMixin': '.updates',
+    'MarkdownMixin': '.markdown_render',
+    'DataMixin': '.data',
+    'WindowMixin': '.window',
+    'SettingsMixin': '.settings',
+    'AboutMixin': '.about',
+    'ReplayMixin': '.replay',
+    'RenderingMixin': '.rendering',
+    'ProfilerMixin': '.profiler',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
@@ -1,122 +1,72 @@
 """
 SysMon About/Help Mixin
 Help menu dialogs: about, changelog, users guide, keyboard shortcuts,
-issue tracker, and real-time process/disk/network drill-down launchers.
+issue tracker, and real-time process/disk/network drill-down and process
+timeline launchers.
 """
 
 import os
 import datetime
+import heapq
 import webbrowser
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-                              QLabel, QTextEdit, QTextBrowser, QMessageBox,
-                              QProgressDialog, QApplication)
-from PyQt5.QtCore import Qt, QThread
+                              QLabel, QTextEdit, QTextBrowser, QMessageBox)
+from PyQt5.QtCore import Qt
 
 from pyqt_app_info import AppIdentity, gather_info
 
 from sysmon.constants import (VERSION, RELEASE_DATE, FULL_VERSION,
                                BUILD_INFO, APPLICATION_START_TIME,
                                PYTHON_VERSION, PLATFORM_INFO, RELEASE_TIME)
-from sysmon.dialogs import (ProcessWorker, ProcessInfoDialog,
+from sysmon.dialogs import (ProcessInfoDialog,
                              RealTimeProcessDialog, RealTimeDiskDialog,
-                             RealTimeNetworkDialog)
+                             RealTimeNetworkDialog, ProcessTimelineDialog)
 
 
 class AboutMixin:
     """Help menu dialog methods for SystemMonitor."""
 
     def show_top_processes(self, metric_type):
-        """Show top processes for the specified metric with async processing"""
-        # Create progress dialog
-        progress = QProgressDialog("Analyzing processes...", "Cancel", 0, 100, self)
-        progress.setWindowTitle("Process Analysis")
-        progress.setWindowModality(Qt.WindowModal)
-        progress.setMinimumDuration(0)
-        progress.show()
-
-        # Create worker and thread
-        self.process_worker = ProcessWorker(metric_type)
-        self.process_thread = QThread()
-
-        # Move worker to thread
-        self.process_worker.moveToThread(self.process_thread)
-
-        # Connect signals
-        self.process_worker.finished.connect(self.process_thread.quit)
-        self.process_worker.finished.connect(self.process_worker.deleteLater)
-        self.process_worker.error.connect(self.process_thread.quit)
-        self.process_worker.error.connect(self.process_worker.deleteLater)
-        self.process_worker.progress.connect(progress.setValue)
-        self.process_thread.started.connect(self.process_worker.run)
-
-        # Handle completion
-        self.process_worker.finished.connect(lambda top_procs: self.on_process_analysis_complete(top_procs, metric_type, progress))
-        self.process_worker.error.connect(lambda error: self.on_process_analysis_error(error, progress))
-
-        # Handle cancellation
-        progress.canceled.connect(self.cancel_process_analysis)
-
-        # Start analysis
-        self.process_thread.start()
-
-        # Keep the event loop responsive
-        QApplication.processEvents()
-
-    def cancel_process_analysis(self):
-        """Cancel the ongoing process analysis"""
-        if hasattr(self, 'process_worker') and self.process_worker:
-            self.process_worker.cancel()
-        if hasattr(self, 'process_thread') and self.process_thread:
-            self.process_thread.quit()
-            self.process_thread.wait()
-
-    def on_process_analysis_complete(self, top_procs, metric_type, progress):
-        """Handle completion of process analysis"""
-        progress.close()
-
-        if not top_procs:
-            QMessageBox.information(self, "No Data", "No process data available.")
+        """Show top processes for the specified metric from the latest process snapshot"""
+        view = metric_type if metric_type in ('cpu', 'disk') else 'net'
+        snapshot = self.process_service.latest
+        if snapshot is None or view not in snapshot.views:
+            # Not being scanned for this metric: scan once for it, show it when it arrives
+            self.process_service.scan_once(
+                view, lambda snapshot: self.show_top_processes_of(metric_type, snapshot))
             return
+        self.show_top_processes_of(metric_type, snapshot)
 
+    def show_top_processes_of(self, metric_type, snapshot):
+        """Show the top processes of one snapshot for the specified metric"""
         # Format output
         if metric_type == 'cpu':
             title = "Top 10 CPU Consumers"
             header = f"{'PID':<8} {'Name':<30} {'CPU %':>12}\n" + "="*52 + "\n"
-            lines = [f"{p['pid']:<8} {p['name'][:30]:<30} {p['cpu_percent']:>11.1f}%"
-                    for p in top_procs]
-        else:
-            if metric_type == 'disk':
-                title = "Top 10 Disk I/O Processes"
-                sort_key = 'disk_mb'
-                header = f"{'PID':<8} {'Name':<30} {'MB':>12}\n" + "="*52 + "\n"
-                lines = [f"{p['pid']:<8} {p['name'][:30]:<30} {p[sort_key]:>11.2f}"
-                        for p in top_procs]
-            else:  # network
-                title = "Top 10 Network-Active Processes"
-                sort_key = 'net_connections'
-                header = f"{'PID':<8} {'Name':<30} {'Connections':>12}\n" + "="*52 + "\n"
-                lines = [f"{p['pid']:<8} {p['name'][:30]:<30} {p[sort_key]:>12}"
-                        for p in top_procs]
+            lines = [f"{p.pid:<8} {p.name[:30]:<30} {p.cpu_percent or 0.0:>11.1f}%"
+                    for p in snapshot.top('cpu')]
+        elif metric_type == 'disk':
+            title = "Top 10 Disk I/O Processes"
+            header = f"{'PID':<8} {'Name':<30} {'MB':>12}\n" + "="*52 + "\n"
+            top_procs = heapq.nlargest(10, snapshot.processes, key=lambda p: p.total_io)
+            lines = [f"{p.pid:<8} {p.name[:30]:<30} {p.total_io:>11.2f}"
+                    for p in top_procs if p.total_io > 0]
+        else:  # network
+            title = "Top 10 Network-Active Processes"
+            header = f"{'PID':<8} {'Name':<30} {'Connections':>12}\n" + "="*52 + "\n"
+            lines = [f"{p.pid:<8} {p.name[:30]:<30} {p.connections:>12}"
+                    for p in snapshot.top('net')]
+
+        if not lines:
+            QMessageBox.information(self, "No Data", "No process data available.")
+            return
 
         output = header + "\n".join(lines)
 
         dialog = ProcessInfoDialog(title, output, self)
         dialog.exec_()
 
-        # Clean up thread
-        if hasattr(self, 'process_thread') and self.process_thread:
-            self.process_thread.deleteLater()
-
-    def on_process_analysis_error(self, error, progress):
-        """Handle process analysis error"""
-        progress.close()
-        QMessageBox.critical(self, "Error", error)
-
-        # Clean up thread
-        if hasattr(self, 'process_thread') and self.process_thread:
-            self.process_thread.deleteLater()
-
     def show_changelog(self):
         """Show changelog dialog with rendered markdown"""
         changelog_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'docs', 'CHANGELOG.md')
@@ -302,17 +252,22 @@ class AboutMixin:
     def show_realtime_processes(self, metric_type):
         """Show real-time process monitoring dialog"""
         if metric_type == 'cpu':
-            dialog = RealTimeProcessDialog(self)
+            dialog = RealTimeProcessDialog(self.process_service, self)
             dialog.exec_()
 
     def show_realtime_disk(self):
         """Show real-time disk I/O monitoring dialog"""
-        dialog = RealTimeDiskDialog(self)
+        dialog = RealTimeDiskDialog(self.process_service, self)
         dialog.exec_()
 
     def show_realtime_network(self):
         """Show real-time network monitoring dialog"""
-        dialog = RealTimeNetworkDialog(self)
+        dialog = RealTimeNetworkDialog(self.process_service, self)
+        dialog.exec_()
+
+    def show_process_timeline(self):
+        """Show the top-processes-over-time waterfall"""
+        dialog = ProcessTimelineDialog(self.process_rankings, self.process_service, self)
         dialog.exec_()
 
     def show_keyboard_shortcuts(self):
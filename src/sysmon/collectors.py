@@ -0,0 +1,239 @@
+"""
+SysMon Collectors
+Metric sources that read system counters and turn them into plotted samples.
+
+Sources are plain Python objects (no Qt) so they can run on the sampler
+thread.  Each one returns a dict of store column -> value from sample(now),
+where ``now`` is a time.monotonic() timestamp taken by the caller.
+
+``interval`` is how often (seconds) a source wants to be sampled; None
+means every sampler tick.  Slowly changing metrics such as memory and
+swap declare a longer interval so they aren't re-read on every CPU tick.
+"""
+
+import os
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+import psutil
+
+MB = 1024 ** 2
+
+
+@lru_cache(maxsize=None)
+def is_whole_disk(name):
+    """True unless name is a Linux partition (partitions have no /sys/block entry)"""
+    if not sys.platform.startswith('linux'):
+        return True
+    return os.path.exists('/sys/block/' + name.replace('/', '!'))
+
+
+class DeviceRates:
+    """Per-device counter deltas computed in one vectorised step per tick.
+
+    Counters arrive as a device-name tuple plus an int64 array of shape
+    (devices, k).  While the device set is unchanged the rate is a single
+    array subtraction; when devices appear or vanish (hot-plugged disks,
+    container veth interfaces) the previous counters are re-aligned once.
+    """
+
+    def __init__(self):
+        self.names = None
+        self.prev = None
+        self.prev_time = None
+
+    def update(self, names, counters, now):
+        """Return MB/s per device and column, or None until a baseline exists"""
+        prev, prev_names, prev_time = self.prev, self.names, self.prev_time
+        self.names, self.prev, self.prev_time = names, counters, now
+        if prev is None or now <= prev_time:
+            return None
+        if names != prev_names:
+            index = {name: i for i, name in enumerate(prev_names)}
+            aligned = counters.copy()  # New devices start with a zero delta
+            for i, name in enumerate(names):
+                j = index.get(name)
+                if j is not None:
+                    aligned[i] = prev[j]
+            prev = aligned
+        return np.maximum(counters - prev, 0) / MB / (now - prev_time)
+
+
+class CpuSource:
+    """Aggregate CPU utilisation, plus one value per logical CPU when per_core is set"""
+    name = 'cpu'
+    interval = None
+
+    def __init__(self, per_core=False):
+        self.per_core = per_core
+        # Prime the counters; the first call always returns 0.0
+        psutil.cpu_percent()
+        if per_core:
+            psutil.cpu_percent(percpu=True)
+
+    def sample(self, now):
+        sample = {'cpu': psutil.cpu_percent()}
+        if self.per_core:
+            sample['cpu_cores'] = np.array(psutil.cpu_percent(percpu=True))
+        return sample
+
+
+class DiskSource:
+    """System-wide disk read/write rates, plus per-disk rates when per_device is set"""
+    name = 'disk'
+    interval = None
+
+    def __init__(self, per_device=False):
+        self.per_device = per_device
+        self.device_rates = DeviceRates()
+        self.prev_io = psutil.disk_io_counters()
+        self.prev_time = time.monotonic()
+        if per_device:
+            self.sample_devices(self.prev_time)  # Baseline for the per-device deltas
+
+    def sample_devices(self, now):
+        """Return (names, MB/s array of shape (disks, 2: read, write)) or None"""
+        per_disk = psutil.disk_io_counters(perdisk=True) or {}
+        names = tuple(name for name in per_disk if is_whole_disk(name))
+        counters = np.array([(per_disk[n].read_bytes, per_disk[n].write_bytes) for n in names],
+                            dtype=np.int64).reshape(-1, 2)
+        rates = self.device_rates.update(names, counters, now)
+        return None if rates is None else (names, rates)
+
+    def sample(self, now):
+        sample = {}
+        if self.per_device:
+            devices = self.sample_devices(now)
+            if devices is not None:
+                sample['disk_devices'] = devices
+        sample.update(self.sample_totals(now))
+        return sample
+
+    def sample_totals(self, now):
+        """Return the system-wide disk columns"""
+        disk_io = psutil.disk_io_counters()
+        elapsed = now - self.prev_time
+        self.prev_time = now
+        if not disk_io or not self.prev_io or elapsed <= 0:
+            self.prev_io = disk_io
+            return {}
+        read_mb = max(0, (disk_io.read_bytes - self.prev_io.read_bytes) / MB)
+        write_mb = max(0, (disk_io.write_bytes - self.prev_io.write_bytes) / MB)
+        self.prev_io = disk_io
+        return {
+            'disk_read': read_mb / elapsed,
+            'disk_write': write_mb / elapsed,
+            'disk_read_mb': read_mb,
+            'disk_write_mb': write_mb,
+        }
+
+
+class NetworkSource:
+    """System-wide network send/receive rates, plus per-interface rates when per_device is set"""
+    name = 'network'
+    interval = None
+
+    def __init__(self, per_device=False):
+        self.per_device = per_device
+        self.device_rates = DeviceRates()
+        self.prev_io = psutil.net_io_counters()
+        self.prev_time = time.monotonic()
+        if per_device:
+            self.sample_devices(self.prev_time)  # Baseline for the per-device deltas
+
+    def sample_devices(self, now):
+        """Return (names, MB/s array of shape (nics, 2: sent, recv)) or None"""
+        per_nic = psutil.net_io_counters(pernic=True) or {}
+        names = tuple(per_nic)
+        counters = np.array([(per_nic[n].bytes_sent, per_nic[n].bytes_recv) for n in names],
+                            dtype=np.int64).reshape(-1, 2)
+        rates = self.device_rates.update(names, counters, now)
+        return None if rates is None else (names, rates)
+
+    def sample(self, now):
+        sample = {}
+        if self.per_device:
+            devices = self.sample_devices(now)
+            if devices is not None:
+                sample['net_devices'] = devices
+        sample.update(self.sample_totals(now))
+        return sample
+
+    def sample_totals(self, now):
+        """Return the system-wide network columns"""
+        net_io = psutil.net_io_counters()
+        elapsed = now - self.prev_time
+        self.prev_time = now
+        if not net_io or not self.prev_io or elapsed <= 0:
+            self.prev_io = net_io
+            return {}
+        sent_mb = max(0, (net_io.bytes_sent - self.prev_io.bytes_sent) / MB)
+        recv_mb = max(0, (net_io.bytes_recv - self.prev_io.bytes_recv) / MB)
+        self.prev_io = net_io
+        return {
+            'net_sent': sent_mb / elapsed,
+            'net_recv': recv_mb / elapsed,
+            'net_sent_mb': sent_mb,
+            'net_recv_mb': recv_mb,
+        }
+
+
+class MemorySource:
+    """RAM usage (percent plus totals in MB)"""
+    name = 'memory'
+    interval = 1.0
+
+    def sample(self, now):
+        memory = psutil.virtual_memory()
+        return {
+            'ram_percent': memory.percent,
+            'ram_total': memory.total / MB,
+            'ram_available': memory.available / MB,
+        }
+
+
+class SwapSource:
+    """Swap usage (percent plus totals in MB)"""
+    name = 'swap'
+    interval = 5.0
+
+    def sample(self, now):
+        swap = psutil.swap_memory()
+        return {
+            'swap_percent': swap.percent,
+            'swap_total': swap.total / MB,
+            'swap_available': swap.free / MB,
+        }
+
+
+COLLECTOR_BACKENDS = ('auto', 'psutil', 'procfs')
+
+
+def resolve_backend(backend):
+    """Map a backend preference to the backend that will actually run.
+
+    'auto' and 'procfs' use the native Linux reader where /proc exists and
+    fall back to psutil everywhere else.
+    """
+    if backend in ('auto', 'procfs'):
+        from sysmon.procfs import procfs_available
+        if procfs_available():
+            return 'procfs'
+    return 'psutil'
+
+
+def create_sources(backend='auto', per_core=False, per_disk=False, per_nic=False):
+    """Return the metric sources for the requested collector backend"""
+    if resolve_backend(backend) == 'procfs':
+        from sysmon.procfs import (ProcfsCpuSource, ProcfsDiskSource,
+                                   ProcfsNetworkSource, ProcfsMemorySource,
+                                   ProcfsSwapSource)
+        try:
+            return [ProcfsCpuSource(per_core), ProcfsDiskSource(per_disk),
+                    ProcfsNetworkSource(per_nic), ProcfsMemorySource(), ProcfsSwapSource()]
+        except OSError as e:
+            print(f"procfs collector unavailable, falling back to psutil: {e}", file=sys.stderr)
+    return [CpuSource(per_core), DiskSource(per_disk),
+            NetworkSource(per_nic), MemorySource(), SwapSource()]
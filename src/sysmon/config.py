@@ -57,3 +57,8 @@ def get_config_file_path(config_dir):
 def get_preferences_file_path(config_dir):
     """Get preferences file path"""
     return os.path.join(config_dir, 'preferences.json')
+
+
+def get_history_dir(config_dir):
+    """Get the directory holding the persistent metric history"""
+    return os.path.join(config_dir, 'history')
@@ -0,0 +1,299 @@
+"""
+SysMon Curve Pool
+Reusable PlotDataItems for plots whose set of series changes at runtime,
+min/max envelopes drawn behind downsampled curves, and append-only
+scrolling curves for the live view.
+"""
+
+import zlib
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QColor, QPainter, QPainterPath
+
+# Distinct colors for per-device curves; a device keeps its color across runs
+DEVICE_COLORS = ['#ff6b6b', '#4ecdc4', '#ffd166', '#a29bfe', '#55efc4',
+                 '#fd79a8', '#74b9ff', '#fab1a0', '#81ecec', '#e17055']
+
+
+def device_color(name):
+    """Stable palette color for a device name"""
+    return DEVICE_COLORS[zlib.crc32(name.encode()) % len(DEVICE_COLORS)]
+
+
+def set_curve_data(curve, x, y):
+    """setData for a curve whose x values are known to be finite.
+
+    Only y is scanned for gaps; a gap-free curve connects every point and
+    skips pyqtgraph's own finite check of both arrays.
+    """
+    finite = not np.isnan(y).any()
+    curve.setData(x, y, connect='all' if finite else 'finite', skipFiniteCheck=finite)
+
+
+class CurvePool:
+    """Creates, reuses and retires PlotDataItems for a changing set of series.
+
+    Series are identified by key.  A key that is no longer updated gives its
+    curve back to a free list instead of deleting it, so devices appearing
+    and vanishing never churn graphics items or legend rows.
+    """
+
+    def __init__(self, plot, width=2):
+        self.plot = plot
+        self.width = width
+        self.active = {}  # key -> (curve, label, color, style)
+        self.free = []
+
+    def _legend(self):
+        return self.plot.getPlotItem().legend
+
+    def update(self, x, series):
+        """Show exactly ``series``: an iterable of (key, label, color, style, y)"""
+        seen = set()
+        for key, label, color, style, y in series:
+            entry = self.active.get(key)
+            if entry is None:
+                curve = self.free.pop() if self.free else self.plot.plot()
+                curve.setPen(pg.mkPen(color=color, width=self.width, style=style))
+                curve.show()
+                if self._legend() is not None:
+                    self._legend().addItem(curve, label)
+                entry = (curve, label, color, style)
+                self.active[key] = entry
+            set_curve_data(entry[0], x, y)
+            seen.add(key)
+
+        for key in [k for k in self.active if k not in seen]:
+            self.retire(key)
+
+    def retire(self, key):
+        """Hide a curve and return it to the free list"""
+        curve = self.active.pop(key)[0]
+        curve.setData([], [])
+        curve.hide()
+        if self._legend() is not None:
+            self._legend().removeItem(curve)
+        self.free.append(curve)
+
+    def clear(self):
+        """Retire every active curve"""
+        for key in list(self.active):
+            self.retire(key)
+
+    def set_width(self, width):
+        """Apply a new line thickness to all pooled curves"""
+        self.width = width
+        for curve, _, color, style in self.active.values():
+            curve.setPen(pg.mkPen(color=color, width=width, style=style))
+
+
+class Envelope:
+    """Shaded min/max band behind a curve, shown while plotting rollup buckets.
+
+    Averaging a bucket hides short spikes; the band keeps them visible.
+    It takes its colour from the curve's pen, so colour changes carry over.
+    """
+
+    def __init__(self, plot, curve, alpha=70):
+        self.curve = curve
+        self.alpha = alpha
+        self.lower = pg.PlotCurveItem()
+        self.upper = pg.PlotCurveItem()
+        self.fill = pg.FillBetweenItem(self.lower, self.upper)
+        self.fill.setZValue(curve.zValue() - 1)
+        self.fill.setVisible(False)
+        plot.addItem(self.fill)
+
+    def set_data(self, x, lower, upper):
+        color = QColor(pg.mkPen(self.curve.opts['pen']).color())
+        color.setAlpha(self.alpha)
+        self.fill.setBrush(color)
+        set_curve_data(self.lower, x, lower)
+        set_curve_data(self.upper, x, upper)
+        self.fill.setVisible(self.curve.isVisible())
+
+    def clear(self):
+        if self.fill.isVisible():
+            self.fill.setVisible(False)
+            self.lower.setData([], [])
+            self.upper.setData([], [])
+
+
+class _Chunk:
+    """A sealed piece of a ScrollingCurve: its path and data bounds"""
+
+    __slots__ = ('path', 'x0', 'x1', 'y0', 'y1')
+
+    def __init__(self, path, x0, x1, y0, y1):
+        self.path = path
+        self.x0, self.x1, self.y0, self.y1 = x0, x1, y0, y1
+
+
+class ScrollingCurve(pg.GraphicsObject):
+    """Append-only live curve: new samples extend a path, scrolling moves the item.
+
+    Points are kept in absolute (sampler) time.  The path is split into
+    sealed chunks of CHUNK_POINTS samples plus an open tail that new
+    samples are appended to with lineTo(), so a frame costs O(new samples)
+    instead of re-uploading the whole window.  Scrolling is a setPos() of
+    the whole item, and chunks whose samples have left the store are
+    dropped whole.  The pen and visibility follow ``source``, the
+    PlotDataItem that draws the same series when scrolling can't be used
+    (history, rollups, replay, decimation, OpenGL rendering).
+    """
+
+    CHUNK_POINTS = 256
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.owner = None      # Store the points came from
+        self.token = None      # Smoothing settings the points were computed with
+        self.appended = 0      # Store sample count at the last update
+        self.chunks = []
+        self._new_tail()
+        self._last = None      # Last finite point, None after a gap
+        self.setZValue(source.zValue())
+
+    @property
+    def active(self):
+        return self.owner is not None
+
+    def _new_tail(self):
+        self.tail = QPainterPath()
+        self.tail_count = 0
+        self.tail_bounds = None  # [x0, x1, y0, y1]
+
+    def reset(self):
+        """Forget every point (the source curve takes over drawing)"""
+        if self.owner is None:
+            return
+        self.prepareGeometryChange()
+        self.owner = None
+        self.token = None
+        self.chunks = []
+        self._new_tail()
+        self._last = None
+        self.update()
+
+    def _append_points(self, times, values):
+        """Extend the tail point by point, sealing it every CHUNK_POINTS samples"""
+        for x, y in zip(times.tolist(), values.tolist()):
+            if y != y:  # NaN: lift the pen
+                self._last = None
+            else:
+                if self._last is None:
+                    self.tail.moveTo(x, y)
+                else:
+                    self.tail.lineTo(x, y)
+                self._last = (x, y)
+                bounds = self.tail_bounds
+                if bounds is None:
+                    self.tail_bounds = [x, x, y, y]
+                else:
+                    bounds[1] = x
+                    bounds[2] = min(bounds[2], y)
+                    bounds[3] = max(bounds[3], y)
+            self.tail_count += 1
+            if self.tail_count >= self.CHUNK_POINTS:
+                self._seal()
+
+    def _seal(self):
+        if self.tail_bounds is not None:
+            self.chunks.append(_Chunk(self.tail, *self.tail_bounds))
+        self._new_tail()
+        if self._last is not None:
+            self.tail.moveTo(*self._last)  # Keep the line continuous across chunks
+            self.tail_bounds = [self._last[0], self._last[0], self._last[1], self._last[1]]
+
+    def _rebuild(self, times, values):
+        """Build sealed chunks from whole arrays (vectorized per chunk)"""
+        self.chunks = []
+        self._new_tail()
+        self._last = None
+        size = self.CHUNK_POINTS
+        full = len(times) - len(times) % size
+        for start in range(0, full, size):
+            # One sample of overlap joins this chunk to the previous one
+            lo = max(0, start - 1)
+            x, y = times[lo:start + size], values[lo:start + size]
+            finite = ~np.isnan(y)
+            if not finite.any():
+                continue
+            self.chunks.append(_Chunk(pg.arrayToQPath(x, y, connect='finite'),
+                                      float(x[0]), float(x[-1]),
+                                      float(y[finite].min()), float(y[finite].max())))
+        if full:
+            y = float(values[full - 1])
+            self._last = None if y != y else (float(times[full - 1]), y)
+            if self._last is not None:
+                self.tail.moveTo(*self._last)
+                self.tail_bounds = [self._last[0], self._last[0], y, y]
+        self._append_points(times[full:], values[full:])
+
+    def update_data(self, times, values, owner, appended, token):
+        """Catch up with the store: append new samples, or rebuild when they don't follow on"""
+        self.prepareGeometryChange()
+        new = appended - self.appended
+        if (owner is not self.owner or token != self.token
+                or new < 0 or new > len(values)):
+            self._rebuild(times, values)
+        elif new:
+            self._append_points(times[-new:], values[-new:])
+        # Drop chunks whose samples have all left the store (or a narrowed window)
+        if len(times):
+            oldest = times[0]
+            while self.chunks and self.chunks[0].x1 < oldest:
+                self.chunks.pop(0)
+        self.owner = owner
+        self.token = token
+        self.appended = appended
+        self.update()
+
+    def scroll_to(self, now):
+        """Show ``now`` at x = 0"""
+        self.setPos(-now, 0)
+
+    def _rects(self):
+        rects = [(c.x0, c.x1, c.y0, c.y1) for c in self.chunks]
+        if self.tail_bounds is not None:
+            rects.append(tuple(self.tail_bounds))
+        return rects
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        rects = self._rects()
+        if orthoRange is not None and ax == 1:
+            # orthoRange is the visible x range in view coordinates
+            lo, hi = orthoRange[0] - self.pos().x(), orthoRange[1] - self.pos().x()
+            rects = [r for r in rects if r[1] >= lo and r[0] <= hi]
+        if not rects:
+            return None
+        if ax == 0:
+            return min(r[0] for r in rects), max(r[1] for r in rects)
+        return min(r[2] for r in rects), max(r[3] for r in rects)
+
+    def pixelPadding(self):
+        return pg.mkPen(self.source.opts['pen']).widthF() / 2 + 1
+
+    def boundingRect(self):
+        rects = self._rects()
+        if not rects:
+            return QRectF()
+        x0, x1 = min(r[0] for r in rects), max(r[1] for r in rects)
+        y0, y1 = min(r[2] for r in rects), max(r[3] for r in rects)
+        px, py = self.pixelVectors()
+        pad = self.pixelPadding()
+        dx = pad * (px.length() if px is not None else 0.0)
+        dy = pad * (py.length() if py is not None else 0.0)
+        return QRectF(x0 - dx, y0 - dy, x1 - x0 + 2 * dx, y1 - y0 + 2 * dy)
+
+    def paint(self, painter, option, widget=None):
+        painter.setRenderHint(QPainter.Antialiasing, bool(pg.getConfigOption('antialias')))
+        painter.setPen(pg.mkPen(self.source.opts['pen']))
+        left = self.viewRect().left()
+        for chunk in self.chunks:
+            if chunk.x1 >= left:  # Skip chunks scrolled off the left edge
+                painter.drawPath(chunk.path)
+        painter.drawPath(self.tail)
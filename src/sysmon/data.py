@@ -1,135 +1,522 @@
 """
 SysMon Data Mixin
-Timer setup, data collection, plot updates, and smoothing.
+Sampler setup, sample consumption, plot updates, and smoothing.
+
+Ingest, smoothing, decimation, curve updates and hover refreshes are
+timed into ``self.profiler`` (see sysmon.profiler); each render_plots()
+call is one profiled frame.
 """
 
+import datetime
+import os
+import sys
 import time
+
+import numpy as np
 import psutil
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import Qt, QObject, QRectF, QTimer, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+from sysmon.collectors import create_sources, resolve_backend
+from sysmon.config import get_history_dir
+from sysmon.constants import VERSION
+from sysmon.curves import device_color, set_curve_data
+from sysmon.history import HistoryStore
+from sysmon.ranking import rank_snapshot
+from sysmon.rollup import RollupStore
+from sysmon.sampler import Sampler
+from sysmon.snapshots import ProcessSnapshotService
+from sysmon.store import DeviceColumns
+
+# Per-device breakdowns: sample key, 2-D store columns, legend suffix per column, source
+DEVICE_BREAKDOWNS = {
+    'disk': ('disk_devices', ('disk_dev_read', 'disk_dev_write'), ('read', 'write'), 'disk'),
+    'net': ('net_devices', ('net_dev_sent', 'net_dev_recv'), ('sent', 'recv'), 'network'),
+}
+MAX_DEVICE_CURVES = 8  # Busiest devices drawn per plot; idle devices get no curve
+MAX_RAW_WINDOW = 3600  # Seconds of raw samples kept in memory; wider windows use rollups
+HIDDEN_POLL_MS = 500   # How often a dirty frame re-checks a minimized/covered window
+
+
+class SampleNotifier(QObject):
+    """Carries the sampler thread's wake-ups into the GUI thread"""
+    sample_ready = pyqtSignal()
 
 
 class DataMixin:
     """Data collection and plot update methods for SystemMonitor."""
 
     def setup_timer(self):
-        """Setup update timer"""
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_data)
-        self.timer.start(self.update_interval)
+        """Start the background sampler thread"""
+        self.sample_notifier = SampleNotifier()
+        # Queued connection: emitted on the sampler thread, handled on the GUI thread
+        self.sample_notifier.sample_ready.connect(self.update_data)
+        self.sampler = Sampler(self.create_metric_sources(), self.update_interval,
+                               on_sample=self.sample_notifier.sample_ready.emit,
+                               profiler=self.profiler)
+        self.resize_store()
+        self.open_history()
+        self.setup_frame_clock()
+        self.sampler.start()
 
-    def update_data(self):
-        """Update all monitoring data"""
-        current_time = time.time()
-        elapsed = current_time - self.prev_time
-
-        # CPU usage
-        cpu_percent = psutil.cpu_percent()
-        self.cpu_data.append(cpu_percent)
-
-        # Disk I/O
-        disk_io = psutil.disk_io_counters()
-        if disk_io and self.prev_disk_io:
-            read_rate = (disk_io.read_bytes - self.prev_disk_io.read_bytes) / elapsed / (1024**2)
-            write_rate = (disk_io.write_bytes - self.prev_disk_io.write_bytes) / elapsed / (1024**2)
-            self.disk_read_data.append(max(0, read_rate))
-            self.disk_write_data.append(max(0, write_rate))
-            self.disk_read_mb_data.append(max(0, (disk_io.read_bytes - self.prev_disk_io.read_bytes) / (1024**2)))
-            self.disk_write_mb_data.append(max(0, (disk_io.write_bytes - self.prev_disk_io.write_bytes) / (1024**2)))
-            self.prev_disk_io = disk_io
-
-        # Network I/O
-        net_io = psutil.net_io_counters()
-        if net_io and self.prev_net_io:
-            sent_rate = (net_io.bytes_sent - self.prev_net_io.bytes_sent) / elapsed / (1024**2)
-            recv_rate = (net_io.bytes_recv - self.prev_net_io.bytes_recv) / elapsed / (1024**2)
-            self.net_sent_data.append(max(0, sent_rate))
-            self.net_recv_data.append(max(0, recv_rate))
-            self.net_sent_mb_data.append(max(0, (net_io.bytes_sent - self.prev_net_io.bytes_sent) / (1024**2)))
-            self.net_recv_mb_data.append(max(0, (net_io.bytes_recv - self.prev_net_io.bytes_recv) / (1024**2)))
-            self.prev_net_io = net_io
-
-        # Memory information
-        memory = psutil.virtual_memory()
-        self.ram_total = memory.total / (1024**2)  # Convert to MB
-        self.ram_available = memory.available / (1024**2)  # Convert to MB
-        self.ram_percent = memory.percent
-
-        # Swap information
-        swap = psutil.swap_memory()
-        self.swap_total = swap.total / (1024**2)  # Convert to MB
-        self.swap_available = swap.free / (1024**2)  # Convert to MB
-        self.swap_percent = swap.percent
-
-        self.ram_percent_data.append(self.ram_percent)
-        self.swap_percent_data.append(self.swap_percent)
-
-        # Time axis
-        if len(self.time_data) == 0:
-            self.time_data.append(0)
+        # One process scan per interval, shared by the process timeline and
+        # every drill-down dialog, on its own thread so a long scan never
+        # delays the metric ticks
+        self.process_service = ProcessSnapshotService(profiler=self.profiler, parent=self)
+        # Nothing is scanned until a view subscribes; every snapshot is ranked
+        self.process_service.snapshot_ready.connect(self.update_rankings)
+        self.process_service.start()
+
+    def setup_frame_clock(self):
+        """Create the render timer; frames are capped at the display refresh rate"""
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 60.0
+        self.frame_interval = 1.0 / min(max(rate, 1.0), 240.0)
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.render_frame)
+        self._last_frame = 0.0
+        self.plots_dirty = False
+
+    def request_render(self):
+        """Mark the plots dirty and schedule a frame; samples arriving before it coalesce"""
+        self.plots_dirty = True
+        if self.frame_timer.isActive():
+            return
+        delay = self._last_frame + self.frame_interval - time.monotonic()
+        self.frame_timer.start(max(0, int(delay * 1000)))
+
+    def render_frame(self):
+        """Frame clock tick: redraw once if anything changed and the window can be seen"""
+        if not self.plots_dirty:
+            return
+        if not self.window_exposed():
+            # Samples keep going into the store; only the drawing waits
+            self.frame_timer.start(HIDDEN_POLL_MS)
+            return
+        self.plots_dirty = False
+        self._last_frame = time.monotonic()
+        if self.replay is not None:
+            self.render_plots(self.replay_store)
+        else:
+            self.update_plots()
+
+    def window_exposed(self):
+        """False while the window is minimized, hidden or fully covered"""
+        if self.isMinimized() or not self.isVisible():
+            return False
+        handle = self.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def set_update_interval(self, interval):
+        """Change the base sampling interval (milliseconds)
+
+        CPU, disk and network are sampled on every tick; memory and swap
+        keep their own slower intervals unless the tick is slower still.
+        """
+        self.update_interval = interval
+        if hasattr(self, 'sampler'):
+            self.sampler.set_interval(interval)
+            self.resize_store()
+
+    def resize_store(self):
+        """Size each source's ring buffer to hold the time window at that source's rate"""
+        # Windows too wide for one sample per pixel are drawn from rollups instead
+        window = min(self.time_window, MAX_RAW_WINDOW)
+        self.max_points = int((window * 1000) / self.update_interval)
+        if not hasattr(self, 'sampler'):
+            self.store.resize(self.max_points)
+            return
+        self.store.resize({name: max(2, int(window / seconds))
+                           for name, seconds in self.sampler.intervals().items()})
+
+    def create_metric_sources(self):
+        """Build metric sources for the current backend and CPU view mode"""
+        return create_sources(self.collector_backend, per_core=self.cpu_per_core,
+                              per_disk=self.per_device['disk'],
+                              per_nic=self.per_device['net'])
+
+    def set_collector_backend(self, backend):
+        """Switch the sampler to another collector backend ('auto', 'psutil' or 'procfs')"""
+        self.collector_backend = backend
+        if hasattr(self, 'sampler'):
+            self.sampler.set_sources(self.create_metric_sources())
+        if hasattr(self, 'collector_backend_actions'):
+            for name, action in self.collector_backend_actions.items():
+                action.setChecked(name == backend)
+        print(f"Collector backend: {backend} (using {resolve_backend(backend)})", file=sys.stderr)
+
+    def set_cpu_per_core(self, enabled):
+        """Switch the CPU plot between the aggregate curve and the per-core heatmap"""
+        self.cpu_per_core = enabled
+        if not enabled:
+            self.store.remove_column('cpu_cores')
+        if hasattr(self, 'sampler'):
+            self.sampler.set_sources(self.create_metric_sources())
+        self.apply_cpu_view_mode()
+
+    def apply_cpu_view_mode(self):
+        """Show either the aggregate CPU curve or the per-core heatmap"""
+        # History and rollups only hold the aggregate, so they always show the curve
+        per_core = self.cpu_per_core and self.plot_detail
+        self.cpu_heatmap.setVisible(per_core)
+        self.cpu_curve.setVisible(not per_core)
+        if per_core:
+            cores = self.store.width('cpu_cores') or psutil.cpu_count() or 1
+            self.cpu_plot.setTitle("CPU Usage per Core (%)")
+            self.cpu_plot.setLabel('left', 'Core', units='')
+            self.cpu_plot.setYRange(0, cores, padding=0)
         else:
-            self.time_data.append(self.time_data[-1] + elapsed)
+            self.cpu_plot.setTitle("CPU Usage (%)")
+            self.cpu_plot.setLabel('left', 'Usage', units='%')
+            self.cpu_plot.setYRange(0, 100)
+
+    def set_device_breakdown(self, kind, enabled):
+        """Plot each disk ('disk') or network interface ('net') instead of the totals"""
+        self.per_device[kind] = enabled
+        columns = self.device_columns.get(kind)
+        if enabled and columns is None:
+            _, device_columns, _, group = DEVICE_BREAKDOWNS[kind]
+            self.device_columns[kind] = DeviceColumns(self.store.group(group), device_columns)
+        elif not enabled and columns is not None:
+            columns.remove()
+            self.device_columns[kind] = None
+            self.curve_pools[kind].clear()
+        self._device_ranking[kind] = ([], 0.0)
+
+        self.apply_device_view_mode(kind)
+        if hasattr(self, 'sampler'):
+            self.sampler.set_sources(self.create_metric_sources())
+
+    def apply_device_view_mode(self, kind):
+        """Show either the total curves or the per-device curves of one plot"""
+        breakdown = self.per_device[kind] and self.plot_detail
+        total_curves = {'disk': (self.disk_read_curve, self.disk_write_curve),
+                        'net': (self.net_sent_curve, self.net_recv_curve)}[kind]
+        for curve in total_curves:
+            curve.setVisible(not breakdown)
+        if not breakdown:
+            self.curve_pools[kind].clear()
+
+    def stop_sampler(self):
+        """Stop the background sampler thread and close the history files"""
+        if hasattr(self, 'sampler'):
+            self.sampler.stop()
+            self.process_service.stop()
+        if self.history is not None:
+            self.history.close()
+            self.history = None
+        if self.rollups is not None:
+            self.rollups.close()
+            self.rollups = None
+
+    def open_history(self):
+        """Open (or create) the persistent on-disk history and its rollups"""
+        history_dir = get_history_dir(self.config_dir)
+        try:
+            self.history = HistoryStore(history_dir, time_offset=self.sampler.wall_origin)
+            self.rollups = RollupStore(os.path.join(history_dir, 'rollups'),
+                                       time_offset=self.sampler.wall_origin)
+        except (OSError, ValueError) as e:
+            print(f"Persistent history disabled: {e}")
+            self.history = None
+            self.rollups = None
+
+    def rollup_bucket(self):
+        """Coarsest rollup bucket that still gives one point per pixel, or None for raw samples"""
+        if self.rollups is None:
+            return None
+        pixels = max([1.0] + [plot.getPlotItem().getViewBox().width() for plot in
+                              (self.cpu_plot, self.memory_plot, self.disk_plot, self.net_plot)])
+        return self.rollups.bucket_for(self.time_window / pixels)
 
-        self.prev_time = current_time
+    def set_plot_detail(self, detail):
+        """Switch between raw live samples (with per-core/per-device views) and aggregates"""
+        if detail == self.plot_detail:
+            return
+        self.plot_detail = detail
+        self.apply_cpu_view_mode()
+        for kind in DEVICE_BREAKDOWNS:
+            self.apply_device_view_mode(kind)
+
+    def scroll_history(self, pages):
+        """Move the plots back (negative) or forward (positive) by whole time windows"""
+        if self.history is None or self.replay is not None:
+            return
+        live_end = self.sampler.wall_origin + (self.store.latest_time() or 0.0)
+        end = (self.history_view_end or live_end) + pages * self.time_window
+        times = [store.earliest_time() for store in (self.history, self.rollups)]
+        times = [t for t in times if t is not None]
+        if times:
+            end = max(end, min(times) + self.time_window)
+        if not times or end > live_end - self.time_window:
+            # The page would overlap the live window, which is what live already shows
+            self.return_to_live()
+            return
+        self.history_view_end = end
+        self.show_history_page()
 
-        # Update plots
+    def show_history_page(self):
+        """Plot the time window of history ending at history_view_end"""
+        end = self.history_view_end
+        # Only this page is read from the memory-mapped segments or rollup tiers
+        bucket = self.rollup_bucket()
+        if bucket is None:
+            page = self.history.page(end - self.time_window, end)
+        else:
+            page = self.rollups.page(end - self.time_window, end, bucket)
+        self.set_plot_detail(False)
+        self.plot_store = page
+        self.render_plots(page)
+        stamp = datetime.datetime.fromtimestamp(end).strftime('%Y-%m-%d %H:%M:%S')
+        self.setWindowTitle(f"SysMon {VERSION} - History to {stamp} (End: live)")
+
+    def return_to_live(self):
+        """Leave history and follow the live samples again"""
+        if self.history_view_end is None:
+            return
+        self.history_view_end = None
+        self.setWindowTitle(f"SysMon {VERSION}")
         self.update_plots()
 
+    def update_data(self):
+        """Consume every sample the sampler has produced since the last call"""
+        batch = self.sampler.drain()
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        for sample in batch:
+            group = sample.pop('source')
+            cores = sample.get('cpu_cores')
+            if cores is not None and not self.cpu_per_core:
+                # Sampled by the old sources before the heatmap was turned off
+                del sample['cpu_cores']
+            elif cores is not None and self.store.width('cpu_cores') != len(cores):
+                # First per-core sample (or CPU hotplug): (re)allocate the 2-D column
+                self.store.group('cpu').add_column('cpu_cores', len(cores))
+                self.apply_cpu_view_mode()
+            for kind, (key, _, _, _) in DEVICE_BREAKDOWNS.items():
+                devices = sample.pop(key, None)
+                if devices is not None and self.device_columns.get(kind) is not None:
+                    sample.update(self.device_columns[kind].rows(*devices))
+            self.store.append(group, sample)
+            if self.history is not None:
+                self.history.append(group, sample)
+                self.rollups.append(group, sample)
+
+            # Memory information arrives only on memory/swap ticks
+            if group == 'memory':
+                self.ram_total = sample.get('ram_total', self.ram_total)
+                self.ram_available = sample.get('ram_available', self.ram_available)
+                self.ram_percent = sample.get('ram_percent', self.ram_percent)
+            elif group == 'swap':
+                self.swap_total = sample.get('swap_total', self.swap_total)
+                self.swap_available = sample.get('swap_available', self.swap_available)
+                self.swap_percent = sample.get('swap_percent', self.swap_percent)
+        self.profiler.record('ingest', time.perf_counter() - start)
+
+        # Redraw on the next frame, not once per sample
+        self.request_render()
+
+    def update_rankings(self, snapshot):
+        """Record the top processes of a new process snapshot for the timeline"""
+        rankings = rank_snapshot(snapshot)
+        if rankings:
+            self.process_rankings.append(snapshot.time, rankings)
+
     def update_plots(self):
-        """Update all plot curves"""
-        if len(self.time_data) == 0:
+        """Update all plot curves from the live store (frozen while viewing history or a replay)"""
+        if self.history_view_end is not None or self.replay is not None:
             return
+        bucket = self.rollup_bucket()
+        if bucket is None or len(self.store) == 0:
+            self.set_plot_detail(True)
+            self.plot_store = self.store
+        else:
+            # Window too wide for raw samples: draw rollup buckets ending at the newest sample
+            self.set_plot_detail(False)
+            end = self.sampler.wall_origin + self.store.latest_time()
+            self.plot_store = self.rollups.page(end - self.time_window, end, bucket)
+        self.render_plots(self.plot_store)
 
-        # Normalize time axis to show last N seconds
-        time_array = [t - self.time_data[-1] for t in self.time_data]
+    def render_plots(self, store):
+        """Draw every visible plot from a MetricStore or a HistoryPage"""
+        if len(store) == 0:
+            return
+        start = time.perf_counter()
+        live = store is self.store
 
-        # Apply smoothing to all data series
-        cpu_smoothed = self.apply_smoothing(self.cpu_data)
-        disk_read_smoothed = self.apply_smoothing(self.disk_read_data)
-        disk_write_smoothed = self.apply_smoothing(self.disk_write_data)
-        net_sent_smoothed = self.apply_smoothing(self.net_sent_data)
-        net_recv_smoothed = self.apply_smoothing(self.net_recv_data)
+        # Normalize each source's time axis to show the last N seconds before
+        # the newest sample of any source (sources are sampled at different rates)
+        now = store.latest_time()
 
-        # Update CPU
-        self.cpu_curve.setData(time_array, cpu_smoothed)
+        # Plots hidden from the View menu are skipped entirely
+        if not self.cpu_plot.isHidden():
+            cpu_time = self.time_axis(store, 'cpu', now)
+            self.draw_curve(self.cpu_curve, store, 'cpu', cpu_time, now, self.cpu_plot)
+            if live and self.cpu_per_core and 'cpu_cores' in store:
+                self.update_cpu_heatmap(cpu_time)
+            self.update_envelopes(store, cpu_time, ('cpu',))
 
-        # Update Disk I/O
-        self.disk_read_curve.setData(time_array, disk_read_smoothed)
-        self.disk_write_curve.setData(time_array, disk_write_smoothed)
+        if not self.disk_plot.isHidden():
+            disk_time = self.time_axis(store, 'disk_read', now)
+            self.draw_curve(self.disk_read_curve, store, 'disk_read', disk_time, now, self.disk_plot)
+            self.draw_curve(self.disk_write_curve, store, 'disk_write', disk_time, now, self.disk_plot)
+            self.update_envelopes(store, disk_time, ('disk_read', 'disk_write'))
+            if live and self.device_columns.get('disk') is not None:
+                self.update_device_curves('disk', disk_time)
 
-        # Update Memory
-        ram_smoothed = self.apply_smoothing(self.ram_percent_data)
-        swap_smoothed = self.apply_smoothing(self.swap_percent_data)
-        self.mem_ram_curve.setData(time_array, ram_smoothed)
-        self.mem_swap_curve.setData(time_array, swap_smoothed)
+        if not self.memory_plot.isHidden():
+            ram_time = self.time_axis(store, 'ram_percent', now)
+            swap_time = self.time_axis(store, 'swap_percent', now)
+            self.draw_curve(self.mem_ram_curve, store, 'ram_percent', ram_time, now,
+                            self.memory_plot)
+            self.draw_curve(self.mem_swap_curve, store, 'swap_percent', swap_time, now,
+                            self.memory_plot)
+            self.update_envelopes(store, ram_time, ('ram_percent',))
+            self.update_envelopes(store, swap_time, ('swap_percent',))
 
-        # Update Network
-        self.net_sent_curve.setData(time_array, net_sent_smoothed)
-        self.net_recv_curve.setData(time_array, net_recv_smoothed)
+        if not self.net_plot.isHidden():
+            net_time = self.time_axis(store, 'net_sent', now)
+            self.draw_curve(self.net_sent_curve, store, 'net_sent', net_time, now, self.net_plot)
+            self.draw_curve(self.net_recv_curve, store, 'net_recv', net_time, now, self.net_plot)
+            self.update_envelopes(store, net_time, ('net_sent', 'net_recv'))
+            if live and self.device_columns.get('net') is not None:
+                self.update_device_curves('net', net_time)
 
         # Refresh hover labels so they show live values even when mouse is stationary
         if hasattr(self, 'refresh_hover_labels'):
+            hover_start = time.perf_counter()
             self.refresh_hover_labels()
+            self.profiler.add('hover', time.perf_counter() - hover_start)
 
-    def apply_smoothing(self, data):
-        """Apply moving average smoothing to data
+        self.profiler.add('frame', time.perf_counter() - start)
+        self.profiler.flush()
 
-        Args:
-            data: List or deque of numeric values
+    def draw_curve(self, curve, store, column, time_array, now, plot):
+        """Set a curve from a store column, decimated when denser than the plot's pixels.
 
-        Returns:
-            List of smoothed values (same length as input)
+        The live store, when not decimated, is drawn by the column's
+        ScrollingCurve, which only appends the samples that are new.  With
+        OpenGL rendering active the curve keeps drawing it instead: the
+        ScrollingCurve paints a QPainterPath, which would bypass the GL
+        path of pyqtgraph's PlotCurveItem.
+        """
+        values = self.smoothed(store, column)
+        if self.decimator.method != self.decimation:
+            self.decimator.set_method(self.decimation)
+        start = time.perf_counter()
+        reduced = self.decimator.decimate(column, store.times(column), values, self.time_window,
+                                          plot.getPlotItem().getViewBox().width(),
+                                          store, store.appended(column))
+        decimated = time.perf_counter()
+        self.profiler.add('decimate', decimated - start)
+        scrolling = self.scrolling_curves[column]
+        if reduced is None and store is self.store and not self.opengl_active:
+            if not scrolling.active:
+                curve.setData([], [])
+            scrolling.update_data(store.times(column), values, store, store.appended(column),
+                                  (self.smoother.mode, self.smoother.window))
+            scrolling.scroll_to(now)
+            scrolling.setVisible(curve.isVisible())
+        else:
+            scrolling.reset()
+            if reduced is None:
+                set_curve_data(curve, time_array, values)
+            else:
+                times, values = reduced
+                set_curve_data(curve, times - now, values)
+        self.profiler.add('set_data', time.perf_counter() - decimated)
+
+    def time_axis(self, store, column, now):
+        """Times of ``column``'s source relative to ``now``, as one shared array.
+
+        Each source has one buffer that is rewritten in place every frame;
+        the returned view is passed to every curve of that source and kept
+        in ``time_axes`` for hover lookups, so no per-curve or per-event
+        time arrays are built.
         """
-        if self.smoothing_window <= 1 or len(data) < 2:
-            return list(data)
+        group = store.group_of(column)
+        times = store.times(column)
+        n = len(times)
+        buffer = self._time_buffers.get(group)
+        if buffer is None or len(buffer) < n:
+            grown = n if buffer is None else max(n, 2 * len(buffer))
+            buffer = self._time_buffers[group] = np.empty(grown)
+        axis = buffer[:n]
+        np.subtract(times, now, out=axis)
+        self.time_axes[group] = (axis, store, store.appended(column))
+        return axis
+
+    def update_envelopes(self, store, time_array, columns):
+        """Draw min/max bands for rollup pages; hide them for raw samples"""
+        for column in columns:
+            envelope = self.envelopes[column]
+            if column + '_min' in store:
+                envelope.set_data(time_array, store[column + '_min'], store[column + '_max'])
+            else:
+                envelope.clear()
 
-        smoothed = []
-        window = min(self.smoothing_window, len(data))
+    def update_cpu_heatmap(self, time_array):
+        """Render per-core history as one cores x time image"""
+        cores = self.store['cpu_cores']
+        self.cpu_heatmap.setImage(cores, autoLevels=False, levels=(0, 100))
+        span = -time_array[0] if len(time_array) > 1 else 1.0
+        self.cpu_heatmap.setRect(QRectF(-span, 0, span, cores.shape[1]))
 
-        for i in range(len(data)):
-            # Calculate average of current point and previous points
-            start_idx = max(0, i - window + 1)
-            window_data = list(data)[start_idx:i+1]
-            avg = sum(window_data) / len(window_data)
-            smoothed.append(avg)
+    def rank_devices(self, kind):
+        """Return the slots of the busiest devices in the window (re-ranked once a second)"""
+        ranked, ranked_at = self._device_ranking[kind]
+        now = time.monotonic()
+        if now - ranked_at < 1.0:
+            return ranked
 
-        return smoothed
+        columns = self.device_columns[kind]
+        columns.recycle_idle()
+        first, second = (self.store[c] for c in columns.columns)
+        # fmax ignores NaN, so absent devices don't poison the peak
+        peaks = np.nan_to_num(np.fmax.reduce(np.fmax(first, second), axis=0))
+        order = np.argsort(-peaks)
+        active = set(columns.slots.values())
+        ranked = [int(slot) for slot in order
+                  if peaks[slot] > 0 and slot in active][:MAX_DEVICE_CURVES]
+        self._device_ranking[kind] = (ranked, now)
+        return ranked
+
+    def update_device_curves(self, kind, time_array):
+        """Draw the busiest devices through the plot's curve pool"""
+        columns = self.device_columns[kind]
+        names = columns.slot_names()
+        suffixes = DEVICE_BREAKDOWNS[kind][2]
+        styles = (Qt.SolidLine, Qt.DashLine)
+        series = []
+        for slot in self.rank_devices(kind):
+            name = names.get(slot)
+            if name is None:
+                continue
+            color = device_color(name)
+            for column, suffix, style in zip(columns.columns, suffixes, styles):
+                series.append((f'{name}:{column}', f'{name} {suffix}', color, style,
+                               self.store[column][:, slot]))
+        self.curve_pools[kind].update(time_array, series)
+
+    def smoothed(self, store, column):
+        """Return a column with the selected smoothing applied
+
+        Args:
+            store: MetricStore or HistoryPage holding the column
+            column: Column name
+
+        Returns:
+            Smoothed values (same length as the column); the store's own
+            view when smoothing is off
+        """
+        smoother = self.smoother
+        if (smoother.mode, smoother.window) != (self.smoothing_mode, self.smoothing_window):
+            smoother.configure(self.smoothing_mode, self.smoothing_window)
+            self.decimator.clear()  # Cached buckets hold the old smoothed values
+        start = time.perf_counter()
+        values = smoother.smooth(column, store[column], store, store.appended(column))
+        self.profiler.add('smooth', time.perf_counter() - start)
+        return values
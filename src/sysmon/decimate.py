@@ -0,0 +1,187 @@
+"""
+SysMon Decimation
+Peak-preserving reduction of long series to a few points per pixel.
+
+Two methods are offered:
+
+* M4 keeps the first, minimum, maximum and last sample of every
+  pixel-wide bucket, so the drawn line is pixel-identical to the full
+  series and no spike is ever dropped.
+* LTTB (largest triangle three buckets) keeps one sample per bucket,
+  the one forming the largest triangle with its neighbours, which
+  follows the shape of the curve with fewer points.
+
+Buckets are aligned to absolute time, so a bucket that has been filled
+never changes.  Decimator caches the points of completed buckets per
+series and, each frame, only reduces the buckets that completed since
+the last frame; everything is recomputed when the bucket width changes
+(time window or plot width) or the data comes from a different store.
+NaN samples are left out, so a gap is bridged rather than broken.
+"""
+
+import numpy as np
+
+DECIMATION_METHODS = {
+    'm4': 'M4 (min/max per pixel)',
+    'lttb': 'LTTB (largest triangle)',
+    'off': 'Off (draw every sample)',
+}
+
+# Buckets per pixel column; M4 emits up to 4 points per bucket, LTTB one
+BUCKETS_PER_PIXEL = {'m4': 1, 'lttb': 3}
+MAX_POINTS_PER_PIXEL = 4  # Series at or below this density are drawn as-is
+
+
+def _bucket_runs(times, width):
+    """Return (bucket id per sample, start index of each bucket run)"""
+    buckets = np.floor(times / width).astype(np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    return buckets, starts
+
+
+def m4(times, values, width):
+    """First, min, max and last sample of each ``width``-second bucket.
+
+    Returns (times, values, bucket ids) of the kept samples in time order.
+    ``times`` must be sorted and ``values`` free of NaN.
+    """
+    if len(times) == 0:
+        return times, values, np.empty(0, dtype=np.int64)
+    buckets, starts = _bucket_runs(times, width)
+    ends = np.concatenate((starts[1:], [len(times)])) - 1
+    # Sorting by (bucket, value) puts each bucket's min first and max last
+    order = np.lexsort((values, buckets))
+    index = np.stack((starts, order[starts], order[ends], ends), axis=1)
+    index.sort(axis=1)
+    index = index.ravel()
+    index = index[np.concatenate(([True], index[1:] != index[:-1]))]
+    return times[index], values[index], buckets[index]
+
+
+def lttb(times, values, width, count=None, previous=None):
+    """Largest-triangle-three-buckets selection, one sample per bucket.
+
+    The choice in a bucket depends on the point kept in the bucket before
+    (``previous``, a (time, value) pair; the first sample when None) and
+    on the average of the bucket after, so only the first ``count``
+    buckets are decided (all but the last by default).
+
+    Returns (times, values, bucket ids) of the kept samples.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(times) == 0:
+        return times, values, empty
+    buckets, starts = _bucket_runs(times, width)
+    ends = np.concatenate((starts[1:], [len(times)]))
+    sizes = ends - starts
+    mean_t = np.add.reduceat(times, starts) / sizes
+    mean_v = np.add.reduceat(values, starts) / sizes
+    if count is None:
+        count = len(starts) - 1
+    count = min(count, len(starts) - 1)
+
+    keep = []
+    first = 0
+    if previous is None:
+        keep.append(0)  # The first sample is always kept
+        previous = (times[0], values[0])
+        first = 1
+    prev_t, prev_v = previous
+    for i in range(first, count):
+        seg_t = times[starts[i]:ends[i]]
+        seg_v = values[starts[i]:ends[i]]
+        next_t, next_v = mean_t[i + 1], mean_v[i + 1]
+        area = np.abs((prev_t - next_t) * (seg_v - prev_v) - (prev_t - seg_t) * (next_v - prev_v))
+        j = starts[i] + int(area.argmax())
+        keep.append(j)
+        prev_t, prev_v = times[j], values[j]
+    index = np.array(keep, dtype=np.int64)
+    return times[index], values[index], buckets[index]
+
+
+class _Cache:
+    """Points of the completed buckets of one series"""
+
+    __slots__ = ('owner', 'width', 'appended', 'done', 'times', 'values', 'buckets', 'previous')
+
+    def __init__(self, owner, width, appended, done):
+        self.owner = owner
+        self.width = width
+        self.appended = appended
+        self.done = done  # Every bucket below this id is final
+        self.times = np.empty(0)
+        self.values = np.empty(0)
+        self.buckets = np.empty(0, dtype=np.int64)
+        self.previous = None
+
+
+class Decimator:
+    """Per-series decimation with a cache of completed buckets.
+
+    ``decimate(key, times, values, span, pixels, owner, appended)`` returns
+    reduced (times, values), or None when the series is already sparse
+    enough to draw directly.  ``owner``/``appended`` identify the store and
+    its running sample count, as for Smoother; with ``appended=None`` the
+    series is reduced from scratch and nothing is cached.
+    """
+
+    def __init__(self, method='m4'):
+        self.method = method if method in DECIMATION_METHODS else 'm4'
+        self.cache = {}
+
+    def set_method(self, method):
+        self.method = method if method in DECIMATION_METHODS else 'm4'
+        self.cache.clear()
+
+    def clear(self):
+        """Forget every cached bucket (e.g. after the values were re-smoothed)"""
+        self.cache.clear()
+
+    def decimate(self, key, times, values, span, pixels, owner=None, appended=None):
+        if self.method == 'off' or pixels < 1 or len(values) <= MAX_POINTS_PER_PIXEL * pixels:
+            self.cache.pop(key, None)
+            return None
+        valid = ~np.isnan(values)
+        if not valid.all():
+            times, values = times[valid], values[valid]
+        if len(times) < 3:
+            return None
+        width = span / (pixels * BUCKETS_PER_PIXEL[self.method])
+
+        # Buckets below `final` can't receive more samples; LTTB also needs
+        # the bucket after a bucket to be complete before deciding it
+        last = int(np.floor(times[-1] / width))
+        final = last if self.method == 'm4' else last - 1
+        cache = self.cache.get(key) if appended is not None else None
+        if (cache is None or cache.owner is not owner or cache.width != width
+                or appended < cache.appended):
+            cache = _Cache(owner, width, appended, int(np.floor(times[0] / width)))
+            if appended is not None:
+                self.cache[key] = cache
+        cache.appended = appended
+
+        i0 = int(np.searchsorted(times, cache.done * width))
+        i1 = int(np.searchsorted(times, final * width))
+        if final > cache.done and i1 > i0:
+            if self.method == 'lttb':
+                i2 = int(np.searchsorted(times, (final + 1) * width))
+                x, y, b = lttb(times[i0:i2], values[i0:i2], width,
+                               count=len(np.unique(np.floor(times[i0:i1] / width))),
+                               previous=cache.previous)
+                if len(x):
+                    cache.previous = (x[-1], y[-1])
+                    cache.done = int(b[-1]) + 1
+            else:
+                x, y, b = m4(times[i0:i1], values[i0:i1], width)
+                cache.done = final
+            # Drop buckets that have scrolled out of the store
+            keep = int(np.searchsorted(cache.buckets, int(np.floor(times[0] / width))))
+            cache.times = np.concatenate((cache.times[keep:], x))
+            cache.values = np.concatenate((cache.values[keep:], y))
+            cache.buckets = np.concatenate((cache.buckets[keep:], b))
+
+        # The open bucket(s) change every frame; keep their extremes with M4
+        i1 = int(np.searchsorted(times, cache.done * width))
+        tail_t, tail_v, _ = m4(times[i1:], values[i1:], width)
+        return (np.concatenate((cache.times, tail_t)),
+                np.concatenate((cache.values, tail_v)))
@@ -1,9 +1,10 @@
 """
 SysMon Dialogs
-Process, Disk I/O, Network, and Config viewer dialogs.
+Process, Disk I/O, Network, process timeline, and Config viewer dialogs.
 """
 
-from .process import ProcessWorker, ProcessInfoDialog, RealTimeProcessDialog
-from .disk import DiskIOWorker, RealTimeDiskDialog
-from .network import NetworkWorker, RealTimeNetworkDialog
+from .process import ProcessInfoDialog, RealTimeProcessDialog
+from .disk import RealTimeDiskDialog
+from .network import RealTimeNetworkDialog
+from .timeline import ProcessTimelineDialog
 from .config_viewer import ConfigFileViewerDialog
@@ -0,0 +1,49 @@
+"""
+SysMon Dialog Placement
+Positions a dialog next to the main window without covering it.
+"""
+
+from PyQt5.QtGui import QGuiApplication
+
+
+def position_dialog(dialog, dialog_width, dialog_height):
+    """Place ``dialog`` right of (or below) its parent window, else center it on screen"""
+    main_window = dialog.parent()
+
+    if main_window:
+        try:
+            # Get main window geometry safely
+            main_rect = main_window.frameGeometry()
+            screen = QGuiApplication.screenAt(main_rect.center())
+            if not screen:
+                screen = QGuiApplication.primaryScreen()
+
+            if screen:
+                available = screen.availableGeometry()
+
+                # Try to position to the right of main window
+                right_x = main_rect.right() + 20  # 20px gap
+                if right_x + dialog_width <= available.right():
+                    x_pos = right_x
+                    y_pos = main_rect.top()
+                else:
+                    # Fall back to below main window
+                    x_pos = main_rect.left()
+                    y_pos = main_rect.bottom() + 20
+                    # Ensure dialog fits on screen vertically
+                    if y_pos + dialog_height > available.bottom():
+                        y_pos = available.bottom() - dialog_height - 20
+
+                dialog.move(x_pos, y_pos)
+                return
+        except:
+            pass
+
+    # Fallback to screen center
+    if QGuiApplication.primaryScreen():
+        screen_rect = QGuiApplication.primaryScreen().availableGeometry()
+        x_pos = screen_rect.left() + (screen_rect.width() - dialog_width) // 2
+        y_pos = screen_rect.top() + (screen_rect.height() - dialog_height) // 2
+        dialog.move(x_pos, y_pos)
+
+    dialog.resize(dialog_width, dialog_height)
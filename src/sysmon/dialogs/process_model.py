@@ -0,0 +1,143 @@
+"""
+SysMon Process Table Model
+Table model behind the real-time process dialogs, updated by keyed diffs.
+
+Rows are keyed by PID.  update() compares a new list of ProcessInfo rows
+with what is on screen: rows whose PID is gone are removed, new PIDs are
+appended, and a PID that stays only emits dataChanged for the cells whose
+value changed.  Sorting and filtering happen in a
+QSortFilterProxyModel on top (sorting on the raw values, not the text),
+so the view keeps its selection, scroll position and sort column across
+refreshes.  Every cell shares one QFont.
+"""
+
+import collections
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QFont
+
+# header: column title; width: initial pixels; value: ProcessInfo -> sortable
+# value; text: value -> displayed string
+ProcessColumn = collections.namedtuple('ProcessColumn', 'header width value text')
+
+SORT_ROLE = Qt.UserRole  # Raw column values, so numbers sort as numbers
+CMDLINE_WIDTH = 70       # Characters of a command line shown before eliding
+
+
+def elide_cmdline(cmdline):
+    return cmdline[:CMDLINE_WIDTH] + '...' if len(cmdline) > CMDLINE_WIDTH else cmdline
+
+
+# Leading columns of every process table (and what the filter matches)
+PID_COLUMN = ProcessColumn("PID", 80, lambda p: p.pid, str)
+CMDLINE_COLUMN = ProcessColumn("Process Name", 400, lambda p: p.cmdline, elide_cmdline)
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """One row per process, keyed by PID, with ``columns`` (ProcessColumn)"""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = tuple(columns)
+        self.pids = []    # Row -> PID
+        self.values = []  # Row -> tuple of column values
+        self.texts = []   # Row -> tuple of column strings
+        self.font = QFont("Arial", 10)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.pids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section].header
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.texts[index.row()][index.column()]
+        if role == SORT_ROLE:
+            return self.values[index.row()][index.column()]
+        if role == Qt.FontRole:
+            return self.font
+        return None
+
+    def values_of(self, process):
+        return tuple(column.value(process) for column in self.columns)
+
+    def texts_of(self, values):
+        return tuple(column.text(value) for column, value in zip(self.columns, values))
+
+    def update(self, processes):
+        """Show ``processes`` (ProcessInfo rows), changing only what differs"""
+        new = {process.pid: process for process in processes}
+
+        # Remove the rows of processes no longer listed, in runs from the bottom
+        gone = [row for row, pid in enumerate(self.pids) if pid not in new]
+        while gone:
+            last = first = gone.pop()
+            while gone and gone[-1] == first - 1:
+                first = gone.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.pids[first:last + 1]
+            del self.values[first:last + 1]
+            del self.texts[first:last + 1]
+            self.endRemoveRows()
+
+        # Update the rows that stay, signalling only the runs of changed cells
+        for row, pid in enumerate(self.pids):
+            values = self.values_of(new.pop(pid))
+            old = self.values[row]
+            if values == old:
+                continue
+            self.values[row] = values
+            self.texts[row] = self.texts_of(values)
+            changed = [column for column, value in enumerate(values) if value != old[column]]
+            while changed:
+                first = last = changed.pop(0)
+                while changed and changed[0] == last + 1:
+                    last = changed.pop(0)
+                self.dataChanged.emit(self.index(row, first), self.index(row, last),
+                                      [Qt.DisplayRole, SORT_ROLE])
+
+        # Append the processes that are new to the table
+        if new:
+            start = len(self.pids)
+            self.beginInsertRows(QModelIndex(), start, start + len(new) - 1)
+            for pid, process in new.items():
+                values = self.values_of(process)
+                self.pids.append(pid)
+                self.values.append(values)
+                self.texts.append(self.texts_of(values))
+            self.endInsertRows()
+
+
+class ProcessFilterProxyModel(QSortFilterProxyModel):
+    """Sorts on raw values and keeps the rows whose PID or command line match"""
+
+    def __init__(self, parent=None, filter_columns=(0, 1)):
+        super().__init__(parent)
+        self.filter_columns = filter_columns
+        self.filter_text = ''
+        self.setSortRole(SORT_ROLE)
+
+    def set_filter_text(self, text):
+        self.filter_text = text.lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.filter_text:
+            return True
+        values = self.sourceModel().values[source_row]
+        return any(self.filter_text in str(values[column]).lower()
+                   for column in self.filter_columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        # Number rows as shown, not by their position in the source model
+        if role == Qt.DisplayRole and orientation == Qt.Vertical:
+            return section + 1
+        return super().headerData(section, orientation, role)
@@ -0,0 +1,230 @@
+"""
+SysMon Real-Time Process Dialogs
+Base class of the CPU, disk I/O and network top-process dialogs.
+
+Each dialog shows one view ('cpu', 'disk' or 'net') of the snapshots
+published by the shared process scan (sysmon.snapshots): it redraws from
+a new snapshot once its update interval has passed, and "Refresh Now"
+shows the latest snapshot at once while asking the scan for a fresh one,
+ignoring snapshots scanned before that request.  Subclasses only declare
+the view and its table columns (sysmon.dialogs.process_model).
+"""
+
+import time
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                              QLabel, QSpinBox, QTableView, QLineEdit)
+from PyQt5.QtCore import Qt
+
+from sysmon.dialogs.placement import position_dialog
+from sysmon.dialogs.process_model import ProcessFilterProxyModel, ProcessTableModel
+from sysmon.processes import SNAPSHOT_INTERVAL
+
+
+class RealTimeSnapshotDialog(QDialog):
+    """Real-time top processes of one snapshot view.
+
+    Subclasses set ``title``, ``view``, the table ``columns``
+    (ProcessColumn), the ``sort_column`` sorted on (busiest first) until a
+    header is clicked, ``dialog_size`` and ``dialog_width`` (used for placement).
+    """
+    title = "Real-Time Top 10 Processes"
+    view = 'cpu'
+    columns = ()
+    sort_column = 2
+    dialog_size = (750, 400)
+    dialog_width = 550
+
+    def __init__(self, service, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(self.title)
+        self.resize(*self.dialog_size)
+        # Shown with exec_() and parented to the main window: free it once closed
+        self.setAttribute(Qt.WA_DeleteOnClose)
+
+        # Update interval in milliseconds (default 3 seconds)
+        self.update_interval = 3000
+
+        # Snapshots come from the shared process scan (sysmon.snapshots)
+        self.service = service
+        self.last_update = None  # Monotonic time of the last redraw
+        self.pending = None      # Scan generation a refresh is waiting for
+
+        # Setup UI
+        self.setup_ui()
+
+        # Position dialog intelligently
+        position_dialog(self, self.dialog_width, 400)
+
+        # Start real-time updates
+        self.start_real_time_updates()
+
+    def setup_ui(self):
+        """Setup the dialog UI components"""
+        layout = QVBoxLayout()
+
+        # Status indicator and controls
+        control_layout = QHBoxLayout()
+
+        # Status label
+        self.status_label = QLabel(f"🟢 Auto-updating every {self.update_interval / 1000:.0f} seconds")
+        self.status_label.setStyleSheet("QLabel { font-weight: bold; color: #4CAF50; }")
+        control_layout.addWidget(self.status_label)
+
+        control_layout.addStretch()
+
+        # Update interval controls
+        interval_label = QLabel("Update every:")
+        control_layout.addWidget(interval_label)
+
+        self.interval_spinbox = QSpinBox()
+        self.interval_spinbox.setMinimum(1)
+        self.interval_spinbox.setMaximum(60)
+        self.interval_spinbox.setValue(int(self.update_interval / 1000))
+        self.interval_spinbox.setSuffix(" sec")
+        self.interval_spinbox.valueChanged.connect(self.change_update_interval)
+        control_layout.addWidget(self.interval_spinbox)
+
+        # Pause/Resume button
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        control_layout.addWidget(self.pause_btn)
+
+        # Refresh button
+        refresh_btn = QPushButton("Refresh Now")
+        refresh_btn.clicked.connect(self.refresh_data)
+        control_layout.addWidget(refresh_btn)
+
+        layout.addLayout(control_layout)
+
+        # Filter text box
+        filter_layout = QHBoxLayout()
+        filter_label = QLabel("Filter:")
+        filter_layout.addWidget(filter_label)
+
+        self.filter_box = QLineEdit()
+        self.filter_box.setPlaceholderText("Type to filter processes by name or PID...")
+        self.filter_box.textChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.filter_box)
+
+        clear_filter_btn = QPushButton("Clear")
+        clear_filter_btn.clicked.connect(lambda: self.filter_box.clear())
+        filter_layout.addWidget(clear_filter_btn)
+
+        layout.addLayout(filter_layout)
+
+        self.setup_table(layout)
+
+        # Close button
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+
+        self.setLayout(layout)
+
+    def setup_table(self, layout):
+        """Add the process table to ``layout``"""
+        # Process table: rows keyed by PID, sorted and filtered by a proxy
+        self.model = ProcessTableModel(self.columns, self)
+        self.proxy = ProcessFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy)
+
+        # Left-justify header labels
+        header = self.table_view.horizontalHeader()
+        header.setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+        # Set column widths
+        for column, spec in enumerate(self.columns):
+            self.table_view.setColumnWidth(column, spec.width)
+
+        # Make table rows non-editable
+        self.table_view.setEditTriggers(QTableView.NoEditTriggers)
+
+        # Enable sorting by clicking column headers; busiest first until then
+        self.table_view.setSortingEnabled(True)
+        self.table_view.sortByColumn(self.sort_column, Qt.DescendingOrder)
+
+        layout.addWidget(self.table_view)
+
+    def start_real_time_updates(self):
+        """Subscribe to the process snapshots and show the latest one"""
+        self.is_paused = False
+        self.service.subscribe(self, (self.view,))
+        self.service.snapshot_ready.connect(self.on_snapshot)
+        self.finished.connect(self.stop_updates)  # Escape closes without a closeEvent
+        self.refresh_data()
+
+    def toggle_pause(self):
+        """Toggle between pause and resume"""
+        if self.is_paused:
+            # Resume updates
+            self.is_paused = False
+            self.pause_btn.setText("Pause")
+            self.status_label.setText(f"🟢 Auto-updating every {self.update_interval / 1000:.0f} seconds")
+            self.status_label.setStyleSheet("QLabel { font-weight: bold; color: #4CAF50; }")
+            self.refresh_data()
+        else:
+            # Pause updates
+            self.is_paused = True
+            self.pause_btn.setText("Resume")
+            self.status_label.setText("🟡 Updates paused")
+            self.status_label.setStyleSheet("QLabel { font-weight: bold; color: #FF9800; }")
+
+    def change_update_interval(self, value):
+        """Change the update interval based on spinbox value"""
+        self.update_interval = value * 1000  # Convert seconds to milliseconds
+
+        # Update status label
+        if not self.is_paused:
+            self.status_label.setText(f"🟢 Auto-updating every {value} seconds")
+
+    def on_snapshot(self, snapshot):
+        """Redraw from a new snapshot once the update interval has passed"""
+        if self.pending is not None and snapshot.generation >= self.pending:
+            self.pending = None  # The scan a refresh asked for, shown even when paused
+        elif self.is_paused or self.pending is not None:
+            return  # Paused, or scanned before the pending refresh was asked for
+        else:
+            # Snapshots arrive once per scan; take the first one due, not the one after
+            due = self.update_interval / 1000 - SNAPSHOT_INTERVAL / 2
+            if self.last_update is not None and time.monotonic() - self.last_update < due:
+                return
+        self.show_snapshot(snapshot)
+
+    def refresh_data(self):
+        """Redraw from the latest snapshot right away and ask for a fresh scan"""
+        if self.service.latest is not None:
+            self.show_snapshot(self.service.latest)
+        self.pending = self.service.request_scan(self.view)
+
+    def show_snapshot(self, snapshot):
+        if self.view not in snapshot.views:
+            return  # Scanned before this dialog subscribed
+        self.last_update = time.monotonic()
+        self.update_table(snapshot.top(self.view))
+
+    def update_table(self, processes):
+        """Update table with new process data"""
+        self.model.update(processes)
+
+    def apply_filter(self):
+        """Filter table rows based on search text"""
+        self.proxy.set_filter_text(self.filter_box.text())
+
+    def stop_updates(self):
+        """Stop following the process snapshots"""
+        try:
+            self.service.snapshot_ready.disconnect(self.on_snapshot)
+        except TypeError:
+            pass  # Already disconnected
+        self.service.unsubscribe(self)
+        self.pending = None
+
+    def closeEvent(self, a0):
+        """Clean up resources when dialog is closed"""
+        self.stop_updates()
+
+        # Accept the close event
+        a0.accept()
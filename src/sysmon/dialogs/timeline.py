@@ -0,0 +1,209 @@
+"""
+SysMon Process Timeline Dialog
+Waterfall of the top processes per interval by CPU, disk I/O or network.
+
+Each recorded interval is drawn as a column of stacked bands, one per
+ranked process, colored by process name, so a spike on the main graphs
+can be traced back to the process that caused it.  The data comes from
+the main window's ProcessRankings.  The dialog subscribes every ranking
+metric to the shared process scan while it is open, so processes are
+only scanned (and socket tables read) while someone is looking.
+"""
+
+import datetime
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                              QLabel, QSpinBox, QComboBox)
+from PyQt5.QtCore import Qt, QTimer
+
+from sysmon.curves import device_color
+from sysmon.dialogs.placement import position_dialog
+from sysmon.ranking import RANKING_INTERVAL, RANKING_METRICS
+
+LEGEND_NAMES = 10  # Busiest processes listed under the plot
+
+
+class ProcessTimelineDialog(QDialog):
+    """Stacked top-N process bands over time (waterfall)"""
+    def __init__(self, rankings, service, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Process Timeline")
+        self.resize(850, 450)
+        # Shown with exec_() and parented to the main window: free it once closed
+        self.setAttribute(Qt.WA_DeleteOnClose)
+
+        self.rankings = rankings
+        self.service = service
+        self.metric = 'cpu'
+        self.window_seconds = 120
+        self._brushes = {}  # Color -> QBrush, shared by every band of that color
+        self._drawn = None  # (times, pids, name_ids, values, names, now) on screen
+
+        # Redraw once a second, matching the ranking interval
+        self.update_interval = int(RANKING_INTERVAL * 1000)
+        self.update_timer = QTimer(self)
+        self.update_timer.timeout.connect(self.refresh_data)
+        self.finished.connect(self.update_timer.stop)  # Escape closes without a closeEvent
+        self.finished.connect(self.stop_ranking)
+        service.subscribe(self, tuple(RANKING_METRICS))
+
+        self.setup_ui()
+        position_dialog(self, 850, 450)
+        self.start_real_time_updates()
+        self.refresh_data()
+
+    def setup_ui(self):
+        """Setup the dialog UI components"""
+        layout = QVBoxLayout()
+
+        control_layout = QHBoxLayout()
+
+        self.status_label = QLabel("🟢 Recording top processes")
+        self.status_label.setStyleSheet("QLabel { font-weight: bold; color: #4CAF50; }")
+        control_layout.addWidget(self.status_label)
+
+        control_layout.addStretch()
+
+        control_layout.addWidget(QLabel("Rank by:"))
+        self.metric_combo = QComboBox()
+        for name, label in RANKING_METRICS.items():
+            self.metric_combo.addItem(label, name)
+        self.metric_combo.currentIndexChanged.connect(self.change_metric)
+        control_layout.addWidget(self.metric_combo)
+
+        control_layout.addWidget(QLabel("Show last:"))
+        self.window_spinbox = QSpinBox()
+        self.window_spinbox.setMinimum(10)
+        self.window_spinbox.setMaximum(int(self.rankings.capacity * RANKING_INTERVAL))
+        self.window_spinbox.setValue(self.window_seconds)
+        self.window_spinbox.setSuffix(" sec")
+        self.window_spinbox.valueChanged.connect(self.change_window)
+        control_layout.addWidget(self.window_spinbox)
+
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        control_layout.addWidget(self.pause_btn)
+
+        layout.addLayout(control_layout)
+
+        self.plot = pg.PlotWidget()
+        self.plot.setLabel('bottom', 'Time', units='s')
+        self.plot.showGrid(x=True, y=True, alpha=0.3)
+        self.plot.setMouseEnabled(x=False, y=False)
+        self.plot.getPlotItem().hideButtons()
+        self.bars = pg.BarGraphItem(x0=[], y0=[], width=[], height=[])
+        self.plot.addItem(self.bars)
+        self.plot.scene().sigMouseMoved.connect(self.on_hover)
+        layout.addWidget(self.plot)
+
+        # Processes under the mouse, then the busiest processes in view
+        self.detail_label = QLabel("Hover over the timeline to see the ranked processes")
+        layout.addWidget(self.detail_label)
+        self.legend_label = QLabel()
+        self.legend_label.setWordWrap(True)
+        layout.addWidget(self.legend_label)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+
+        self.setLayout(layout)
+
+    def start_real_time_updates(self):
+        """Start real-time redraws"""
+        self.update_timer.start(self.update_interval)
+        self.is_paused = False
+
+    def toggle_pause(self):
+        """Freeze the timeline (recording continues) or follow it again"""
+        if self.is_paused:
+            self.update_timer.start(self.update_interval)
+            self.is_paused = False
+            self.pause_btn.setText("Pause")
+            self.status_label.setText("🟢 Recording top processes")
+            self.status_label.setStyleSheet("QLabel { font-weight: bold; color: #4CAF50; }")
+            self.refresh_data()
+        else:
+            self.update_timer.stop()
+            self.is_paused = True
+            self.pause_btn.setText("Resume")
+            self.status_label.setText("🟡 Timeline paused")
+            self.status_label.setStyleSheet("QLabel { font-weight: bold; color: #FF9800; }")
+
+    def change_metric(self, index):
+        self.metric = self.metric_combo.itemData(index)
+        self.refresh_data()
+
+    def change_window(self, value):
+        self.window_seconds = value
+        self.refresh_data()
+
+    def _brush(self, color):
+        brush = self._brushes.get(color)
+        if brush is None:
+            brush = self._brushes[color] = pg.mkBrush(color)
+        return brush
+
+    def refresh_data(self):
+        """Redraw the bands for the selected metric and time window"""
+        now = time.time()
+        times, pids, name_ids, values = self.rankings.window(
+            self.metric, now - self.window_seconds - RANKING_INTERVAL)
+        names = self.rankings.names  # Compaction swaps in a new list; keep this one
+        self._drawn = (times, pids, name_ids, values, names, now)
+        self.plot.setLabel('left', RANKING_METRICS[self.metric])
+        self.plot.setXRange(-self.window_seconds, 0, padding=0)
+
+        # Each interval spans from the previous record to its own timestamp
+        widths = np.diff(times, prepend=times[0] - RANKING_INTERVAL) if len(times) else times
+        valid = name_ids >= 0
+        rows, ranks = np.nonzero(valid)
+        heights = values[rows, ranks]
+        bottoms = (np.cumsum(values, axis=1) - values)[rows, ranks]
+        colors = [device_color(names[i]) for i in name_ids[rows, ranks]]
+        self.bars.setOpts(x0=times[rows] - widths[rows] - now, width=widths[rows],
+                          y0=bottoms, height=heights,
+                          brushes=[self._brush(c) for c in colors], pen=None)
+        self.update_legend(name_ids[valid], heights, names)
+
+    def update_legend(self, ids, heights, names):
+        """List the processes with the largest share of the window"""
+        if len(ids) == 0:
+            self.legend_label.setText("No process activity recorded in this window yet")
+            return
+        totals = np.bincount(ids, weights=heights)
+        busiest = np.argsort(totals)[::-1][:LEGEND_NAMES]
+        parts = [f'<span style="color:{device_color(names[i])};">■</span> {names[i]}'
+                 for i in busiest if totals[i] > 0]
+        self.legend_label.setText('&nbsp;&nbsp;'.join(parts))
+
+    def on_hover(self, pos):
+        """Show the ranked processes of the interval under the mouse"""
+        if self._drawn is None or not self.plot.sceneBoundingRect().contains(pos):
+            return
+        times, pids, name_ids, values, names, now = self._drawn
+        if len(times) == 0:
+            return
+        x = self.plot.getPlotItem().getViewBox().mapSceneToView(pos).x() + now
+        row = min(int(np.searchsorted(times, x)), len(times) - 1)
+        stamp = datetime.datetime.fromtimestamp(times[row]).strftime('%H:%M:%S')
+        unit = '%' if self.metric == 'cpu' else (' MB/s' if self.metric == 'disk' else '')
+        parts = [f'<span style="color:{device_color(names[i])};">{names[i]}</span> '
+                 f'({pid}) {value:.1f}{unit}'
+                 for i, pid, value in zip(name_ids[row], pids[row], values[row]) if i >= 0]
+        self.detail_label.setText(f'<b>{stamp}</b>&nbsp;&nbsp;' +
+                                  ('&nbsp;|&nbsp;'.join(parts) or 'no activity'))
+
+    def stop_ranking(self):
+        """Stop scanning processes for the rankings"""
+        self.service.unsubscribe(self)
+
+    def closeEvent(self, a0):
+        """Stop redrawing when the dialog is closed"""
+        if self.update_timer:
+            self.update_timer.stop()
+        self.stop_ranking()
+        a0.accept()
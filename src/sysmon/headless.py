@@ -0,0 +1,85 @@
+"""
+SysMon Headless Recorder
+Run the collection pipeline without a display and append samples to a recording.
+
+Usage: sysmon.py --headless --record FILE [--interval MS] [--backend NAME]
+
+Nothing here imports PyQt5 or pyqtgraph.  The sampler thread collects
+exactly as it does for the GUI; the main thread wakes once a second,
+drains the queue, writes the batch and flushes.
+"""
+
+import argparse
+import json
+import os
+import signal
+import threading
+
+from sysmon.collectors import COLLECTOR_BACKENDS, create_sources, resolve_backend
+from sysmon.config import get_xdg_config_dir, get_preferences_file_path
+from sysmon.recording import RecordingWriter
+from sysmon.sampler import Sampler
+
+FLUSH_INTERVAL = 1.0  # Seconds between queue drains / file flushes
+
+
+def load_preferences():
+    """Return the GUI's saved preferences, or {} when there are none"""
+    try:
+        with open(get_preferences_file_path(get_xdg_config_dir()), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def parse_args(argv):
+    prefs = load_preferences()
+    parser = argparse.ArgumentParser(prog='sysmon.py --headless',
+                                     description='Record system metrics without a display.')
+    parser.add_argument('--headless', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--record', required=True, metavar='FILE',
+                        help='recording to create or append to')
+    parser.add_argument('--interval', type=int, metavar='MS',
+                        default=prefs.get('update_interval', 200),
+                        help='base sampling interval in milliseconds (default: saved preference)')
+    parser.add_argument('--backend', choices=COLLECTOR_BACKENDS,
+                        default=prefs.get('collector_backend', 'auto'),
+                        help='collector backend (default: saved preference)')
+    return parser.parse_args(argv)
+
+
+def record(path, interval_ms, backend, stop_event):
+    """Sample into ``path`` until ``stop_event`` is set"""
+    sampler = Sampler(create_sources(backend), interval_ms)
+
+    # Sampler times are relative to its origin; the recording stores epoch seconds
+    with RecordingWriter(path, time_offset=sampler.wall_origin,
+                         intervals=sampler.intervals()) as writer:
+        sampler.start()
+        print(f"Recording to {path} every {interval_ms} ms "
+              f"(backend: {resolve_backend(backend)}); Ctrl+C to stop")
+        try:
+            while not stop_event.wait(FLUSH_INTERVAL):
+                for sample in sampler.drain():
+                    writer.write(sample.pop('source'), sample)
+                writer.flush()
+        finally:
+            sampler.stop()
+            sampler.join(timeout=2.0)
+            for sample in sampler.drain():
+                writer.write(sample.pop('source'), sample)
+
+
+def main(argv):
+    args = parse_args(argv)
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    try:
+        record(os.path.expanduser(args.record), max(50, args.interval), args.backend, stop_event)
+    except (OSError, ValueError) as e:
+        print(f"Recording failed: {e}")
+        return 1
+    print("Recording stopped")
+    return 0
@@ -0,0 +1,225 @@
+"""
+SysMon History
+Persistent, memory-mapped columnar history of every sample, with rotation.
+
+Each metric source gets its own series of fixed-size segment files
+(``cpu-000001.npy`` ...), stored as .npy arrays of shape
+(1 + columns, SEGMENT_ROWS): row 0 holds epoch timestamps and each
+further row holds one column.  Segments are opened as memory maps, so
+appending a sample writes one value per column and reading a page only
+touches the pages that cover the requested time range.  When a segment
+fills up a new one is started and the oldest beyond MAX_SEGMENTS is
+deleted, which bounds the disk usage per source.
+"""
+
+import os
+import re
+
+import numpy as np
+
+from sysmon.store import METRIC_GROUPS
+
+SEGMENT_ROWS = 32768  # ~1.8 hours per segment at the default 200 ms tick
+MAX_SEGMENTS = 16     # Per source; ~29 hours at the default tick
+
+_SEGMENT_NAME = re.compile(r'^(\w+)-(\d{6})\.npy$')
+
+
+def _filled_rows(times):
+    """Number of written rows; unwritten timestamps are NaN and always trail"""
+    lo, hi = 0, len(times)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if np.isnan(times[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class HistorySegment:
+    """One memory-mapped segment file of a source's history"""
+
+    def __init__(self, path, columns, rows=SEGMENT_ROWS, create=False):
+        self.path = path
+        if create:
+            self.data = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64,
+                                                  shape=(1 + len(columns), rows))
+            self.data[0] = np.nan
+            self.count = 0
+        else:
+            self.data = np.lib.format.open_memmap(path, mode='r+')
+            if self.data.shape[0] != 1 + len(columns):
+                raise ValueError(f"{path} has {self.data.shape[0] - 1} columns, "
+                                 f"expected {len(columns)}")
+            self.count = _filled_rows(self.data[0])
+
+    @property
+    def full(self):
+        return self.count >= self.data.shape[1]
+
+    @property
+    def first_time(self):
+        return float(self.data[0, 0]) if self.count else None
+
+    @property
+    def last_time(self):
+        return float(self.data[0, self.count - 1]) if self.count else None
+
+    def append(self, row):
+        self.data[:, self.count] = row
+        self.count += 1
+
+    def read(self, t_start, t_end):
+        """Copy of the rows with t_start <= time <= t_end, shape (1 + columns, n)"""
+        times = self.data[0, :self.count]
+        i = int(np.searchsorted(times, t_start, side='left'))
+        j = int(np.searchsorted(times, t_end, side='right'))
+        return np.array(self.data[:, i:j])
+
+    def close(self):
+        self.data.flush()
+        self.data = None
+
+
+class HistoryStore:
+    """Append-only on-disk history for every metric source.
+
+    Sample times are sampler-relative; ``time_offset`` converts them to
+    epoch seconds so history from earlier sessions lines up.
+    """
+
+    def __init__(self, directory, groups=METRIC_GROUPS, time_offset=0.0,
+                 segment_rows=SEGMENT_ROWS, max_segments=MAX_SEGMENTS):
+        self.directory = directory
+        self.groups = {name: tuple(columns) for name, columns in groups.items()}
+        self.time_offset = time_offset
+        self.segment_rows = segment_rows
+        self.max_segments = max_segments
+        os.makedirs(directory, exist_ok=True)
+        self.segments = {name: [] for name in self.groups}
+        self._next_seq = {name: 1 for name in self.groups}
+        self._open_existing()
+
+    def _open_existing(self):
+        for filename in sorted(os.listdir(self.directory)):
+            match = _SEGMENT_NAME.match(filename)
+            if not match or match.group(1) not in self.groups:
+                continue
+            name, seq = match.group(1), int(match.group(2))
+            path = os.path.join(self.directory, filename)
+            try:
+                segment = HistorySegment(path, self.groups[name])
+            except (OSError, ValueError) as e:
+                print(f"Discarding unreadable history segment {filename}: {e}")
+                os.remove(path)
+                continue
+            self.segments[name].append(segment)
+            self._next_seq[name] = seq + 1
+
+    def _rotate(self, name):
+        """Start a new segment for a source, dropping the oldest past the limit"""
+        seq = self._next_seq[name]
+        self._next_seq[name] = seq + 1
+        path = os.path.join(self.directory, f'{name}-{seq:06d}.npy')
+        segments = self.segments[name]
+        segments.append(HistorySegment(path, self.groups[name], self.segment_rows, create=True))
+        while len(segments) > self.max_segments:
+            oldest = segments.pop(0)
+            oldest.close()
+            os.remove(oldest.path)
+        return segments[-1]
+
+    def append(self, group, sample):
+        """Record one sample of a source; unknown groups are ignored"""
+        columns = self.groups.get(group)
+        if columns is None:
+            return
+        segments = self.segments[group]
+        segment = segments[-1] if segments and not segments[-1].full else self._rotate(group)
+        row = [self.time_offset + sample['time']]
+        row.extend(sample.get(column, np.nan) for column in columns)
+        segment.append(row)
+
+    def earliest_time(self):
+        """Oldest recorded epoch time across every source, or None"""
+        times = [segments[0].first_time for segments in self.segments.values()
+                 if segments and segments[0].count]
+        return min(times) if times else None
+
+    def read(self, group, t_start, t_end):
+        """Return {'time': ..., column: ...} arrays for one source between two epoch times"""
+        columns = ('time',) + self.groups[group]
+        parts = [segment.read(t_start, t_end) for segment in self.segments[group]
+                 if segment.count and segment.last_time >= t_start
+                 and segment.first_time <= t_end]
+        block = np.concatenate(parts, axis=1) if parts else np.empty((len(columns), 0))
+        return dict(zip(columns, block))
+
+    def page(self, t_start, t_end):
+        """A HistoryPage of every source between two epoch times"""
+        return HistoryPage({group: self.read(group, t_start, t_end) for group in self.groups},
+                           t_end)
+
+    def flush(self):
+        for segments in self.segments.values():
+            if segments:
+                segments[-1].data.flush()
+
+    def close(self):
+        for segments in self.segments.values():
+            for segment in segments:
+                segment.close()
+            segments.clear()
+
+
+class HistoryPage:
+    """A read-only slice of history with the same lookups as MetricStore.
+
+    ``latest_time()`` is the end of the page, so plots and hover show the
+    page on the usual -time_window..0 axis.
+    """
+
+    def __init__(self, tables, end_time):
+        self.tables = tables
+        self.end_time = end_time
+        self._totals = {}  # A page never changes, so each total is summed once
+
+    def __len__(self):
+        return sum(len(table['time']) for table in self.tables.values())
+
+    def __contains__(self, column):
+        return self.table_of(column) is not None
+
+    def __getitem__(self, column):
+        return self.table_of(column)[column]
+
+    def group_of(self, column):
+        for name, table in self.tables.items():
+            if column in table:
+                return name
+        return None
+
+    def table_of(self, column):
+        for table in self.tables.values():
+            if column in table:
+                return table
+        return None
+
+    def times(self, column):
+        return self.table_of(column)['time']
+
+    def latest_time(self):
+        return self.end_time
+
+    def total(self, column):
+        total = self._totals.get(column)
+        if total is None:
+            total = self._totals[column] = float(np.nansum(self[column]))
+        return total
+
+    def width(self, column):
+        return None
+
+    def appended(self, column):
+        return None  # A page is static; nothing is ever appended
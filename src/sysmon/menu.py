@@ -3,7 +3,10 @@ SysMon Menu Bar Mixin
 Complete menu bar construction for the main window.
 """
 
-from PyQt5.QtWidgets import QAction
+from PyQt5.QtWidgets import QAction, QActionGroup
+
+from sysmon.decimate import DECIMATION_METHODS
+from sysmon.replay import REPLAY_SPEEDS
 
 
 class MenuMixin:
@@ -28,6 +31,43 @@ class MenuMixin:
         export_graph_action.triggered.connect(self.export_graph)
         file_menu.addAction(export_graph_action)
 
+        export_timings_action = QAction('Export Frame &Timings...', self)
+        export_timings_action.setStatusTip('Save the per-section frame timings as CSV')
+        export_timings_action.triggered.connect(self.export_frame_timings)
+        file_menu.addAction(export_timings_action)
+
+        file_menu.addSeparator()
+
+        open_recording_action = QAction('&Open Recording...', self)
+        open_recording_action.setShortcut('Ctrl+O')
+        open_recording_action.setStatusTip('Replay a recording made with --headless --record')
+        open_recording_action.triggered.connect(self.open_recording_dialog)
+        file_menu.addAction(open_recording_action)
+
+        replay_menu = file_menu.addMenu('&Replay')
+        self.replay_pause_action = QAction('&Pause', self, checkable=True)
+        self.replay_pause_action.setShortcut('Space')
+        self.replay_pause_action.triggered.connect(self.toggle_replay_pause)
+        replay_menu.addAction(self.replay_pause_action)
+        self.replay_step_action = QAction('Step &Frame', self)
+        self.replay_step_action.setShortcut('.')
+        self.replay_step_action.triggered.connect(self.step_replay)
+        replay_menu.addAction(self.replay_step_action)
+        replay_menu.addSeparator()
+        speed_group = QActionGroup(self)
+        self.replay_speed_actions = {}
+        for speed in REPLAY_SPEEDS:
+            action = QAction(f'{speed}x Speed', self, checkable=True)
+            action.triggered.connect(lambda checked, s=speed: self.set_replay_speed(s))
+            speed_group.addAction(action)
+            replay_menu.addAction(action)
+            self.replay_speed_actions[speed] = action
+        replay_menu.addSeparator()
+        self.replay_stop_action = QAction('&Stop Replay', self)
+        self.replay_stop_action.triggered.connect(self.stop_replay)
+        replay_menu.addAction(self.replay_stop_action)
+        self.update_replay_actions()
+
         file_menu.addSeparator()
 
         exit_action = QAction('E&xit', self)
@@ -66,6 +106,12 @@ class MenuMixin:
         self.show_cpu_action.triggered.connect(self.toggle_cpu_plot)
         view_menu.addAction(self.show_cpu_action)
 
+        self.cpu_per_core_action = QAction('Per-Core CPU &Heatmap', self, checkable=True)
+        self.cpu_per_core_action.setStatusTip('Show one heatmap row per logical CPU instead of the average')
+        self.cpu_per_core_action.setChecked(self.cpu_per_core)
+        self.cpu_per_core_action.triggered.connect(self.toggle_cpu_per_core)
+        view_menu.addAction(self.cpu_per_core_action)
+
         self.show_memory_action = QAction('Show &Memory', self, checkable=True)
         self.show_memory_action.setChecked(True)
         self.show_memory_action.triggered.connect(self.toggle_memory_plot)
@@ -76,19 +122,45 @@ class MenuMixin:
         self.show_disk_action.triggered.connect(self.toggle_disk_plot)
         view_menu.addAction(self.show_disk_action)
 
+        self.disk_per_device_action = QAction('Per-Dis&k Breakdown', self, checkable=True)
+        self.disk_per_device_action.setStatusTip('Plot each disk separately')
+        self.disk_per_device_action.setChecked(self.per_device['disk'])
+        self.disk_per_device_action.triggered.connect(self.toggle_disk_per_device)
+        view_menu.addAction(self.disk_per_device_action)
+
         self.show_network_action = QAction('Show &Network', self, checkable=True)
         self.show_network_action.setChecked(True)
         self.show_network_action.triggered.connect(self.toggle_network_plot)
         view_menu.addAction(self.show_network_action)
 
+        self.net_per_device_action = QAction('Per-&Interface Breakdown', self, checkable=True)
+        self.net_per_device_action.setStatusTip('Plot each network interface separately')
+        self.net_per_device_action.setChecked(self.per_device['net'])
+        self.net_per_device_action.triggered.connect(self.toggle_net_per_device)
+        view_menu.addAction(self.net_per_device_action)
+
         view_menu.addSeparator()
 
+        timeline_action = QAction('Process &Timeline...', self)
+        timeline_action.setShortcut('Ctrl+T')
+        timeline_action.setStatusTip('Top processes by CPU, disk or network over time')
+        timeline_action.triggered.connect(self.show_process_timeline)
+        view_menu.addAction(timeline_action)
+
         fullscreen_action = QAction('&Full Screen', self)
         fullscreen_action.setShortcut('F11')
         fullscreen_action.setStatusTip('Toggle full screen mode')
         fullscreen_action.triggered.connect(self.toggle_fullscreen)
         view_menu.addAction(fullscreen_action)
 
+        self.frame_timings_action = QAction('Show Frame T&imings', self, checkable=True)
+        self.frame_timings_action.setShortcut('F12')
+        self.frame_timings_action.setStatusTip('Overlay p50/p95/max time spent collecting, '
+                                               'smoothing, updating and painting')
+        self.frame_timings_action.setChecked(self.show_frame_timings)
+        self.frame_timings_action.triggered.connect(self.toggle_profiler_hud)
+        view_menu.addAction(self.frame_timings_action)
+
         # Config Menu
         config_menu = menubar.addMenu('&Config')
 
@@ -114,6 +186,43 @@ class MenuMixin:
         smoothing_action.triggered.connect(self.change_smoothing_level)
         config_menu.addAction(smoothing_action)
 
+        decimation_menu = config_menu.addMenu('&Decimation')
+        decimation_group = QActionGroup(self)
+        self.decimation_actions = {}
+        for name, label in DECIMATION_METHODS.items():
+            action = QAction(label, self, checkable=True)
+            action.setChecked(name == self.decimation)
+            action.triggered.connect(lambda checked, n=name: self.change_decimation(n))
+            decimation_group.addAction(action)
+            decimation_menu.addAction(action)
+            self.decimation_actions[name] = action
+
+        self.opengl_action = QAction('Use &OpenGL Rendering', self, checkable=True)
+        self.opengl_action.setStatusTip('Draw the graphs with OpenGL (falls back to software '
+                                        'when no hardware OpenGL is available)')
+        self.opengl_action.setChecked(self.use_opengl)
+        self.opengl_action.triggered.connect(self.toggle_opengl)
+        config_menu.addAction(self.opengl_action)
+
+        render_benchmark_action = QAction('Rendering Ben&chmark', self)
+        render_benchmark_action.setStatusTip('Compare frames per second and CPU use of '
+                                             'software and OpenGL rendering')
+        render_benchmark_action.triggered.connect(self.start_render_benchmark)
+        config_menu.addAction(render_benchmark_action)
+
+        backend_menu = config_menu.addMenu('Collector &Backend')
+        backend_group = QActionGroup(self)
+        self.collector_backend_actions = {}
+        for name, label in (('auto', '&Auto (procfs on Linux)'),
+                            ('psutil', '&psutil'),
+                            ('procfs', 'Native &procfs (Linux)')):
+            action = QAction(label, self, checkable=True)
+            action.setChecked(name == self.collector_backend)
+            action.triggered.connect(lambda checked, n=name: self.change_collector_backend(n))
+            backend_group.addAction(action)
+            backend_menu.addAction(action)
+            self.collector_backend_actions[name] = action
+
         from sysmon.theme_registry import get_theme_registry, ThemeCategory
 
         registry = get_theme_registry()
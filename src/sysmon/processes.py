@@ -0,0 +1,326 @@
+"""
+SysMon Process Table
+Long-lived per-process state shared between process scans.
+
+A process is identified by ``(pid, create_time)``, so a PID that is
+reused by a new process starts from scratch instead of inheriting the
+old process's counters.  Each refresh is a single process_iter walk:
+CPU percent is the CPU-time delta since the previous refresh divided by
+the wall time between them, so only the very first refresh has nothing
+to compare against.  Processes missing from a walk are evicted.
+
+ProcessSnapshotSource is a metric source (no Qt) built on one table: each
+interval it walks the process list once, reading together the attributes
+(VIEW_ATTRS) of the views currently subscribed through
+sysmon.snapshots.ProcessSnapshotService, counts every process's sockets
+from one pass over the system-wide socket tables when a 'net' view is
+among them, and returns an immutable ProcessSnapshot that every
+drill-down view (and the process timeline) reads from.
+"""
+
+import collections
+import heapq
+import socket
+import time
+
+import psutil
+
+MB = 1024 ** 2
+
+SNAPSHOT_INTERVAL = 1.0  # Seconds between process scans
+SNAPSHOT_TOP = 10        # Rows per view that get their command line read
+
+# One immutable row per process; cmdline is the full command line for the
+# rows at the top of a view and just the name for everything else
+ProcessInfo = collections.namedtuple('ProcessInfo', (
+    'pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent',
+    'read_rate', 'write_rate', 'total_io',
+    'connections', 'tcp_connections', 'udp_connections',
+    'established_count', 'listen_count'))
+
+# View -> (sort key, which processes the view lists; None for all)
+SNAPSHOT_VIEWS = {
+    'cpu': (lambda p: p.cpu_percent or 0.0, None),
+    'disk': (lambda p: (p.read_rate + p.write_rate, p.total_io), lambda p: p.total_io > 0),
+    'net': (lambda p: p.connections, lambda p: p.connections > 0),
+}
+
+# View -> process_iter attrs it needs on top of pid, create_time and
+# cpu_times (all from the same stat file).  A scan reads the union of the
+# attrs of the views in ProcessSnapshotSource.views -- in the app, the
+# views subscribed to ProcessSnapshotService -- each under one oneshot()
+# per process, so every procfs file is read at most once per refresh.
+# Connection counts come from the system-wide socket table, read only
+# while 'net' is among those views.
+VIEW_ATTRS = {
+    'cpu': ('name', 'memory_percent'),
+    'disk': ('name', 'io_counters'),
+    'net': ('name',),
+}
+
+NO_CONNECTIONS = (0, 0, 0, 0, 0)  # total, tcp, udp, established, listen
+
+
+def view_attrs(views):
+    """process_iter attrs covering every view in ``views``, in a stable order"""
+    attrs = []
+    for view in views:
+        for attr in VIEW_ATTRS[view]:
+            if attr not in attrs:
+                attrs.append(attr)
+    if 'io_counters' in attrs and not hasattr(psutil.Process, 'io_counters'):
+        attrs.remove('io_counters')  # Not available on macOS
+    return attrs
+
+
+class ProcessEntry:
+    """What a ProcessTable remembers about one process between refreshes"""
+
+    __slots__ = ('process', 'cpu_seconds', 'io_bytes', 'name', 'cmdline')
+
+    def __init__(self, process, cpu_seconds, io_bytes=None):
+        self.process = process
+        self.cpu_seconds = cpu_seconds
+        self.io_bytes = io_bytes  # (read, write) bytes, when I/O counters are tracked
+        self.name = None     # Kept from the second sighting on (after any exec)
+        self.cmdline = None  # Read on first use; a process's command line doesn't change
+
+
+class ProcessTable:
+    """Process handles and CPU times keyed by (pid, create_time).
+
+    ``refresh()`` returns one dict per live process with the requested
+    ``attrs`` plus 'pid', 'create_time' and 'cpu_percent' (None until the
+    process has been seen by two refreshes).  With 'io_counters' among
+    the attrs, the counters are replaced by 'read_rate' and 'write_rate'
+    (MB/s since the previous refresh, 0.0 until then) and 'total_io' (MB
+    read and written so far).  Not thread-safe: use one table per
+    scanning thread.
+
+    Each process's attrs are read by one as_dict() call, which holds
+    psutil's oneshot() cache, so stat, statm and io are read at most once
+    per refresh.  'name' is read until a process has been seen twice and
+    then kept: on Linux psutil re-reads the command line (and, for kernel
+    threads, stat again) for every name of 15 characters or more.
+    """
+
+    def __init__(self, attrs=('name', 'memory_percent')):
+        self.set_attrs(attrs)
+        self.entries = {}       # (pid, create_time) -> ProcessEntry
+        self.refreshed_at = None
+
+    def set_attrs(self, attrs):
+        """Read ``attrs`` from the next refresh on; known processes are kept.
+
+        When I/O counters start being tracked, a process's rates are 0.0
+        until the refresh after the one that first read its counters.
+        """
+        self.attrs = ['pid', 'cpu_times', *attrs]
+        self.known_attrs = [attr for attr in self.attrs if attr != 'name']
+        self.track_io = 'io_counters' in attrs
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def warm(self):
+        """True once a refresh exists to take CPU deltas against"""
+        return self.refreshed_at is not None
+
+    def refresh(self):
+        """Walk the process list once; returns a list of per-process dicts"""
+        now = time.monotonic()
+        elapsed = now - self.refreshed_at if self.refreshed_at is not None else None
+        entries = {}
+        rows = []
+        for proc in psutil.process_iter():
+            try:
+                create_time = proc.create_time()  # Cached by psutil after the first call
+            except psutil.AccessDenied:
+                create_time = None
+            except psutil.NoSuchProcess:
+                continue
+            key = (proc.pid, create_time)
+            entry = self.entries.get(key)
+            try:
+                if entry is not None and entry.name is not None:
+                    info = proc.as_dict(self.known_attrs, ad_value=None)
+                    info['name'] = entry.name
+                else:
+                    info = proc.as_dict(self.attrs, ad_value=None)
+            except psutil.NoSuchProcess:
+                continue
+            info['create_time'] = create_time
+            times = info.pop('cpu_times')
+            cpu_seconds = times.user + times.system if times is not None else None
+            io_bytes = None
+            if self.track_io:
+                io = info.pop('io_counters')
+                if io is not None:
+                    io_bytes = (io.read_bytes, io.write_bytes)
+                info['read_rate'] = info['write_rate'] = 0.0
+                info['total_io'] = sum(io_bytes) / MB if io_bytes is not None else 0.0
+            if (entry is not None and None not in (cpu_seconds, entry.cpu_seconds)
+                    and cpu_seconds < entry.cpu_seconds):
+                # CPU time never goes backwards: the PID was reused by a
+                # process psutil still reports the old create_time for
+                entry = None
+                if 'name' in self.attrs:
+                    try:
+                        info['name'] = proc.name()
+                    except psutil.Error:
+                        info['name'] = None
+            if entry is None:
+                entry = ProcessEntry(proc, cpu_seconds, io_bytes)
+                info['cpu_percent'] = None
+            else:
+                if None in (cpu_seconds, entry.cpu_seconds) or not elapsed:
+                    info['cpu_percent'] = None
+                else:
+                    info['cpu_percent'] = (cpu_seconds - entry.cpu_seconds) * 100.0 / elapsed
+                if elapsed and None not in (io_bytes, entry.io_bytes):
+                    info['read_rate'] = max(0, io_bytes[0] - entry.io_bytes[0]) / MB / elapsed
+                    info['write_rate'] = max(0, io_bytes[1] - entry.io_bytes[1]) / MB / elapsed
+                entry.cpu_seconds = cpu_seconds
+                entry.io_bytes = io_bytes
+                entry.name = info.get('name')
+            entries[key] = entry
+            rows.append(info)
+        # Processes that weren't seen have exited; their PIDs may be reused
+        self.entries = entries
+        self.refreshed_at = now
+        return rows
+
+    def cmdline(self, row):
+        """Command line of a refreshed process, read once per process lifetime"""
+        entry = self.entries.get((row['pid'], row['create_time']))
+        if entry is None:
+            return row.get('name') or ''
+        if entry.cmdline is None:
+            try:
+                parts = entry.process.cmdline()
+            except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+                parts = None
+            entry.cmdline = ' '.join(parts) if parts else (row.get('name') or '')
+        return entry.cmdline
+
+
+def connection_counts():
+    """Return {pid: (total, tcp, udp, established, listen)} inet socket counts.
+
+    Built from one system-wide socket table instead of a connections()
+    call per process.  Returns {} when the table can't be read.  On Linux
+    sysmon.procfs.SocketTable gives the same counts without building a
+    connection tuple per socket; see open_socket_table().
+    """
+    try:
+        connections = psutil.net_connections(kind='inet')
+    except (psutil.AccessDenied, OSError):
+        return {}
+    counts = {}
+    for conn in connections:
+        if not conn.pid:
+            continue
+        total, tcp, udp, established, listen = counts.get(conn.pid, NO_CONNECTIONS)
+        if conn.type == socket.SOCK_STREAM:
+            tcp += 1
+        elif conn.type == socket.SOCK_DGRAM:
+            udp += 1
+        if conn.status == psutil.CONN_ESTABLISHED:
+            established += 1
+        elif conn.status == psutil.CONN_LISTEN:
+            listen += 1
+        counts[conn.pid] = (total + 1, tcp, udp, established, listen)
+    return counts
+
+
+def open_socket_table():
+    """A procfs SocketTable on Linux; None where psutil has to be used"""
+    from sysmon.procfs import SocketTable, procfs_available
+    if procfs_available():
+        try:
+            return SocketTable()
+        except OSError as e:
+            print(f"procfs socket table unavailable, falling back to psutil: {e}")
+    return None
+
+
+class ProcessSnapshot(collections.namedtuple('ProcessSnapshot', 'time processes generation views',
+                                             defaults=(0, tuple(SNAPSHOT_VIEWS)))):
+    """Every process at one moment: epoch ``time`` and a tuple of ProcessInfo.
+
+    ``generation`` is the number of scan requests made before the scan
+    started (see ProcessSnapshotService.request_scan()).  ``views`` are
+    the views the scan served; fields only other views need are 0.
+    """
+
+    __slots__ = ()
+
+    def top(self, view, count=SNAPSHOT_TOP):
+        """The ``count`` processes ranking highest in a view ('cpu', 'disk', 'net')"""
+        key, listed = SNAPSHOT_VIEWS[view]
+        processes = self.processes if listed is None else filter(listed, self.processes)
+        return heapq.nlargest(count, processes, key=key)
+
+
+class ProcessSnapshotSource:
+    """One process scan per interval feeding every process view.
+
+    ``views`` declares which views ('cpu', 'disk', 'net') the snapshots
+    serve; fields no declared view needs are left at 0.  set_views()
+    changes them from the next scan on.
+    """
+    name = 'processes'
+    interval = SNAPSHOT_INTERVAL
+
+    def __init__(self, views=tuple(SNAPSHOT_VIEWS)):
+        self.views = tuple(views)
+        self.requested_views = self.views
+        self.table = ProcessTable(view_attrs(self.views))
+        self.sockets = open_socket_table() if 'net' in self.views else None
+
+    def set_views(self, views):
+        """Serve ``views`` from the next scan on; safe to call from any thread"""
+        self.requested_views = tuple(views)
+
+    def apply_views(self):
+        """Switch to the requested views (on the scanning thread, between scans)"""
+        views = self.requested_views
+        if views == self.views:
+            return
+        self.views = views
+        self.table.set_attrs(view_attrs(views))
+        if 'net' in views and self.sockets is None:
+            self.sockets = open_socket_table()
+        elif 'net' not in views and self.sockets is not None:
+            self.sockets.close()
+            self.sockets = None
+
+    def connection_counts(self):
+        if 'net' not in self.views:
+            return {}
+        if self.sockets is not None:
+            return self.sockets.counts()
+        return connection_counts()
+
+    def sample(self, now):
+        self.apply_views()
+        stamp = time.time()
+        rows = self.table.refresh()
+        counts = self.connection_counts()
+        processes = [
+            ProcessInfo(row['pid'], row['name'] or str(row['pid']), row['name'] or str(row['pid']),
+                        row['cpu_percent'], row.get('memory_percent') or 0.0,
+                        row.get('read_rate', 0.0), row.get('write_rate', 0.0),
+                        row.get('total_io', 0.0), *counts.get(row['pid'], NO_CONNECTIONS))
+            for row in rows]
+
+        # Command lines only for the rows a view can show (cached per process)
+        shown = set()
+        for view in self.views:
+            key = SNAPSHOT_VIEWS[view][0]
+            shown.update(heapq.nlargest(SNAPSHOT_TOP, range(len(processes)),
+                                        key=lambda i: key(processes[i])))
+        for i in shown:
+            processes[i] = processes[i]._replace(cmdline=self.table.cmdline(rows[i]))
+        return {'snapshot': ProcessSnapshot(stamp, tuple(processes), 0, self.views)}
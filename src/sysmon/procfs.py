@@ -0,0 +1,424 @@
+"""
+SysMon procfs Collectors
+Native Linux metric sources reading /proc directly through persistent file handles.
+
+Each file is opened once and re-read with pread() from offset 0 into a
+reused buffer, and only the fields SysMon plots are parsed.  The sources
+return the same columns as their psutil counterparts in sysmon.collectors.
+SocketTable does the same for the per-process connection counts of the
+process snapshot (sysmon.processes).
+"""
+
+import os
+import socket
+import struct
+import sys
+import time
+
+import numpy as np
+
+from sysmon.collectors import MB, DeviceRates, is_whole_disk
+
+SECTOR_SIZE = 512  # /proc/diskstats always counts 512-byte sectors
+
+
+def procfs_available():
+    """True when the procfs backend can run on this host"""
+    return sys.platform.startswith('linux') and os.path.exists('/proc/stat')
+
+
+class ProcFile:
+    """A /proc file kept open and re-read from offset 0 into a reused buffer"""
+
+    def __init__(self, path, bufsize=4096):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buf = bytearray(bufsize)
+
+    def read(self):
+        """Return the current file contents as bytes, reading on until EOF.
+
+        Record-by-record seq_files such as /proc/net/dev, /proc/diskstats
+        and /proc/net/tcp return about a page per read whatever the buffer
+        size, so a short read doesn't mean the end of the file.  Each read
+        continues at the offset the previous one stopped at.
+        """
+        view = memoryview(self.buf)
+        n = 0
+        while True:
+            got = os.preadv(self.fd, [view[n:]], n)
+            if got == 0:
+                return bytes(view[:n])
+            n += got
+            if n == len(self.buf):
+                # Buffer filled up; grow it, keeping what was read so far
+                buf = bytearray(len(self.buf) * 2)
+                buf[:n] = view
+                view.release()
+                self.buf = buf
+                view = memoryview(buf)
+
+    def read_first_line(self):
+        """Return the first line (without the newline), reading no further than the buffer.
+
+        Unlike read(), this doesn't read the whole file, only until the
+        first newline is in the buffer.
+        """
+        while True:
+            n = os.preadv(self.fd, [self.buf], 0)
+            end = self.buf.find(b'\n', 0, n)
+            if end >= 0 or n < len(self.buf):
+                return bytes(memoryview(self.buf)[:end if end >= 0 else n])
+            self.buf = bytearray(len(self.buf) * 2)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __del__(self):
+        self.close()
+
+
+class ProcfsCpuSource:
+    """Aggregate CPU utilisation from /proc/stat, plus per-CPU rows when per_core is set"""
+    name = 'cpu'
+    interval = None
+
+    def __init__(self, per_core=False):
+        self.per_core = per_core
+        # Without per-core rows only the first "cpu" line is read, so a small buffer is enough
+        self.stat = ProcFile('/proc/stat', bufsize=16384 if per_core else 512)
+        self.prev_times = self._read_times()
+
+    def _read_times(self):
+        """Return an int64 array (1 + cores, 8): aggregate row first, then cpu0..cpuN"""
+        if not self.per_core:
+            return np.array([self.stat.read_first_line().split()[1:9]], dtype=np.int64)
+        data = self.stat.read()
+        rows = []
+        for line in data.split(b'\n'):
+            if not line.startswith(b'cpu'):
+                break  # cpu lines come first in /proc/stat
+            rows.append(line.split()[1:9])
+        return np.array(rows, dtype=np.int64)
+
+    def sample(self, now):
+        times = self._read_times()
+        prev = self.prev_times
+        self.prev_times = times
+        if prev.shape != times.shape:
+            return {'cpu': 0.0}  # CPU hotplug; re-baseline on the next tick
+
+        # user and nice already include guest and guest_nice, so columns 0-7 are the total
+        delta = times - prev
+        d_total = delta.sum(axis=1)
+        d_idle = delta[:, 3] + delta[:, 4]  # idle + iowait
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent = np.where(d_total > 0, 100.0 * (d_total - d_idle) / d_total, 0.0)
+        percent = np.clip(percent, 0.0, 100.0).round(1)
+
+        sample = {'cpu': float(percent[0])}
+        if self.per_core:
+            sample['cpu_cores'] = percent[1:]
+        return sample
+
+
+class ProcfsDiskSource:
+    """Disk read/write rates from /proc/diskstats (whole disks only), optionally per disk"""
+    name = 'disk'
+    interval = None
+
+    def __init__(self, per_device=False):
+        self.per_device = per_device
+        self.device_rates = DeviceRates()
+        self.diskstats = ProcFile('/proc/diskstats', bufsize=8192)
+        self.prev_time = time.monotonic()
+        names, counters = self._read_sectors()
+        self.prev_read, self.prev_write = counters.sum(axis=0)
+        self.device_rates.update(names, counters * SECTOR_SIZE, self.prev_time)
+
+    def _read_sectors(self):
+        """Return (disk names, int64 array of (read, written) sectors per disk)"""
+        names = []
+        rows = []
+        for line in self.diskstats.read().splitlines():
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            # Partitions are skipped to avoid double counting
+            name = fields[2].decode()
+            if is_whole_disk(name):
+                names.append(name)
+                rows.append((fields[5], fields[9]))
+        return tuple(names), np.array(rows, dtype=np.int64).reshape(-1, 2)
+
+    def sample(self, now):
+        names, counters = self._read_sectors()
+        sample = {}
+        if self.per_device:
+            rates = self.device_rates.update(names, counters * SECTOR_SIZE, now)
+            if rates is not None:
+                sample['disk_devices'] = (names, rates)
+
+        read, write = counters.sum(axis=0)
+        elapsed = now - self.prev_time
+        read_mb = max(0, (read - self.prev_read) * SECTOR_SIZE / MB)
+        write_mb = max(0, (write - self.prev_write) * SECTOR_SIZE / MB)
+        self.prev_read, self.prev_write, self.prev_time = read, write, now
+        if elapsed <= 0:
+            return sample
+        sample.update({
+            'disk_read': read_mb / elapsed,
+            'disk_write': write_mb / elapsed,
+            'disk_read_mb': read_mb,
+            'disk_write_mb': write_mb,
+        })
+        return sample
+
+
+class ProcfsNetworkSource:
+    """Network send/receive rates from /proc/net/dev, optionally per interface"""
+    name = 'network'
+    interval = None
+
+    def __init__(self, per_device=False):
+        self.per_device = per_device
+        self.device_rates = DeviceRates()
+        self.netdev = ProcFile('/proc/net/dev', bufsize=8192)
+        self.prev_time = time.monotonic()
+        names, counters = self._read_bytes()
+        self.prev_sent, self.prev_recv = counters.sum(axis=0)
+        self.device_rates.update(names, counters, self.prev_time)
+
+    def _read_bytes(self):
+        """Return (interface names, int64 array of (sent, received) bytes per interface)"""
+        names = []
+        rows = []
+        for line in self.netdev.read().splitlines()[2:]:
+            name, _, counters = line.partition(b':')
+            fields = counters.split()
+            if len(fields) < 9:
+                continue
+            names.append(name.strip().decode())
+            rows.append((fields[8], fields[0]))
+        return tuple(names), np.array(rows, dtype=np.int64).reshape(-1, 2)
+
+    def sample(self, now):
+        names, counters = self._read_bytes()
+        sample = {}
+        if self.per_device:
+            rates = self.device_rates.update(names, counters, now)
+            if rates is not None:
+                sample['net_devices'] = (names, rates)
+
+        sent, recv = counters.sum(axis=0)
+        elapsed = now - self.prev_time
+        sent_mb = max(0, (sent - self.prev_sent) / MB)
+        recv_mb = max(0, (recv - self.prev_recv) / MB)
+        self.prev_sent, self.prev_recv, self.prev_time = sent, recv, now
+        if elapsed <= 0:
+            return sample
+        sample.update({
+            'net_sent': sent_mb / elapsed,
+            'net_recv': recv_mb / elapsed,
+            'net_sent_mb': sent_mb,
+            'net_recv_mb': recv_mb,
+        })
+        return sample
+
+
+class MeminfoSource:
+    """Base for sources reading a few fields out of /proc/meminfo"""
+    FIELDS = ()
+
+    def __init__(self):
+        self.meminfo = ProcFile('/proc/meminfo')
+
+    def read_fields(self):
+        """Return {field: bytes} for FIELDS"""
+        values = {}
+        for line in self.meminfo.read().splitlines():
+            key, _, rest = line.partition(b' ')
+            if key in self.FIELDS:
+                values[key] = int(rest.split()[0]) * 1024
+                if len(values) == len(self.FIELDS):
+                    break
+        return values
+
+
+class ProcfsMemorySource(MeminfoSource):
+    """RAM usage from /proc/meminfo"""
+    name = 'memory'
+    interval = 1.0
+
+    FIELDS = (b'MemTotal:', b'MemAvailable:')
+
+    def sample(self, now):
+        values = self.read_fields()
+        ram_total = values.get(b'MemTotal:', 0)
+        ram_available = values.get(b'MemAvailable:', 0)
+        ram_percent = (ram_total - ram_available) / ram_total * 100 if ram_total else 0.0
+        return {
+            'ram_percent': round(ram_percent, 1),
+            'ram_total': ram_total / MB,
+            'ram_available': ram_available / MB,
+        }
+
+
+class ProcfsSwapSource(MeminfoSource):
+    """Swap usage from /proc/meminfo"""
+    name = 'swap'
+    interval = 5.0
+
+    FIELDS = (b'SwapTotal:', b'SwapFree:')
+
+    def sample(self, now):
+        values = self.read_fields()
+        swap_total = values.get(b'SwapTotal:', 0)
+        swap_free = values.get(b'SwapFree:', 0)
+        swap_percent = (swap_total - swap_free) / swap_total * 100 if swap_total else 0.0
+        return {
+            'swap_percent': round(swap_percent, 1),
+            'swap_total': swap_total / MB,
+            'swap_available': swap_free / MB,
+        }
+
+
+# Kernel socket tables of the inet families: path, whether it holds TCP sockets
+SOCKET_TABLES = (('/proc/net/tcp', True), ('/proc/net/tcp6', True),
+                 ('/proc/net/udp', False), ('/proc/net/udp6', False))
+TCP_ESTABLISHED = 0x01  # st column of /proc/net/tcp, idiag_state of sock_diag
+TCP_LISTEN = 0x0A
+
+# What one socket adds to its owner's (total, tcp, udp, established, listen)
+TCP_SOCKET = (1, 1, 0, 0, 0)
+UDP_SOCKET = (1, 0, 1, 0, 0)
+TCP_STATE_SOCKETS = {
+    TCP_ESTABLISHED: (1, 1, 0, 1, 0),
+    TCP_LISTEN: (1, 1, 0, 0, 1),
+}
+
+# Netlink sock_diag (linux/sock_diag.h, linux/inet_diag.h)
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLMSG_HEADER = struct.Struct('=IHHII')      # len, type, flags, seq, pid
+INET_DIAG_REQ = struct.Struct('=BBBBI48x')  # family, protocol, ext, pad, states, sockid
+INET_DIAG_INODE = 68                        # Offset of idiag_inode in inet_diag_msg
+
+
+def sock_diag_inodes(family, protocol, sock):
+    """Yield (inode, state) for every socket of one family/protocol via sock_diag"""
+    request = INET_DIAG_REQ.pack(family, protocol, 0, 0, 0xFFFFFFFF)  # Every state
+    sock.send(NLMSG_HEADER.pack(NLMSG_HEADER.size + len(request), SOCK_DIAG_BY_FAMILY,
+                                NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + request)
+    while True:
+        data = sock.recv(65536)
+        offset = 0
+        while offset < len(data):
+            length, kind = NLMSG_HEADER.unpack_from(data, offset)[:2]
+            body = offset + NLMSG_HEADER.size
+            if kind == NLMSG_DONE:
+                return
+            if kind == NLMSG_ERROR:
+                errno = -struct.unpack_from('=i', data, body)[0]
+                raise OSError(errno, f"sock_diag dump failed: {os.strerror(errno)}")
+            yield struct.unpack_from('=I', data, body + INET_DIAG_INODE)[0], data[body + 1]
+            offset += (length + 3) & ~3  # Messages are 4-byte aligned
+
+
+class SocketTable:
+    """Per-process inet socket counts from one pass over the kernel socket tables.
+
+    Each refresh lists every TCP and UDP socket once, keeping only its
+    inode, protocol and TCP state (no address decoding), then maps inodes
+    to owners with a single walk of every /proc/<pid>/fd.  The sockets come
+    from netlink sock_diag, which dumps a table in one kernel pass; where
+    that isn't available they are parsed from /proc/net/{tcp,udp}{,6},
+    which the kernel regenerates a page at a time and gets slow on hosts
+    with many sockets.
+    """
+
+    def __init__(self):
+        self.netlink = hasattr(socket, 'AF_NETLINK')
+        self.tables = []
+        for path, tcp in SOCKET_TABLES:
+            try:
+                self.tables.append((ProcFile(path, bufsize=65536), tcp))
+            except FileNotFoundError:
+                continue  # No IPv6 on this host
+        if not self.tables:
+            raise OSError("no inet socket tables under /proc/net")
+
+    def read_inodes(self):
+        """Return {inode: socket contribution} for every socket that has an owner"""
+        if self.netlink:
+            try:
+                return self.read_netlink_inodes()
+            except OSError as e:
+                print(f"sock_diag unavailable, reading /proc/net socket tables: {e}")
+                self.netlink = False
+        return self.read_procfs_inodes()
+
+    def read_netlink_inodes(self):
+        kinds = {}
+        with socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG) as sock:
+            for family in (socket.AF_INET, socket.AF_INET6):
+                for inode, state in sock_diag_inodes(family, socket.IPPROTO_TCP, sock):
+                    if inode:
+                        kinds[inode] = TCP_STATE_SOCKETS.get(state, TCP_SOCKET)
+                for inode, state in sock_diag_inodes(family, socket.IPPROTO_UDP, sock):
+                    if inode:
+                        kinds[inode] = UDP_SOCKET
+        return kinds
+
+    def read_procfs_inodes(self):
+        kinds = {}
+        for table, tcp in self.tables:
+            lines = table.read().decode('ascii', 'replace').split('\n')
+            for line in lines[1:]:  # Skip the header
+                fields = line.split(None, 10)
+                # Sockets without an inode (TIME_WAIT, ...) belong to no process
+                if len(fields) < 10 or fields[9] == '0':
+                    continue
+                if tcp:
+                    kinds[int(fields[9])] = TCP_STATE_SOCKETS.get(int(fields[3], 16), TCP_SOCKET)
+                else:
+                    kinds[int(fields[9])] = UDP_SOCKET
+        return kinds
+
+    def counts(self):
+        """Return {pid: (total, tcp, udp, established, listen)} for processes with sockets"""
+        kinds = self.read_inodes()
+        counts = {}
+        if not kinds:
+            return counts
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            fd_dir = f'/proc/{pid}/fd'
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue  # Exited, or another user's process
+            owned = []
+            for fd in fds:
+                try:
+                    link = os.readlink(f'{fd_dir}/{fd}')
+                except OSError:
+                    continue  # Closed since the listing
+                if link.startswith('socket:['):
+                    kind = kinds.get(int(link[8:-1]))
+                    if kind is not None:
+                        owned.append(kind)
+            if owned:
+                counts[int(pid)] = tuple(map(sum, zip(*owned)))
+        return counts
+
+    def close(self):
+        for table, _ in self.tables:
+            table.close()
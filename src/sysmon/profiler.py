@@ -0,0 +1,156 @@
+"""
+SysMon Frame Profiler
+Wall-time instrumentation of the sample and render pipeline, shown as an
+optional overlay (HUD) and exportable as CSV.
+
+Sections timed:
+
+* ``collect:<source>`` - one source's counter reads on the sampler thread
+* ``ingest``   - update_data() moving a batch of samples into the stores
+* ``smooth``   - the smoothing filters, summed over the curves of a frame
+* ``decimate`` - peak-preserving reduction, summed over a frame
+* ``set_data`` - handing the points to the curves, summed over a frame
+* ``hover``    - refresh_hover_labels()
+* ``paint``    - the plot widgets' paint events since the previous frame
+* ``frame``    - one whole render_plots() call (paint excluded)
+
+Per-frame sections are accumulated with add() and pushed as one sample
+per frame by flush(); record() stores a sample directly and is safe to
+call from the sampler thread.  Each section keeps its last
+PROFILE_HISTORY samples.
+"""
+
+import collections
+import csv
+import time
+
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import QFileDialog, QLabel, QMessageBox
+
+PROFILE_HISTORY = 1000  # Samples kept per section
+HUD_REFRESH_MS = 500
+
+
+class FrameProfiler:
+    """Per-section wall-time samples (milliseconds) with percentile summaries."""
+
+    def __init__(self, history=PROFILE_HISTORY):
+        self.history = history
+        self.origin = time.perf_counter()
+        self.samples = {}   # Section -> deque of (seconds since origin, ms)
+        self.pending = {}   # Section -> seconds accumulated in the current frame
+
+    def _series(self, section):
+        series = self.samples.get(section)
+        if series is None:
+            series = self.samples.setdefault(section, collections.deque(maxlen=self.history))
+        return series
+
+    def record(self, section, seconds):
+        """Store one sample of ``section`` (deque appends are thread-safe)"""
+        self._series(section).append((time.perf_counter() - self.origin, seconds * 1000.0))
+
+    def add(self, section, seconds):
+        """Add to ``section``'s total for the current frame (GUI thread only)"""
+        self.pending[section] = self.pending.get(section, 0.0) + seconds
+
+    def flush(self):
+        """End the frame: record every accumulated section as one sample"""
+        pending, self.pending = self.pending, {}
+        for section, seconds in pending.items():
+            self.record(section, seconds)
+
+    def clear(self):
+        self.samples.clear()
+        self.pending.clear()
+
+    def summary(self):
+        """Return [(section, count, p50, p95, max)] in ms, sorted by section"""
+        rows = []
+        for section in sorted(self.samples):
+            values = np.array([ms for _, ms in list(self.samples[section])])
+            if len(values) == 0:
+                continue
+            p50, p95 = np.percentile(values, (50, 95))
+            rows.append((section, len(values), float(p50), float(p95), float(values.max())))
+        return rows
+
+    def export_csv(self, path):
+        """Write every kept sample as time,section,ms rows, oldest first"""
+        rows = [(t, section, ms) for section in sorted(self.samples)
+                for t, ms in list(self.samples[section])]
+        rows.sort()
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['time_s', 'section', 'ms'])
+            writer.writerows((f'{t:.6f}', section, f'{ms:.4f}') for t, section, ms in rows)
+        return len(rows)
+
+
+class ProfilerMixin:
+    """Frame timing HUD and CSV export for SystemMonitor."""
+
+    def instrument_paint(self, plot):
+        """Time the plot widget's paint events into the 'paint' section"""
+        paint_event = plot.paintEvent
+        profiler = self.profiler
+
+        def timed_paint_event(event):
+            start = time.perf_counter()
+            paint_event(event)
+            profiler.add('paint', time.perf_counter() - start)
+
+        plot.paintEvent = timed_paint_event
+
+    def setup_profiler_hud(self):
+        """Create the (hidden) timing overlay on top of the plots"""
+        self.profiler_hud = QLabel(self.centralWidget())
+        self.profiler_hud.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.profiler_hud.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.profiler_hud.setStyleSheet(
+            "QLabel { background-color: rgba(0, 0, 0, 170); color: #e0e0e0; padding: 6px; "
+            "font-family: monospace; }")
+        self.profiler_hud.hide()
+        self.profiler_hud_timer = QTimer(self)
+        self.profiler_hud_timer.timeout.connect(self.refresh_profiler_hud)
+
+    def set_profiler_hud(self, visible):
+        """Show or hide the frame timing overlay"""
+        self.show_frame_timings = visible
+        if visible:
+            self.refresh_profiler_hud()
+            self.profiler_hud.show()
+            self.profiler_hud.raise_()
+            self.profiler_hud_timer.start(HUD_REFRESH_MS)
+        else:
+            self.profiler_hud_timer.stop()
+            self.profiler_hud.hide()
+
+    def toggle_profiler_hud(self):
+        """View menu: show or hide the frame timing overlay"""
+        self.set_profiler_hud(self.frame_timings_action.isChecked())
+        self.save_preferences()
+
+    def refresh_profiler_hud(self):
+        """Redraw the overlay text and keep it in the top-right corner"""
+        lines = [f"{'section':<16}{'p50':>8}{'p95':>8}{'max':>8}  ms",
+                 *(f"{section:<16}{p50:8.2f}{p95:8.2f}{peak:8.2f}"
+                   for section, _, p50, p95, peak in self.profiler.summary()),
+                 f"update interval {self.update_interval} ms"]
+        self.profiler_hud.setText("\n".join(lines))
+        self.profiler_hud.adjustSize()
+        self.profiler_hud.move(self.centralWidget().width() - self.profiler_hud.width() - 8, 8)
+
+    def export_frame_timings(self):
+        """Save the kept per-section samples to a CSV file"""
+        try:
+            file_path, _ = QFileDialog.getSaveFileName(
+                self, "Export Frame Timings", "", "CSV Files (*.csv);;All Files (*)")
+            if file_path:
+                count = self.profiler.export_csv(file_path)
+                QMessageBox.information(self, "Success",
+                                        f"{count} timing samples saved to {file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export frame timings: {str(e)}")
@@ -0,0 +1,151 @@
+"""
+SysMon Process Rankings
+Per-interval top-N process records for the process timeline (waterfall).
+
+rank_snapshot() picks the top-N processes by CPU, disk I/O and network
+connections out of each ProcessSnapshot published by the shared process
+scan (sysmon.processes).  The scan only runs while a process view is
+subscribed to it -- the timeline subscribes every metric while it is
+open -- so records cover the time a process view was open, and each
+metric is ranked only from snapshots scanned for its view.
+ProcessRankings keeps those records in fixed-size NumPy rings -- one row
+per interval holding pid, interned name id and value for each of the N
+ranks -- so memory is bounded by the capacity no matter how many
+processes come and go.  Names are interned in a table that is compacted
+once it holds more names than the rings can reference.
+"""
+
+import numpy as np
+
+from sysmon.processes import SNAPSHOT_INTERVAL
+
+RANKING_METRICS = {
+    'cpu': 'CPU %',
+    'disk': 'Disk I/O (MB/s)',
+    'net': 'Network Connections',
+}
+
+# Metric -> its value for one ProcessInfo
+RANKING_VALUES = {
+    'cpu': lambda p: p.cpu_percent,
+    'disk': lambda p: p.read_rate + p.write_rate,
+    'net': lambda p: p.connections,
+}
+RANKING_TOP_N = 5
+RANKING_INTERVAL = SNAPSHOT_INTERVAL  # One record per process scan
+RANKING_CAPACITY = 3600      # Intervals kept (an hour at the default interval)
+
+
+def top(pids, names, values, top_n=RANKING_TOP_N):
+    """Return (pids, names, values) of the top_n positive values, largest first"""
+    n = min(top_n, len(values))
+    if n == 0:
+        return (), (), ()
+    index = np.argpartition(-values, n - 1)[:n]
+    index = index[np.argsort(-values[index])]
+    index = index[values[index] > 0]
+    return (tuple(pids[i] for i in index), tuple(names[i] for i in index),
+            tuple(float(values[i]) for i in index))
+
+
+def rank_snapshot(snapshot, top_n=RANKING_TOP_N):
+    """Return {metric: (pids, names, values)} for one ProcessSnapshot.
+
+    Only the metrics the snapshot was scanned for are ranked, and only
+    processes with a CPU delta (seen by two scans), so the first snapshot
+    ranks nothing and {} is returned.
+    """
+    processes = [p for p in snapshot.processes if p.cpu_percent is not None]
+    if not processes:
+        return {}
+    pids = [p.pid for p in processes]
+    names = [p.name for p in processes]
+    return {metric: top(pids, names, np.array([value(p) for p in processes], dtype=np.float64),
+                        top_n)
+            for metric, value in RANKING_VALUES.items() if metric in snapshot.views}
+
+
+class ProcessRankings:
+    """Ring of per-interval top-N records for each ranking metric.
+
+    Row ``r`` of metric ``m`` holds ``pids[m][r]``, ``name_ids[m][r]``
+    (index into ``names``, -1 for an empty rank) and ``values[m][r]``;
+    ``times[r]`` is the interval's epoch time.  ``window(metric, start)``
+    returns the rows from ``start`` on, oldest first.
+    """
+
+    def __init__(self, capacity=RANKING_CAPACITY, top_n=RANKING_TOP_N,
+                 metrics=tuple(RANKING_METRICS)):
+        self.capacity = capacity
+        self.top_n = top_n
+        self.metrics = metrics
+        self.times = np.zeros(capacity)
+        self.pids = {m: np.zeros((capacity, top_n), dtype=np.int32) for m in metrics}
+        self.name_ids = {m: np.full((capacity, top_n), -1, dtype=np.int32) for m in metrics}
+        self.values = {m: np.zeros((capacity, top_n), dtype=np.float32) for m in metrics}
+        self._cursor = 0
+        self._count = 0
+        self.names = []        # Interned process names
+        self._name_ids = {}    # Name -> index into names
+        # The rings can't reference more names than this; beyond it most are stale
+        self.max_names = capacity * top_n * len(metrics)
+
+    def __len__(self):
+        return self._count
+
+    def intern(self, name):
+        """Index of ``name`` in the name table, adding it when new"""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def append(self, timestamp, rankings):
+        """Record one interval: {metric: (pids, names, values)} as built by rank_snapshot()"""
+        row = self._cursor
+        self.times[row] = timestamp
+        for metric in self.metrics:
+            pids, names, values = rankings.get(metric, ((), (), ()))
+            n = min(len(values), self.top_n)
+            self.pids[metric][row] = 0
+            self.name_ids[metric][row] = -1
+            self.values[metric][row] = 0.0
+            self.pids[metric][row, :n] = pids[:n]
+            self.name_ids[metric][row, :n] = [self.intern(name) for name in names[:n]]
+            self.values[metric][row, :n] = values[:n]
+        self._cursor = (row + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        if len(self.names) > self.max_names:
+            self.compact_names()
+
+    def _order(self):
+        """Ring row indices, oldest first"""
+        start = (self._cursor - self._count) % self.capacity
+        return (start + np.arange(self._count)) % self.capacity
+
+    def compact_names(self):
+        """Drop names no longer referenced by any row and renumber the rest"""
+        used = np.unique(np.concatenate([ids[ids >= 0] for ids in self.name_ids.values()]))
+        remap = np.full(len(self.names) + 1, -1, dtype=np.int32)  # Last slot maps -1 to -1
+        remap[used] = np.arange(len(used), dtype=np.int32)
+        self.names = [self.names[i] for i in used]
+        self._name_ids = {name: i for i, name in enumerate(self.names)}
+        for metric, ids in self.name_ids.items():
+            self.name_ids[metric] = remap[ids]
+
+    def window(self, metric, start=None):
+        """Return (times, pids, name_ids, values) of the rows newer than ``start``"""
+        order = self._order()
+        if start is not None and len(order):
+            order = order[np.searchsorted(self.times[order], start, side='right'):]
+        return (self.times[order], self.pids[metric][order],
+                self.name_ids[metric][order], self.values[metric][order])
+
+    def clear(self):
+        self._cursor = 0
+        self._count = 0
+        for ids in self.name_ids.values():
+            ids.fill(-1)
+        self.names = []
+        self._name_ids = {}
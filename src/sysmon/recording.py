@@ -0,0 +1,207 @@
+"""
+SysMon Recording
+Compact, append-only binary log of sampled metrics.
+
+Layout::
+
+    b'SYSMONRC'  uint16 format version  uint32 header length  JSON header
+    record*      uint8 group tag  float64 epoch seconds  float32 value * columns
+
+The JSON header lists the column names of every group, so each group's
+record size is fixed and the file needs no per-record framing.  Missing
+values are stored as NaN.  A record cut short by a crash is ignored by the
+reader and trimmed before new records are appended.  Readers stream the
+file in fixed-size chunks, so memory use doesn't grow with its length.
+"""
+
+import json
+import math
+import os
+import struct
+import time
+
+from sysmon.store import METRIC_GROUPS
+
+MAGIC = b'SYSMONRC'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sHI')
+CHUNK_SIZE = 64 * 1024  # Bytes read per step when streaming records
+
+# Plotted columns plus the memory totals shown in the memory label
+RECORD_GROUPS = dict(
+    METRIC_GROUPS,
+    memory=METRIC_GROUPS['memory'] + ('ram_total', 'ram_available'),
+    swap=METRIC_GROUPS['swap'] + ('swap_total', 'swap_available'),
+)
+
+
+def _record_structs(groups):
+    """Return one struct per group, in tag order"""
+    return [struct.Struct(f'<Bd{len(columns)}f') for columns in groups.values()]
+
+
+class RecordingReader:
+    """Read a recording written by RecordingWriter"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            preamble = f.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size:
+                raise ValueError(f"{path} is not a SysMon recording")
+            magic, version, length = _PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a SysMon recording")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} uses unsupported recording format {version}")
+            self.header = json.loads(f.read(length).decode('utf-8'))
+        self.data_offset = _PREAMBLE.size + length
+        self.groups = {name: tuple(columns) for name, columns in self.header['groups'].items()}
+        self._names = list(self.groups)
+        self._structs = _record_structs(self.groups)
+
+    def _scan(self):
+        """Yield (end offset, tag, fields) for every complete record, streaming the file"""
+        structs = self._structs
+        with open(self.path, 'rb') as f:
+            f.seek(self.data_offset)
+            base = 0  # Offset of data[0] from data_offset
+            data = b''
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    return  # Anything left in data is a truncated tail
+                data += chunk
+                pos = 0
+                size = len(data)
+                while pos < size:
+                    tag = data[pos]
+                    if tag >= len(structs):
+                        raise ValueError(f"{self.path}: corrupt record at byte "
+                                         f"{self.data_offset + base + pos}")
+                    record = structs[tag]
+                    if pos + record.size > size:
+                        break  # Record continues in the next chunk
+                    fields = record.unpack_from(data, pos)
+                    pos += record.size
+                    yield base + pos, tag, fields
+                data = data[pos:]
+                base += pos
+
+    def valid_length(self):
+        """File length up to the end of the last complete record"""
+        end = 0
+        for end, _, _ in self._scan():
+            pass
+        return self.data_offset + end
+
+    def __iter__(self):
+        """Yield (group, sample) pairs; sample['time'] is epoch seconds"""
+        names = self._names
+        for _, tag, fields in self._scan():
+            group = names[tag]
+            sample = dict(zip(self.groups[group], fields[2:]))
+            sample['time'] = fields[1]
+            yield group, sample
+
+
+class RecordingWriter:
+    """Append samples to a recording, creating it (with a header) when needed.
+
+    Sample times are sampler-relative seconds; ``time_offset`` is added to
+    turn them into epoch seconds, so recordings from several sessions can
+    share one file.  ``intervals`` ({group: seconds}) is kept in a new
+    file's header so a player can size its buffers.
+    """
+
+    def __init__(self, path, groups=RECORD_GROUPS, time_offset=0.0, intervals=None):
+        self.path = path
+        self.groups = {name: tuple(columns) for name, columns in groups.items()}
+        self.time_offset = time_offset
+        self._tags = {name: i for i, name in enumerate(self.groups)}
+        self._structs = _record_structs(self.groups)
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            reader = RecordingReader(path)
+            if reader.groups != self.groups:
+                raise ValueError(f"{path} was recorded with different columns")
+            self.file = open(path, 'r+b')
+            self.file.truncate(reader.valid_length())
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(path, 'wb')
+            header = json.dumps({
+                'version': FORMAT_VERSION,
+                'created': time.time(),
+                'groups': {name: list(columns) for name, columns in self.groups.items()},
+                'intervals': dict(intervals or {}),
+            }).encode('utf-8')
+            self.file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            self.file.write(header)
+
+    def write(self, group, sample):
+        """Append one sample of ``group``; unknown groups are ignored"""
+        tag = self._tags.get(group)
+        if tag is None:
+            return
+        values = [sample.get(column, math.nan) for column in self.groups[group]]
+        self.file.write(self._structs[tag].pack(tag, self.time_offset + sample['time'], *values))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RecordingPlayer:
+    """Stream a recording against a replay clock.
+
+    Records are pulled from the reader's generator one at a time with a
+    single record of look-ahead, so a recording of any length replays in
+    constant memory.  Gaps longer than MAX_GAP seconds (the recorder was
+    stopped) are skipped instead of being waited out.
+    """
+
+    MAX_GAP = 5.0
+
+    def __init__(self, path):
+        self.reader = RecordingReader(path)
+        self.path = path
+        self.intervals = self.reader.header.get('intervals', {})
+        self._records = iter(self.reader)
+        self._pending = next(self._records, None)
+        self.clock = self._pending[1]['time'] if self._pending else 0.0
+
+    @property
+    def finished(self):
+        return self._pending is None
+
+    def _until(self, t):
+        """Return every record with time <= t"""
+        batch = []
+        while self._pending is not None and self._pending[1]['time'] <= t:
+            batch.append(self._pending)
+            self._pending = next(self._records, None)
+        return batch
+
+    def advance(self, seconds):
+        """Move the replay clock forward and return the records it passed"""
+        if self._pending is not None and self._pending[1]['time'] - self.clock > self.MAX_GAP:
+            self.clock = self._pending[1]['time']
+        self.clock += seconds
+        return self._until(self.clock)
+
+    def step(self):
+        """Return the next sampler tick: every record sharing the next timestamp"""
+        if self._pending is None:
+            return []
+        self.clock = self._pending[1]['time']
+        return self._until(self.clock)
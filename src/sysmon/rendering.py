@@ -0,0 +1,153 @@
+"""
+SysMon Rendering Mixin
+Opt-in OpenGL plot rendering with a software fallback, and a benchmark
+that compares frames per second and CPU use of both backends.
+
+With OpenGL on, each PlotWidget gets a QOpenGLWidget viewport and
+pyqtgraph draws the curves with its GL shader path instead of QPainter
+rasterisation.  Before switching, a throwaway context is created to read
+GL_RENDERER; when there is no context or the driver is a software
+rasteriser (llvmpipe and friends, which are slower than QPainter), the
+plots stay on the software backend.
+"""
+
+import time
+
+import psutil
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QOffscreenSurface, QOpenGLContext
+from PyQt5.QtWidgets import QMessageBox
+from pyqtgraph.Qt import OpenGLHelpers
+
+GL_RENDERER = 0x1F01
+SOFTWARE_RENDERERS = ('llvmpipe', 'softpipe', 'swrast', 'lavapipe', 'software',
+                      'microsoft basic render')
+BENCHMARK_SECONDS = 5.0  # Per backend
+
+
+def probe_opengl():
+    """Return (usable, renderer name or the reason OpenGL can't be used)"""
+    context = QOpenGLContext()
+    if not context.create():
+        return False, "no OpenGL context"
+    surface = QOffscreenSurface()
+    surface.setFormat(context.format())
+    surface.create()
+    try:
+        if not context.makeCurrent(surface):
+            return False, "OpenGL context could not be made current"
+        try:
+            renderer = OpenGLHelpers.getFunctions(context).glGetString(GL_RENDERER) or ''
+        except RuntimeError as e:
+            return False, str(e)
+        finally:
+            context.doneCurrent()
+    finally:
+        surface.destroy()
+    if any(name in renderer.lower() for name in SOFTWARE_RENDERERS):
+        return False, f"software renderer ({renderer})"
+    return True, renderer
+
+
+class RenderingMixin:
+    """OpenGL backend selection and render benchmark for SystemMonitor."""
+
+    def plot_widgets(self):
+        return (self.cpu_plot, self.memory_plot, self.disk_plot, self.net_plot)
+
+    def opengl_status(self):
+        """Cached probe_opengl() result"""
+        if self._opengl_probe is None:
+            self._opengl_probe = probe_opengl()
+        return self._opengl_probe
+
+    def apply_render_backend(self, use_opengl=None):
+        """Put the plots on OpenGL or software viewports; returns True for OpenGL"""
+        if use_opengl is None:
+            use_opengl = self.use_opengl
+        if use_opengl:
+            usable, renderer = self.opengl_status()
+            if not usable:
+                print(f"OpenGL rendering unavailable: {renderer}; using software rendering")
+                use_opengl = False
+        if use_opengl == self.opengl_active:
+            return use_opengl
+
+        for plot in self.plot_widgets():
+            plot.useOpenGL(use_opengl)
+        self.opengl_active = use_opengl
+        # Replacing the viewports deleted the hover labels parented to them
+        if hasattr(self, '_hover_label_map'):
+            self.attach_hover_labels()
+        self.request_render()
+        if use_opengl:
+            print(f"Rendering with OpenGL ({self.opengl_status()[1]})")
+        else:
+            print("Rendering in software")
+        return use_opengl
+
+    def toggle_opengl(self):
+        """Config menu: switch OpenGL rendering on or off"""
+        self.use_opengl = self.opengl_action.isChecked()
+        active = self.apply_render_backend()
+        if self.use_opengl and not active:
+            QMessageBox.information(
+                self, "OpenGL Rendering",
+                f"OpenGL can't be used ({self.opengl_status()[1]}).\n"
+                "SysMon keeps drawing in software and will try OpenGL again next start.")
+        self.save_preferences()
+
+    def start_render_benchmark(self):
+        """Redraw as fast as possible on each backend and report FPS and CPU"""
+        if self._benchmark is not None:
+            return
+        backends = ['software']
+        if self.opengl_status()[0]:
+            backends.append('opengl')
+        self._benchmark = {'pending': backends, 'results': [], 'restore': self.opengl_active,
+                           'title': self.windowTitle(), 'process': psutil.Process(),
+                           'timer': QTimer(self)}
+        self._benchmark['timer'].timeout.connect(self.benchmark_frame)
+        self.next_benchmark_phase()
+
+    def next_benchmark_phase(self):
+        bench = self._benchmark
+        if not bench['pending']:
+            self.finish_render_benchmark()
+            return
+        backend = bench['pending'].pop(0)
+        self.apply_render_backend(backend == 'opengl')
+        bench.update(backend=backend, frames=0, start=time.monotonic(),
+                     cpu=sum(bench['process'].cpu_times()[:2]))
+        self.setWindowTitle(f"SysMon - Benchmarking {backend} rendering...")
+        bench['timer'].start(0)
+
+    def benchmark_frame(self):
+        """One forced redraw: update every curve and paint the viewports synchronously"""
+        bench = self._benchmark
+        self.render_plots(self.plot_store)
+        for plot in self.plot_widgets():
+            if not plot.isHidden():
+                plot.viewport().repaint()
+        bench['frames'] += 1
+        elapsed = time.monotonic() - bench['start']
+        if elapsed >= BENCHMARK_SECONDS:
+            bench['timer'].stop()
+            cpu = sum(bench['process'].cpu_times()[:2]) - bench['cpu']
+            bench['results'].append((bench['backend'], bench['frames'] / elapsed,
+                                     100.0 * cpu / elapsed))
+            self.next_benchmark_phase()
+
+    def finish_render_benchmark(self):
+        bench = self._benchmark
+        self._benchmark = None
+        bench['timer'].deleteLater()
+        self.apply_render_backend(bench['restore'])
+        self.setWindowTitle(bench['title'])
+        lines = [f"{backend:<10} {fps:8.1f} fps {cpu:7.1f}% CPU"
+                 for backend, fps, cpu in bench['results']]
+        if len(bench['results']) == 1:
+            lines.append(f"opengl     unavailable ({self.opengl_status()[1]})")
+        print("Render benchmark:\n  " + "\n  ".join(lines))
+        QMessageBox.information(self, "Rendering Benchmark",
+                                "Unthrottled redraws of the current view:\n\n" + "\n".join(lines))
@@ -0,0 +1,152 @@
+"""
+SysMon Replay Mixin
+Play a headless recording back through the live plots and hover labels.
+
+The recording is streamed by RecordingPlayer; a frame timer advances the
+replay clock by the elapsed wall time times the replay speed and appends
+the records it passes to a replay MetricStore, which is then drawn with
+the same render_plots() used for live data.
+"""
+
+import datetime
+import os
+import time
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QFileDialog, QMessageBox
+
+from sysmon.constants import VERSION
+from sysmon.data import MAX_RAW_WINDOW
+from sysmon.recording import RecordingPlayer
+from sysmon.store import MetricStore, METRIC_GROUPS
+
+REPLAY_SPEEDS = (1, 10, 100)
+REPLAY_FRAME_MS = 50  # Replay clock period; redraws go through the frame clock
+
+
+class ReplayMixin:
+    """Recording replay methods for SystemMonitor."""
+
+    def open_recording_dialog(self):
+        """Pick a recording and start replaying it"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Recording", "", "SysMon Recordings (*.rec *.bin);;All Files (*)")
+        if file_path:
+            self.open_recording(file_path)
+
+    def open_recording(self, path):
+        """Replay a recording written by ``sysmon.py --headless --record``"""
+        try:
+            player = RecordingPlayer(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to open recording: {str(e)}")
+            return
+
+        self.stop_replay()
+        self.history_view_end = None
+        self.replay = player
+        self.replay_store = MetricStore(METRIC_GROUPS, 2)
+        self.resize_replay_store()
+        self.plot_store = self.replay_store
+        self.set_plot_detail(False)
+        self.replay_paused = False
+        self._replay_last = time.monotonic()
+        if self.replay_timer is None:
+            self.replay_timer = QTimer(self)
+            self.replay_timer.timeout.connect(self.replay_frame)
+        self.replay_timer.start(REPLAY_FRAME_MS)
+        self.update_replay_actions()
+        self.update_replay_title()
+        print(f"Replaying {path}")
+
+    def resize_replay_store(self):
+        """Size the replay buffers for the time window at the recorded rates"""
+        window = min(self.time_window, MAX_RAW_WINDOW)
+        default = self.update_interval / 1000.0
+        self.replay_store.resize({
+            group: max(2, int(window / self.replay.intervals.get(group, default)))
+            for group in METRIC_GROUPS})
+
+    def replay_frame(self):
+        """Frame timer: advance the replay clock by elapsed time x speed"""
+        now = time.monotonic()
+        elapsed = now - self._replay_last
+        self._replay_last = now
+        if self.replay is None or self.replay_paused:
+            return
+        self.feed_replay(self.replay.advance(elapsed * self.replay_speed))
+        if self.replay.finished:
+            self.replay_paused = True
+            self.update_replay_actions()
+            self.update_replay_title()
+
+    def feed_replay(self, records):
+        """Append replayed records and redraw through the live plot path"""
+        if not records:
+            return
+        for group, sample in records:
+            self.replay_store.append(group, sample)
+        self.request_render()
+        self.update_replay_title()
+
+    def step_replay(self):
+        """Pause and show exactly one more sampler tick"""
+        if self.replay is None:
+            return
+        self.replay_paused = True
+        self.feed_replay(self.replay.step())
+        self.update_replay_actions()
+        self.update_replay_title()
+
+    def toggle_replay_pause(self):
+        """Pause or resume the replay"""
+        if self.replay is None or self.replay.finished:
+            return
+        self.replay_paused = not self.replay_paused
+        self._replay_last = time.monotonic()
+        self.update_replay_actions()
+        self.update_replay_title()
+
+    def set_replay_speed(self, speed):
+        """Replay at 1x, 10x or 100x real time"""
+        self.replay_speed = speed
+        self.update_replay_actions()
+        self.update_replay_title()
+
+    def stop_replay(self):
+        """Leave replay and return to the live plots"""
+        if self.replay is None:
+            return
+        self.replay_timer.stop()
+        self.replay = None
+        self.replay_store = None
+        self.plot_store = self.store
+        self.setWindowTitle(f"SysMon {VERSION}")
+        self.update_replay_actions()
+        self.update_plots()
+
+    def update_replay_title(self):
+        """Show the replayed file, speed and clock in the window title"""
+        if self.replay is None:
+            return
+        stamp = datetime.datetime.fromtimestamp(self.replay.clock).strftime('%Y-%m-%d %H:%M:%S')
+        if self.replay.finished:
+            state = ' (finished)'
+        elif self.replay_paused:
+            state = ' (paused)'
+        else:
+            state = ''
+        self.setWindowTitle(f"SysMon {VERSION} - Replay {os.path.basename(self.replay.path)} "
+                            f"{self.replay_speed}x {stamp}{state}")
+
+    def update_replay_actions(self):
+        """Enable the replay controls only while a recording is open"""
+        if not hasattr(self, 'replay_pause_action'):
+            return
+        active = self.replay is not None
+        for action in (self.replay_pause_action, self.replay_step_action,
+                       self.replay_stop_action, *self.replay_speed_actions.values()):
+            action.setEnabled(active)
+        self.replay_pause_action.setChecked(active and self.replay_paused)
+        for speed, action in self.replay_speed_actions.items():
+            action.setChecked(speed == self.replay_speed)
@@ -0,0 +1,162 @@
+"""
+SysMon Rollups
+RRD-style downsampled history: min/max/avg/last per bucket in fixed tiers.
+
+Every tier is a memory-mapped ring of buckets (one file per source and
+tier).  Bucket ``b`` of a tier ``width`` seconds wide lives in slot
+``b % capacity``, and the slot remembers the start time of the bucket it
+holds, so no cursor has to be stored: a slot whose start time doesn't
+match the bucket being read simply hasn't been written (or was overwritten
+by a newer lap).  Samples update the open bucket of every tier in place,
+so the rollups are always current and cost a few vector ops per sample.
+"""
+
+import os
+
+import numpy as np
+
+from sysmon.history import HistoryPage
+from sysmon.store import METRIC_GROUPS
+
+# (bucket width in seconds, buckets kept)
+ROLLUP_TIERS = (
+    (1, 6 * 3600),            # 6 hours
+    (10, 2 * 86400 // 10),    # 2 days
+    (60, 14 * 86400 // 60),   # 2 weeks
+    (3600, 400 * 24),         # ~13 months
+)
+
+# Per-column statistics stored in each bucket
+STAT_MIN, STAT_MAX, STAT_SUM, STAT_COUNT, STAT_LAST = range(5)
+STATS = 5
+
+
+class RollupTier:
+    """One ring of fixed-width buckets for one source"""
+
+    def __init__(self, path, width, capacity, columns):
+        self.width = width
+        self.capacity = capacity
+        self.columns = columns
+        shape = (capacity, 1 + STATS * len(columns))
+        self.data = None
+        if os.path.exists(path):
+            try:
+                data = np.lib.format.open_memmap(path, mode='r+')
+                if data.shape == shape:
+                    self.data = data
+            except (OSError, ValueError) as e:
+                print(f"Discarding unreadable rollup {os.path.basename(path)}: {e}")
+        if self.data is None:
+            self.data = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+            self.data[:, 0] = np.nan
+
+    def add(self, t, values, valid):
+        """Fold one sample (values array, NaN where missing) into its bucket"""
+        bucket = int(t // self.width)
+        row = self.data[bucket % self.capacity]
+        stats = row[1:].reshape(len(self.columns), STATS)
+        start = bucket * self.width
+        if row[0] != start:
+            # First sample of this bucket (or an old lap): reset the slot
+            row[0] = start
+            stats[:] = np.nan
+            stats[:, STAT_SUM] = 0.0
+            stats[:, STAT_COUNT] = 0.0
+        np.fmin(stats[:, STAT_MIN], values, out=stats[:, STAT_MIN])
+        np.fmax(stats[:, STAT_MAX], values, out=stats[:, STAT_MAX])
+        stats[:, STAT_SUM] += np.where(valid, values, 0.0)
+        stats[:, STAT_COUNT] += valid
+        np.copyto(stats[:, STAT_LAST], values, where=valid)
+
+    def read(self, t_start, t_end):
+        """Return (bucket centre times, stats array (buckets, columns, STATS))"""
+        first = int(t_start // self.width)
+        last = int(t_end // self.width)
+        first = max(first, last - self.capacity + 1)
+        buckets = np.arange(first, last + 1)
+        rows = self.data[buckets % self.capacity]
+        rows = rows[rows[:, 0] == buckets * self.width]
+        stats = rows[:, 1:].reshape(len(rows), len(self.columns), STATS)
+        return rows[:, 0] + self.width / 2, stats
+
+    def close(self):
+        self.data.flush()
+        self.data = None
+
+
+class RollupStore:
+    """Rollup tiers for every metric source, kept in ``directory``.
+
+    Sample times are sampler-relative; ``time_offset`` converts them to
+    epoch seconds so buckets line up across sessions.
+    """
+
+    def __init__(self, directory, groups=METRIC_GROUPS, time_offset=0.0, tiers=ROLLUP_TIERS):
+        os.makedirs(directory, exist_ok=True)
+        self.groups = {name: tuple(columns) for name, columns in groups.items()}
+        self.time_offset = time_offset
+        self.widths = tuple(width for width, _ in tiers)
+        self.tiers = {
+            name: [RollupTier(os.path.join(directory, f'rollup-{name}-{width}s.npy'),
+                              width, capacity, columns)
+                   for width, capacity in tiers]
+            for name, columns in self.groups.items()
+        }
+
+    def append(self, group, sample):
+        """Fold one sample of a source into every tier; unknown groups are ignored"""
+        tiers = self.tiers.get(group)
+        if tiers is None:
+            return
+        t = self.time_offset + sample['time']
+        values = np.array([sample.get(column, np.nan) for column in self.groups[group]],
+                          dtype=np.float64)
+        valid = ~np.isnan(values)
+        for tier in tiers:
+            tier.add(t, values, valid)
+
+    def earliest_time(self):
+        """Start of the oldest bucket in the coarsest tier, or None when empty"""
+        starts = [np.nanmin(tiers[-1].data[:, 0]) for tiers in self.tiers.values()
+                  if not np.isnan(tiers[-1].data[:, 0]).all()]
+        return float(min(starts)) if starts else None
+
+    def bucket_for(self, max_width):
+        """Coarsest bucket width not exceeding max_width, or None when even 1 s is too coarse"""
+        fitting = [width for width in self.widths if width <= max_width]
+        return max(fitting) if fitting else None
+
+    def page(self, t_start, t_end, width):
+        """A RollupPage of every source between two epoch times at one bucket width"""
+        tables = {}
+        for group, tiers in self.tiers.items():
+            times, stats = tiers[self.widths.index(width)].read(t_start, t_end)
+            table = {'time': times}
+            for i, column in enumerate(self.groups[group]):
+                column_stats = stats[:, i]
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    table[column] = column_stats[:, STAT_SUM] / column_stats[:, STAT_COUNT]
+                table[column + '_min'] = column_stats[:, STAT_MIN]
+                table[column + '_max'] = column_stats[:, STAT_MAX]
+                table[column + '_last'] = column_stats[:, STAT_LAST]
+                table[column + '_sum'] = column_stats[:, STAT_SUM]
+            tables[group] = table
+        return RollupPage(tables, t_end)
+
+    def flush(self):
+        for tiers in self.tiers.values():
+            for tier in tiers:
+                tier.data.flush()
+
+    def close(self):
+        for tiers in self.tiers.values():
+            for tier in tiers:
+                tier.close()
+
+
+class RollupPage(HistoryPage):
+    """A HistoryPage of bucket averages, with _min/_max/_last/_sum columns alongside"""
+
+    def total(self, column):
+        return float(np.nansum(self[column + '_sum']))
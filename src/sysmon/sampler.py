@@ -0,0 +1,147 @@
+"""
+SysMon Sampler
+Background thread that samples metric sources on a multi-rate schedule.
+
+The sampler never touches Qt.  It runs a timer wheel whose slot width is
+the base update interval; each source fires every N slots according to its
+declared ``interval`` (CPU every slot, memory every second, swap every few
+seconds).  Every sample is timestamped on the sampler thread, tagged with
+its source name and pushed onto a queue; the optional on_sample callback
+is fired once per batch so a GUI can be woken up to drain what has arrived.
+An optional profiler (sysmon.profiler.FrameProfiler) gets the wall time of
+every source's sample() as a ``collect:<source>`` section.
+
+request_sample() asks for an extra tick right away instead of waiting for
+the schedule.  Each call returns a generation number and every sample
+carries the generation that was current when its tick started, so a
+sample with a lower generation was taken before the request.  Requests
+made while a tick is running coalesce into a single tick after it.
+"""
+
+import queue
+import threading
+import time
+
+
+class Sampler(threading.Thread):
+    """Sample every source at its own cadence from one timer wheel on a daemon thread."""
+
+    def __init__(self, sources, interval_ms, on_sample=None, profiler=None):
+        super().__init__(name='sysmon-sampler', daemon=True)
+        self.interval = interval_ms / 1000.0
+        self.on_sample = on_sample
+        self.profiler = profiler
+        self.samples = queue.SimpleQueue()
+        self.origin = time.monotonic()
+        self.wall_origin = time.time()  # Epoch seconds at sample time 0
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()  # Set by stop() and request_sample()
+        self._wake_pending = False
+        self.generation = 0  # Requests made so far; only the requesting thread writes it
+        self.set_sources(sources)
+
+    def set_interval(self, interval_ms):
+        """Change the base tick; takes effect from the next tick"""
+        self.interval = interval_ms / 1000.0
+        self._schedule = None
+
+    def set_sources(self, sources):
+        """Swap in a new set of metric sources; takes effect from the next tick"""
+        self.sources = list(sources)
+        self._schedule = None
+
+    def source_interval(self, source):
+        """Seconds between samples of one source (never faster than the base tick)"""
+        return max(self.interval, source.interval or 0.0)
+
+    def intervals(self):
+        """Return {source name: seconds between samples}"""
+        return {source.name: self.source_interval(source) for source in self.sources}
+
+    def stop(self):
+        """Ask the thread to exit after the current tick"""
+        self._stop_event.set()
+        self._wakeup.set()
+
+    def request_sample(self):
+        """Sample every source as soon as possible; returns the request's generation.
+
+        Never blocks.  Samples tagged with this generation or later were
+        taken after the call; the schedule restarts from that tick.
+        """
+        self.generation += 1
+        self._wakeup.set()
+        return self.generation
+
+    def drain(self):
+        """Return every sample queued since the last drain (oldest first)"""
+        self._wake_pending = False
+        batch = []
+        while True:
+            try:
+                batch.append(self.samples.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def sample_source(self, source, now, generation=0):
+        """Collect one timestamped sample from a source, tagged with its name"""
+        sample = {'source': source.name, 'time': now - self.origin, 'generation': generation}
+        start = time.perf_counter()
+        try:
+            sample.update(source.sample(now))
+        except Exception as e:
+            print(f"Sampler error in {source.name} source: {e}")
+        if self.profiler is not None:
+            self.profiler.record('collect:' + source.name, time.perf_counter() - start)
+        return sample
+
+    def _build_schedule(self):
+        """Return [source, period in ticks, next due tick] for the current sources"""
+        return [[source, max(1, round(self.source_interval(source) / self.interval)), 0]
+                for source in self.sources]
+
+    def run(self):
+        deadline = time.monotonic()
+        tick = 0
+        while not self._stop_event.is_set():
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                self._wakeup.wait(delay)
+            if self._stop_event.is_set():
+                break
+            if self._wakeup.is_set():
+                # Sampling requested: clear first, so a request made during
+                # this tick wakes the thread again right after it
+                self._wakeup.clear()
+                self._schedule = None
+                deadline = time.monotonic()
+            generation = self.generation
+
+            schedule = self._schedule
+            if schedule is None:
+                # New sources or base tick: every source fires on this tick
+                schedule = self._schedule = self._build_schedule()
+                for entry in schedule:
+                    entry[2] = tick
+
+            now = time.monotonic()
+            sampled = False
+            for entry in schedule:
+                source, period, due = entry
+                if tick >= due:
+                    self.samples.put(self.sample_source(source, now, generation))
+                    entry[2] = tick + period
+                    sampled = True
+
+            # Wake the consumer once per batch, not once per sample
+            if sampled and not self._wake_pending and self.on_sample:
+                self._wake_pending = True
+                self.on_sample()
+
+            # Keep the original phase; skip ticks that were missed entirely
+            tick += 1
+            deadline += self.interval
+            if deadline < now:
+                missed = int((now - deadline) / self.interval) + 1
+                tick += missed
+                deadline += self.interval * missed
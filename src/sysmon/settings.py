@@ -6,6 +6,8 @@ Configuration dialogs, graph customization, preferences, data export, and view t
 import os
 import json
 
+import numpy as np
+
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                               QPushButton, QMessageBox, QFileDialog,
                               QInputDialog, QColorDialog, QComboBox,
@@ -15,6 +17,7 @@ from PyQt5.QtGui import QColor
 import pyqtgraph as pg
 
 from sysmon.dialogs import ConfigFileViewerDialog
+from sysmon.smoothing import SMOOTHING_MODES
 
 
 class SettingsMixin:
@@ -32,18 +35,12 @@ class SettingsMixin:
 
     def update_time_window(self):
         """Update time window and adjust data buffers"""
-        self.max_points = int((self.time_window * 1000) / self.update_interval)
-
-        # Update all deques with new maxlen
-        for data_list in [self.cpu_data, self.disk_read_data, self.disk_write_data,
-                         self.disk_read_mb_data, self.disk_write_mb_data,
-                         self.net_sent_data, self.net_recv_data,
-                         self.net_sent_mb_data, self.net_recv_mb_data,
-                         self.time_data, self.ram_percent_data, self.swap_percent_data]:
-            if len(data_list) > self.max_points:
-                # Trim from the left
-                for _ in range(len(data_list) - self.max_points):
-                    data_list.popleft()
+        # Reallocate the ring buffers, keeping the newest samples that fit
+        self.resize_store()
+        if self.history_view_end is not None:
+            self.show_history_page()
+        if self.replay is not None:
+            self.resize_replay_store()
 
         # Update x-axis range
         self.cpu_plot.setXRange(-self.time_window, 0)
@@ -78,7 +75,8 @@ class SettingsMixin:
         else:
             # Calculate approximate time window for smoothing
             time_span = (self.smoothing_window * self.update_interval) / 1000
-            status_msg = f"Smoothing: {self.smoothing_window}-point ({time_span:.2f}s window)"
+            mode = SMOOTHING_MODES.get(self.smoothing_mode, SMOOTHING_MODES['sma'])
+            status_msg = f"Smoothing: {mode}, {self.smoothing_window}-point ({time_span:.2f}s window)"
 
         # Display in window title briefly
         original_title = self.windowTitle()
@@ -134,6 +132,14 @@ class SettingsMixin:
                 'always_on_top': self.always_on_top,
                 'invert_axis': self.invert_axis,
                 'smoothing_window': self.smoothing_window,
+                'smoothing_mode': self.smoothing_mode,
+                'decimation': self.decimation,
+                'use_opengl': self.use_opengl,
+                'show_frame_timings': self.show_frame_timings,
+                'collector_backend': self.collector_backend,
+                'cpu_per_core': self.cpu_per_core,
+                'disk_per_device': self.per_device['disk'],
+                'net_per_device': self.per_device['net'],
                 'current_theme': self.current_theme,
                 'auto_check_updates': self.auto_check_updates,
                 'last_update_check': self.last_update_check,
@@ -163,17 +169,16 @@ class SettingsMixin:
                                    'Disk Read (MB/s)', 'Disk Write (MB/s)',
                                    'Network Sent (MB/s)', 'Network Received (MB/s)'])
 
-                    for i, time_val in enumerate(self.time_data):
-                        writer.writerow([
-                            time_val,
-                            self.cpu_data[i] if i < len(self.cpu_data) else '',
-                            self.ram_percent_data[i] if i < len(self.ram_percent_data) else '',
-                            self.swap_percent_data[i] if i < len(self.swap_percent_data) else '',
-                            self.disk_read_data[i] if i < len(self.disk_read_data) else '',
-                            self.disk_write_data[i] if i < len(self.disk_write_data) else '',
-                            self.net_sent_data[i] if i < len(self.net_sent_data) else '',
-                            self.net_recv_data[i] if i < len(self.net_recv_data) else ''
-                        ])
+                    # One row per CPU sample; slower series repeat their latest value
+                    times = self.store.times('cpu')
+                    columns = ['cpu', 'ram_percent', 'swap_percent',
+                               'disk_read', 'disk_write', 'net_sent', 'net_recv']
+                    series = [times.tolist()]
+                    for name in columns:
+                        idx = np.searchsorted(self.store.times(name), times, side='right') - 1
+                        values = self.store[name].tolist()
+                        series.append([values[i] if i >= 0 else '' for i in idx.tolist()])
+                    writer.writerows(zip(*series))
 
                 QMessageBox.information(self, "Success", f"Data saved to {file_path}")
         except Exception as e:
@@ -215,14 +220,7 @@ class SettingsMixin:
                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            self.cpu_data.clear()
-            self.disk_read_data.clear()
-            self.disk_write_data.clear()
-            self.net_sent_data.clear()
-            self.net_recv_data.clear()
-            self.time_data.clear()
-            self.ram_percent_data.clear()
-            self.swap_percent_data.clear()
+            self.store.clear()
             self.update_plots()
 
     def reset_settings(self):
@@ -237,12 +235,17 @@ class SettingsMixin:
             self.transparency = 1.0
             self.always_on_top = False
             self.smoothing_window = 1
+            self.smoothing_mode = 'sma'
+            self.decimation = 'm4'
             self.max_points = int((self.time_window * 1000) / self.update_interval)
-            self.timer.setInterval(self.update_interval)
+            self.set_update_interval(self.update_interval)
+            self.set_collector_backend('auto')
             self.update_time_window()
             self.set_window_transparency(self.transparency)
             self.set_always_on_top(self.always_on_top)
             self.always_on_top_action.setChecked(self.always_on_top)
+            self.frame_timings_action.setChecked(False)
+            self.set_profiler_hud(False)
 
             # Remove config file to reset window geometry
             try:
@@ -259,18 +262,37 @@ class SettingsMixin:
     def toggle_cpu_plot(self):
         """Toggle CPU plot visibility"""
         self.cpu_plot.setVisible(self.show_cpu_action.isChecked())
+        self.request_render()  # Hidden plots were not kept up to date
+
+    def toggle_cpu_per_core(self):
+        """Toggle the per-core CPU heatmap"""
+        self.set_cpu_per_core(self.cpu_per_core_action.isChecked())
+        self.save_preferences()
+
+    def toggle_disk_per_device(self):
+        """Toggle the per-disk breakdown"""
+        self.set_device_breakdown('disk', self.disk_per_device_action.isChecked())
+        self.save_preferences()
+
+    def toggle_net_per_device(self):
+        """Toggle the per-interface breakdown"""
+        self.set_device_breakdown('net', self.net_per_device_action.isChecked())
+        self.save_preferences()
 
     def toggle_disk_plot(self):
         """Toggle Disk I/O plot visibility"""
         self.disk_plot.setVisible(self.show_disk_action.isChecked())
+        self.request_render()  # Hidden plots were not kept up to date
 
     def toggle_network_plot(self):
         """Toggle Network plot visibility"""
         self.net_plot.setVisible(self.show_network_action.isChecked())
+        self.request_render()  # Hidden plots were not kept up to date
 
     def toggle_memory_plot(self):
         """Toggle Memory plot visibility"""
         self.memory_plot.setVisible(self.show_memory_action.isChecked())
+        self.request_render()  # Hidden plots were not kept up to date
 
     # Config Menu Methods
     def change_update_interval(self):
@@ -280,12 +302,24 @@ class SettingsMixin:
             self.update_interval, 50, 5000, 50)
 
         if ok:
-            self.update_interval = interval
-            self.timer.setInterval(interval)
+            self.set_update_interval(interval)
             self.max_points = int((self.time_window * 1000) / self.update_interval)
             self.update_time_window()
             self.save_preferences()
 
+    def change_decimation(self, method):
+        """Pick how dense series are reduced before drawing (Config menu)"""
+        self.decimation = method
+        for name, action in self.decimation_actions.items():
+            action.setChecked(name == method)
+        self.request_render()
+        self.save_preferences()
+
+    def change_collector_backend(self, backend):
+        """Switch collector backend from the Config menu"""
+        self.set_collector_backend(backend)
+        self.save_preferences()
+
     def view_config_files(self):
         """Display configuration files in read-only dialog"""
         dialog = ConfigFileViewerDialog(self.config_file, self.preferences_file, self)
@@ -295,7 +329,7 @@ class SettingsMixin:
         """Configure time window settings"""
         time_window, ok = QInputDialog.getInt(
             self, 'Time Window', 'Time window (seconds):',
-            self.time_window, 5, 300, 5)
+            self.time_window, 5, 7 * 86400, 5)
 
         if ok:
             self.time_window = time_window
@@ -303,15 +337,25 @@ class SettingsMixin:
             self.save_preferences()
 
     def change_smoothing_level(self):
-        """Configure smoothing level via dialog"""
+        """Configure smoothing filter and level via dialogs"""
+        modes = list(SMOOTHING_MODES)
+        labels = [SMOOTHING_MODES[mode] for mode in modes]
+        current = modes.index(self.smoothing_mode) if self.smoothing_mode in modes else 0
+        label, ok = QInputDialog.getItem(
+            self, 'Smoothing Filter', 'Smoothing filter:', labels, current, False)
+        if not ok:
+            return
+
         level, ok = QInputDialog.getInt(
             self, 'Smoothing Level',
             'Smoothing window (data points):\n1 = No smoothing (raw data)\nHigher = More smoothing',
             self.smoothing_window, 1, 20, 1)
 
         if ok:
+            self.smoothing_mode = modes[labels.index(label)]
             self.smoothing_window = level
             self.show_smoothing_status()
+            self.request_render()
             self.save_preferences()
 
     def customize_graph_colors(self):
@@ -619,6 +663,8 @@ class SettingsMixin:
         self.disk_write_curve.setPen(pg.mkPen(color=disk_write_color, width=self.line_thickness))
         self.net_sent_curve.setPen(pg.mkPen(color=net_sent_color, width=self.line_thickness))
         self.net_recv_curve.setPen(pg.mkPen(color=net_recv_color, width=self.line_thickness))
+        for pool in self.curve_pools.values():
+            pool.set_width(self.line_thickness)
 
     def save_line_thickness_preference(self):
         """Save line thickness preference to config file"""
@@ -0,0 +1,240 @@
+"""
+SysMon Smoothing
+Incremental smoothing filters for the plotted series.
+
+Each series keeps its smoothed copy between frames.  When the store has
+only appended ``k`` samples since the last frame, the old output is
+shifted by ``k`` and just the ``k`` new points are computed, so a frame
+costs O(k * window) filter work plus one vectorized shift instead of
+refiltering the whole buffer.  A full recompute (first frame, new window
+or mode, buffer resize, a different store) is vectorized with NumPy.
+
+Points near the start of a full recompute use the samples available
+(a partial window); points computed incrementally keep the values they
+had when they were newest, even after the older samples scroll out.
+"""
+
+import warnings
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SMOOTHING_MODES = {
+    'sma': 'Moving Average',
+    'ema': 'Exponential Moving Average',
+    'median': 'Rolling Median',
+    'savgol': 'Savitzky-Golay',
+}
+
+SAVGOL_ORDER = 2       # Polynomial order of the Savitzky-Golay fit (lowered for tiny windows)
+SMA_RESYNC = 4096      # Samples between exact re-sums of the running SMA sums
+EMA_BLOCK = 256        # Block length of the vectorized EMA (keeps the power terms finite)
+
+
+def sma(data, window):
+    """Trailing moving average ignoring NaN; partial windows at the start"""
+    valid = ~np.isnan(data)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, data, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    lead = np.maximum(np.arange(1, len(data) + 1) - window, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums[1:] - sums[lead]) / (counts[1:] - counts[lead])
+
+
+def ema(data, window, state=None):
+    """Exponential moving average with span ``window``.
+
+    NaN inputs hold the last valid value (and are NaN in the output).
+    ``state`` is the (average, last valid value) to continue from.
+    Returns (output, new state).
+    """
+    if state is not None and np.isnan(state[0]):
+        state = None  # Nothing valid seen yet
+    alpha = 2.0 / (window + 1)
+    decay = 1.0 - alpha
+    filled = _forward_fill(data, None if state is None else state[1])
+    if len(filled) == 0:
+        return np.empty(0), state
+    level = filled[0] if state is None else state[0]
+
+    out = np.empty(len(filled))
+    steps = np.arange(EMA_BLOCK)
+    grow = decay ** -steps        # d^-i
+    shrink = decay ** steps       # d^j
+    carry = decay ** (steps + 1)  # d^(j+1)
+    for start in range(0, len(filled), EMA_BLOCK):
+        x = filled[start:start + EMA_BLOCK]
+        m = len(x)
+        # y_j = d^(j+1) * level + alpha * sum_i<=j d^(j-i) * x_i
+        block = carry[:m] * level + alpha * shrink[:m] * np.cumsum(x * grow[:m])
+        out[start:start + m] = block
+        level = block[-1]
+
+    last_valid = filled[-1]
+    out[np.isnan(data)] = np.nan
+    return out, (level, last_valid)
+
+
+def rolling_median(data, window, partial=True):
+    """Trailing rolling median ignoring NaN.
+
+    With ``partial`` the first window-1 points use the samples available;
+    without it only the len(data)-window+1 complete windows are returned.
+    """
+    if partial:
+        data = np.concatenate((np.full(window - 1, np.nan), data))
+    windows = sliding_window_view(data, window)
+    if not partial and not np.isnan(data).any():
+        return np.median(windows, axis=1)  # Several times faster than nanmedian
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN windows
+        return np.nanmedian(windows, axis=1)
+
+
+def savgol_coefficients(window, order=SAVGOL_ORDER):
+    """Weights of a causal Savitzky-Golay filter evaluated at the newest point"""
+    order = max(0, min(order, window - 2))
+    offsets = np.arange(-window + 1, 1, dtype=np.float64)
+    return np.linalg.pinv(np.vander(offsets, order + 1, increasing=True))[0]
+
+
+def savgol(data, window, coefficients=None):
+    """Causal Savitzky-Golay filter; the first window-1 points are left as-is"""
+    if coefficients is None:
+        coefficients = savgol_coefficients(window)
+    out = np.array(data, dtype=np.float64)
+    if len(data) >= window:
+        out[window - 1:] = sliding_window_view(data, window) @ coefficients
+    return out
+
+
+def _forward_fill(data, previous=None):
+    """Replace NaN with the last valid value (``previous`` before the first)"""
+    data = np.asarray(data, dtype=np.float64)
+    valid = ~np.isnan(data)
+    if valid.all():
+        return data
+    if not valid.any():
+        return np.full(len(data), np.nan if previous is None else previous)
+    index = np.where(valid, np.arange(len(data)), -1)
+    np.maximum.accumulate(index, out=index)
+    first = data[valid][0] if previous is None else previous
+    return np.where(index >= 0, data[np.maximum(index, 0)], first)
+
+
+class _Series:
+    """Cached output and filter state of one series"""
+
+    __slots__ = ('owner', 'appended', 'out', 'sum', 'count', 'since_sync', 'ema')
+
+    def __init__(self, owner, appended, out):
+        self.owner = owner
+        self.appended = appended
+        self.out = out
+        self.sum = 0.0
+        self.count = 0
+        self.since_sync = 0
+        self.ema = None
+
+
+class Smoother:
+    """Smoothed copies of the plotted series, updated as samples arrive.
+
+    ``smooth(key, data, owner, appended)`` returns the smoothed ``data``.
+    ``appended`` is the store's running sample count and ``owner`` the
+    store; together they tell which part of ``data`` is new since the last
+    call for ``key``.  Pass ``appended=None`` for data that isn't a ring
+    buffer (e.g. a history page), which is always recomputed.
+    """
+
+    def __init__(self, mode='sma', window=1):
+        self.series = {}
+        self.mode = 'sma'
+        self.window = 1
+        self.configure(mode, window)
+
+    def configure(self, mode, window):
+        """Switch filter or window; every series is recomputed on its next call"""
+        if mode not in SMOOTHING_MODES:
+            mode = 'sma'
+        self.mode = mode
+        self.window = max(1, int(window))
+        self.coefficients = savgol_coefficients(self.window)
+        self.series.clear()
+
+    @property
+    def active(self):
+        return self.window > 1
+
+    def smooth(self, key, data, owner=None, appended=None):
+        if not self.active or len(data) < 2:
+            return data
+        state = self.series.get(key)
+        n = len(data)
+        if appended is not None and state is not None and state.owner is owner:
+            new = appended - state.appended
+            prev = state.out
+            if 0 <= new and n - new <= len(prev) and new + self.window <= n:
+                if new == 0 and n == len(prev):
+                    return prev
+                out = prev if n == len(prev) else np.empty(n)
+                out[:n - new] = prev[len(prev) - (n - new):]
+                if new:
+                    self._extend(state, data, out, new)
+                state.out = out
+                state.appended = appended
+                return out
+        state = self._recompute(data, owner, appended)
+        if appended is not None:
+            self.series[key] = state
+        return state.out
+
+    def _recompute(self, data, owner, appended):
+        data = np.asarray(data, dtype=np.float64)
+        window = self.window
+        state = _Series(owner, appended, None)
+        if self.mode == 'ema':
+            state.out, state.ema = ema(data, window)
+        elif self.mode == 'median':
+            state.out = rolling_median(data, window)
+        elif self.mode == 'savgol':
+            state.out = savgol(data, window, self.coefficients)
+        else:
+            state.out = sma(data, window)
+            self._resync(state, data)
+        return state
+
+    def _resync(self, state, data):
+        """Exact running sum and count of the last ``window`` samples"""
+        tail = data[-self.window:]
+        valid = ~np.isnan(tail)
+        state.sum = float(tail[valid].sum())
+        state.count = int(valid.sum())
+        state.since_sync = 0
+
+    def _extend(self, state, data, out, new):
+        """Compute the ``new`` newest outputs into the end of ``out``"""
+        n = len(data)
+        window = self.window
+        if self.mode == 'ema':
+            out[n - new:], state.ema = ema(data[n - new:], window, state.ema)
+        elif self.mode == 'median':
+            out[n - new:] = rolling_median(data[n - new - window + 1:], window, partial=False)
+        elif self.mode == 'savgol':
+            out[n - new:] = sliding_window_view(data[n - new - window + 1:], window) @ self.coefficients
+        else:
+            # Running sum: add each arriving sample, drop the one leaving the window
+            total, count = state.sum, state.count
+            for i in range(n - new, n):
+                entering, leaving = data[i], data[i - window]
+                if entering == entering:  # Not NaN
+                    total += entering
+                    count += 1
+                if leaving == leaving:
+                    total -= leaving
+                    count -= 1
+                out[i] = total / count if count else np.nan
+            state.sum, state.count = total, count
+            state.since_sync += new
+            if state.since_sync >= SMA_RESYNC:
+                self._resync(state, data)
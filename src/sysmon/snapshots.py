@@ -0,0 +1,127 @@
+"""
+SysMon Process Snapshot Service
+One background process scan shared by every process view.
+
+The service runs a ProcessSnapshotSource on its own Sampler thread, so a
+long scan never delays the metric ticks, and publishes each immutable
+ProcessSnapshot on the GUI thread through ``snapshot_ready``.  The
+drill-down dialogs and the process timeline subscribe to that signal
+instead of scanning /proc themselves; ``latest`` holds the most recent
+snapshot for views that open (or refresh) between scans.
+
+Subscriptions drive the scan: each subscriber declares the views it
+shows ('cpu', 'disk', 'net') with subscribe() and drops them with
+unsubscribe(), and the scan reads only what the union of those views
+needs -- no socket tables unless a 'net' view is open.  With no
+subscribers the sampler has no sources and scans nothing.
+
+A view that wants fresher data than ``latest`` calls request_scan(): the
+scanning thread starts a scan right away (or, if one is running, right
+after it) and the call returns at once with a generation number.  Every
+snapshot carries the generation current when its scan started, so the
+view waits for a snapshot of that generation and ignores the ones scanned
+before its request.  Requests made while a scan is in flight coalesce
+into one scan; nothing ever waits for a scan on the GUI thread.
+"""
+
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from sysmon.processes import SNAPSHOT_INTERVAL, SNAPSHOT_VIEWS, ProcessSnapshotSource
+from sysmon.sampler import Sampler
+
+FRESH_SNAPSHOT = SNAPSHOT_INTERVAL / 4  # Seconds a snapshot is current enough for a refresh
+
+
+class ProcessSnapshotService(QObject):
+    """Scans processes once per interval for the subscribed views and broadcasts the snapshot"""
+    snapshot_ready = pyqtSignal(object)
+    _scanned = pyqtSignal()  # Emitted on the sampler thread
+
+    def __init__(self, profiler=None, parent=None):
+        super().__init__(parent)
+        self.latest = None
+        self.subscribers = {}  # Subscriber -> tuple of views
+        # Queued connection: emitted on the sampler thread, handled on the GUI thread
+        self._scanned.connect(self.publish)
+        self.source = ProcessSnapshotSource(views=())
+        self.sampler = Sampler([], self.source.interval * 1000,
+                               on_sample=self._scanned.emit, profiler=profiler)
+
+    def start(self):
+        self.sampler.start()
+
+    def stop(self):
+        """Ask the scanning thread to exit after the current scan"""
+        self.sampler.stop()
+
+    def views(self):
+        """Union of the subscribed views, in SNAPSHOT_VIEWS order"""
+        wanted = {view for views in self.subscribers.values() for view in views}
+        return tuple(view for view in SNAPSHOT_VIEWS if view in wanted)
+
+    def subscribe(self, subscriber, views):
+        """Scan for ``views`` until ``subscriber`` unsubscribes (replaces its earlier views)"""
+        self.subscribers[subscriber] = tuple(views)
+        self.update_views()
+
+    def unsubscribe(self, subscriber):
+        """Drop ``subscriber``'s views; does nothing when it isn't subscribed"""
+        if self.subscribers.pop(subscriber, None) is not None:
+            self.update_views()
+
+    def update_views(self):
+        """Point the scan at the subscribed views; no views, no scanning"""
+        views = self.views()
+        self.source.set_views(views)
+        if not views:
+            self.sampler.set_sources([])
+        elif not self.sampler.sources:
+            self.sampler.set_sources([self.source])
+            self.sampler.request_sample()  # Scan right away, then every interval
+
+    def request_scan(self, view=None):
+        """Ask for a scan now; returns the generation to wait for.
+
+        Returns None when ``latest`` is recent enough (and, with ``view``
+        given, was scanned for that view) to answer the request itself,
+        so repeated refreshes don't pile up scans (CPU percentages over a
+        few milliseconds would be mostly noise).
+        """
+        latest = self.latest
+        if (latest is not None and time.time() - latest.time < FRESH_SNAPSHOT
+                and (view is None or view in latest.views)):
+            return None
+        return self.sampler.request_sample()
+
+    def scan_once(self, view, callback):
+        """Call ``callback(snapshot)`` with the next snapshot scanned for ``view``.
+
+        For one-off reports of a view nobody is subscribed to: the view is
+        subscribed until that snapshot arrives.  Never blocks.
+        """
+        self.subscribe(callback, (view,))
+        generation = self.request_scan(view)
+        if generation is None:
+            self.unsubscribe(callback)
+            callback(self.latest)
+            return
+
+        def deliver(snapshot):
+            if view not in snapshot.views or snapshot.generation < generation:
+                return  # Scanned before the request or without the view
+            self.snapshot_ready.disconnect(deliver)
+            self.unsubscribe(callback)
+            callback(snapshot)
+
+        self.snapshot_ready.connect(deliver)
+
+    def publish(self):
+        """Hand every snapshot scanned since the last call to the subscribers"""
+        for sample in self.sampler.drain():
+            snapshot = sample.get('snapshot')
+            if snapshot is not None:
+                snapshot = snapshot._replace(generation=sample['generation'])
+                self.latest = snapshot
+                self.snapshot_ready.emit(snapshot)
@@ -0,0 +1,317 @@
+"""
+SysMon Time-Series Store
+Preallocated NumPy ring buffers holding the plotted metric history.
+"""
+
+import numpy as np
+
+
+# Columns recorded per metric source; each group also gets its own 'time' column
+METRIC_GROUPS = {
+    'cpu': ('cpu',),
+    'disk': ('disk_read', 'disk_write', 'disk_read_mb', 'disk_write_mb'),
+    'network': ('net_sent', 'net_recv', 'net_sent_mb', 'net_recv_mb'),
+    'memory': ('ram_percent',),
+    'swap': ('swap_percent',),
+}
+
+# Columns whose window total is shown on hover; kept as running sums
+SUMMED_COLUMNS = ('disk_read_mb', 'disk_write_mb', 'net_sent_mb', 'net_recv_mb')
+SUM_RESYNC = 4096  # Appends between exact re-sums of a running sum (bounds float drift)
+
+
+class TimeSeriesStore:
+    """Columnar ring buffer with one float64 array per metric and a shared cursor.
+
+    Every column is allocated at twice the capacity and each value is written
+    to both halves, so the newest ``len(store)`` samples are always one
+    contiguous slice.  ``store['cpu']`` therefore returns a NumPy view that can
+    be passed straight to ``setData`` without copying.  Views are only valid
+    until the next ``append``/``resize``/``clear``.
+
+    A column may also be 2-D (``add_column(name, width)``), holding one row of
+    ``width`` values per sample, e.g. per-core CPU usage for a heatmap.
+
+    Scalar columns listed in ``summed`` keep a running NaN-ignoring sum over
+    the window, updated as samples are appended and evicted, so ``sum(name)``
+    is O(1).
+    """
+
+    def __init__(self, columns, capacity, summed=()):
+        self.columns = tuple(columns)
+        self.capacity = max(1, int(capacity))
+        self._arrays = {name: np.zeros(2 * self.capacity) for name in self.columns}
+        self._cursor = 0  # Next write slot in [0, capacity)
+        self._count = 0
+        self.appended = 0  # Samples appended since creation/clear (survives resize)
+        self._sums = {name: 0.0 for name in summed if name in self._arrays}
+        self._since_resync = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __getitem__(self, name):
+        return self.view(name)
+
+    def _span(self):
+        """Return (start, stop) of the live window in the doubled array"""
+        cursor, count = self._cursor, self._count
+        start = cursor - count if cursor >= count else cursor - count + self.capacity
+        return start, start + count
+
+    def add_column(self, name, width=None):
+        """Add a column (2-D when ``width`` is given); existing rows read as NaN"""
+        shape = (2 * self.capacity,) if width is None else (2 * self.capacity, width)
+        self._arrays[name] = np.full(shape, np.nan)
+        if name not in self.columns:
+            self.columns += (name,)
+
+    def remove_column(self, name):
+        """Drop a column and release its buffer"""
+        self._arrays.pop(name, None)
+        self._sums.pop(name, None)
+        self.columns = tuple(c for c in self.columns if c != name)
+
+    def widen_column(self, name, width):
+        """Grow a 2-D column to ``width`` slots; new slots read as NaN"""
+        arr = self._arrays[name]
+        new_arr = np.full((arr.shape[0], width), np.nan)
+        new_arr[:, :arr.shape[1]] = arr
+        self._arrays[name] = new_arr
+
+    def width(self, name):
+        """Row width of a 2-D column, or None for a scalar column"""
+        arr = self._arrays.get(name)
+        return arr.shape[1] if arr is not None and arr.ndim == 2 else None
+
+    def append(self, values):
+        """Append one sample; columns missing from ``values`` are stored as NaN"""
+        i = self._cursor
+        j = i + self.capacity
+        if self._sums:
+            full = self._count == self.capacity
+            for name in self._sums:
+                value = values.get(name, np.nan)
+                if value == value:  # Not NaN
+                    self._sums[name] += value
+                if full:
+                    evicted = self._arrays[name][i]  # The oldest sample, about to be overwritten
+                    if evicted == evicted:
+                        self._sums[name] -= evicted
+        for name, arr in self._arrays.items():
+            value = values.get(name, np.nan)
+            arr[i] = value
+            arr[j] = value
+        self._cursor = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.appended += 1
+        if self._sums:
+            self._since_resync += 1
+            if self._since_resync >= SUM_RESYNC:
+                self._resync_sums()
+
+    def sum(self, name):
+        """Sum of a column over the window, ignoring NaN (O(1) for summed columns)"""
+        if name in self._sums:
+            return self._sums[name]
+        return float(np.nansum(self.view(name)))
+
+    def _resync_sums(self):
+        """Recompute the running sums exactly from the buffers"""
+        for name in self._sums:
+            self._sums[name] = float(np.nansum(self.view(name)))
+        self._since_resync = 0
+
+    def view(self, name):
+        """Contiguous oldest-to-newest view of one column (rows x width for 2-D)"""
+        start, stop = self._span()
+        return self._arrays[name][start:stop]
+
+    def last(self, name, default=None):
+        """Most recent value of a scalar column"""
+        if self._count == 0:
+            return default
+        return float(self._arrays[name][(self._cursor - 1) % self.capacity])
+
+    def resize(self, capacity):
+        """Reallocate every column, keeping the newest samples that still fit"""
+        capacity = max(1, int(capacity))
+        if capacity == self.capacity:
+            return
+        keep = min(self._count, capacity)
+        _, stop = self._span()
+        for name, arr in self._arrays.items():
+            new_arr = np.zeros((2 * capacity,) + arr.shape[1:])
+            tail = arr[stop - keep:stop]
+            new_arr[:keep] = tail
+            new_arr[capacity:capacity + keep] = tail
+            self._arrays[name] = new_arr
+        self.capacity = capacity
+        self._count = keep
+        self._cursor = keep % capacity
+        self._resync_sums()
+
+    def clear(self):
+        """Drop all samples without releasing the buffers"""
+        self._cursor = 0
+        self._count = 0
+        self.appended = 0
+        self._resync_sums()
+
+
+class DeviceColumns:
+    """Per-device history kept in 2-D store columns, one slot per device.
+
+    Devices are mapped to a slot the first time they are seen.  A device
+    that vanishes keeps its slot (its rows read as NaN) until its history
+    has scrolled out of the window; recycle_idle() then hands the slot to
+    the next new device, so container churn doesn't grow the buffers.
+    """
+
+    def __init__(self, store, columns, initial_slots=8):
+        self.store = store
+        self.columns = tuple(columns)
+        self.slots = {}  # device name -> slot
+        self.free = []
+        self._next_slot = 0
+        self._names = None
+        self._index = None
+        for column in self.columns:
+            store.add_column(column, initial_slots)
+
+    def slot_names(self):
+        """Return {slot: device name}"""
+        return {slot: name for name, slot in self.slots.items()}
+
+    def _slot(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = self._next_slot
+                self._next_slot += 1
+                width = self.store.width(self.columns[0])
+                if slot >= width:
+                    for column in self.columns:
+                        self.store.widen_column(column, width * 2)
+            self.slots[name] = slot
+        return slot
+
+    def rows(self, names, values):
+        """Turn per-device values (devices x columns) into store rows
+
+        Returns {column: row} ready to merge into a sample for store.append();
+        devices not in ``names`` get NaN for this sample.
+        """
+        if names != self._names:
+            self._index = np.array([self._slot(name) for name in names], dtype=np.intp)
+            self._names = names
+        width = self.store.width(self.columns[0])
+        rows = {}
+        for j, column in enumerate(self.columns):
+            row = np.full(width, np.nan)
+            row[self._index] = values[:, j]
+            rows[column] = row
+        return rows
+
+    def recycle_idle(self):
+        """Free the slots of devices that have been absent for the whole window"""
+        present = set(self._names or ())
+        history = self.store[self.columns[0]]
+        for name, slot in list(self.slots.items()):
+            if name not in present and np.isnan(history[:, slot]).all():
+                del self.slots[name]
+                self.free.append(slot)
+
+    def remove(self):
+        """Drop the columns from the store"""
+        for column in self.columns:
+            self.store.remove_column(column)
+
+
+class MetricStore:
+    """One TimeSeriesStore per metric source, each with its own 'time' column.
+
+    Sources are sampled at different rates (CPU every tick, swap every few
+    seconds), so their rows don't line up.  Columns are still looked up by
+    name -- ``store['cpu']`` -- and ``store.times('cpu')`` returns the
+    timestamps that belong to that column.  All groups share one clock, so
+    ``latest_time()`` is a common "now" for every plot.
+    """
+
+    def __init__(self, groups, capacity):
+        self.groups = {name: TimeSeriesStore(('time',) + tuple(columns), 1, SUMMED_COLUMNS)
+                       for name, columns in groups.items()}
+        self.resize(capacity)
+
+    def __len__(self):
+        return sum(len(table) for table in self.groups.values())
+
+    def __contains__(self, column):
+        return self.table_of(column) is not None
+
+    def __getitem__(self, column):
+        return self.table_of(column)[column]
+
+    def group(self, name):
+        """The TimeSeriesStore holding one source's columns"""
+        return self.groups[name]
+
+    def group_of(self, column):
+        """Name of the source group holding ``column``, or None"""
+        for name, table in self.groups.items():
+            if column in table:
+                return name
+        return None
+
+    def table_of(self, column):
+        """The table holding ``column``, or None"""
+        for table in self.groups.values():
+            if column in table:
+                return table
+        return None
+
+    def times(self, column):
+        """Timestamps matching the rows of ``column``"""
+        return self.table_of(column)['time']
+
+    def total(self, column):
+        """Sum of a column over the window, ignoring NaN"""
+        return self.table_of(column).sum(column)
+
+    def appended(self, column):
+        """Running sample count of the table holding ``column`` (see Smoother)"""
+        return self.table_of(column).appended
+
+    def latest_time(self):
+        """Newest timestamp across every group, or None when empty"""
+        times = [table.last('time') for table in self.groups.values() if len(table)]
+        return max(times) if times else None
+
+    def append(self, group, values):
+        """Append one sample to a source's table"""
+        self.groups[group].append(values)
+
+    def width(self, column):
+        table = self.table_of(column)
+        return table.width(column) if table is not None else None
+
+    def remove_column(self, column):
+        table = self.table_of(column)
+        if table is not None:
+            table.remove_column(column)
+
+    def resize(self, capacity):
+        """Resize every table; ``capacity`` is an int or a dict of group -> rows"""
+        for name, table in self.groups.items():
+            table.resize(capacity.get(name, table.capacity) if isinstance(capacity, dict)
+                         else capacity)
+
+    def clear(self):
+        for table in self.groups.values():
+            table.clear()
@@ -144,6 +144,7 @@ class ThemeMixin:
             for lbl in (self._cpu_hover_label, self._mem_hover_label,
                         self._disk_hover_label, self._net_hover_label):
                 lbl.setStyleSheet(style)
+            self._hover_label_state.clear()  # Sizes change with the style
 
     def apply_system_theme_to_plots(self):
         """Apply system theme colors to plots"""
@@ -6,6 +6,7 @@ Window positioning, geometry persistence, keyboard/mouse events, transparency, a
 import os
 import json
 
+import numpy as np
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                               QPushButton, QMessageBox)
 from PyQt5.QtCore import Qt, QTimer, QEvent
@@ -43,9 +44,24 @@ class WindowMixin:
             self.increase_smoothing()
         elif event.key() == Qt.Key_Minus:
             self.decrease_smoothing()
+        elif event.key() == Qt.Key_PageUp:
+            self.scroll_history(-1)
+        elif event.key() == Qt.Key_PageDown:
+            self.scroll_history(1)
+        elif event.key() == Qt.Key_End:
+            self.return_to_live()
+        elif event.key() == Qt.Key_Escape and self.replay is not None:
+            self.stop_replay()
         else:
             super().keyPressEvent(event)
 
+    def changeEvent(self, event):
+        """Redraw straight away when the window is restored from minimized"""
+        if (event.type() == QEvent.WindowStateChange and not self.isMinimized()
+                and getattr(self, 'plots_dirty', False)):
+            self.frame_timer.start(0)
+        super().changeEvent(event)
+
     def mousePressEvent(self, event):
         """Left-click to minimize window"""
         if event.button() == Qt.LeftButton:
@@ -142,6 +158,7 @@ class WindowMixin:
 # Window Geometry Methods
     def closeEvent(self, event):
         """Handle window close event to save geometry"""
+        self.stop_sampler()
         try:
             self.save_window_geometry()
             print("Window geometry saved successfully")
@@ -190,6 +207,14 @@ class WindowMixin:
                     self.always_on_top = prefs.get('always_on_top', False)
                     self.invert_axis = prefs.get('invert_axis', False)
                     self.smoothing_window = prefs.get('smoothing_window', 1)
+                    self.smoothing_mode = prefs.get('smoothing_mode', 'sma')
+                    self.decimation = prefs.get('decimation', 'm4')
+                    self.use_opengl = prefs.get('use_opengl', False)
+                    show_frame_timings = prefs.get('show_frame_timings', False)
+                    collector_backend = prefs.get('collector_backend', 'auto')
+                    cpu_per_core = prefs.get('cpu_per_core', False)
+                    per_device = {'disk': prefs.get('disk_per_device', False),
+                                  'net': prefs.get('net_per_device', False)}
                     if 'current_theme' in prefs:
                         self.current_theme = prefs['current_theme']
                     elif 'theme_mode' in prefs:
@@ -202,9 +227,25 @@ class WindowMixin:
                     self.skipped_update_versions = prefs.get('skipped_update_versions', [])
 
                     # Apply loaded preferences
-                    if hasattr(self, 'timer'):
-                        self.timer.setInterval(self.update_interval)
-                    self.max_points = int((self.time_window * 1000) / self.update_interval)
+                    self.set_update_interval(self.update_interval)
+                    if collector_backend != self.collector_backend:
+                        self.set_collector_backend(collector_backend)
+                    if cpu_per_core != self.cpu_per_core:
+                        self.set_cpu_per_core(cpu_per_core)
+                        self.cpu_per_core_action.setChecked(cpu_per_core)
+                    for kind, action in (('disk', self.disk_per_device_action),
+                                         ('net', self.net_per_device_action)):
+                        if per_device[kind] != self.per_device[kind]:
+                            self.set_device_breakdown(kind, per_device[kind])
+                            action.setChecked(per_device[kind])
+                    for name, action in self.decimation_actions.items():
+                        action.setChecked(name == self.decimation)
+                    self.opengl_action.setChecked(self.use_opengl)
+                    if self.use_opengl:
+                        self.apply_render_backend()
+                    self.frame_timings_action.setChecked(show_frame_timings)
+                    self.set_profiler_hud(show_frame_timings)
+                    self.resize_store()
                     self.set_window_transparency(self.transparency)
                     self.set_always_on_top(self.always_on_top)
                     self.always_on_top_action.setChecked(self.always_on_top)
@@ -397,6 +438,25 @@ class WindowMixin:
         for plot in (self.cpu_plot, self.memory_plot, self.disk_plot, self.net_plot):
             plot.getPlotItem().hideButtons()
 
+        self.attach_hover_labels()
+
+        self.cpu_plot.scene().sigMouseMoved.connect(self.on_cpu_hover)
+        self.memory_plot.scene().sigMouseMoved.connect(self.on_memory_hover)
+        self.disk_plot.scene().sigMouseMoved.connect(self.on_disk_hover)
+        self.net_plot.scene().sigMouseMoved.connect(self.on_net_hover)
+
+        # Last known scene position per graph — used to refresh labels while mouse is stationary
+        self._cpu_last_pos  = None
+        self._mem_last_pos  = None
+        self._disk_last_pos = None
+        self._net_last_pos  = None
+
+    def attach_hover_labels(self):
+        """Create the overlay labels on each plot's current viewport.
+
+        Called again after the render backend swaps the viewports, which
+        deletes the labels along with the old viewport widgets.
+        """
         # Parent to viewport() — the actual drawing surface of the QGraphicsView.
         # Parenting to the PlotWidget itself puts the label behind the viewport.
         self._cpu_hover_label  = QLabel(self.cpu_plot.viewport())
@@ -410,17 +470,6 @@ class WindowMixin:
             lbl.setAttribute(Qt.WA_TransparentForMouseEvents)
             lbl.hide()
 
-        self.cpu_plot.scene().sigMouseMoved.connect(self.on_cpu_hover)
-        self.memory_plot.scene().sigMouseMoved.connect(self.on_memory_hover)
-        self.disk_plot.scene().sigMouseMoved.connect(self.on_disk_hover)
-        self.net_plot.scene().sigMouseMoved.connect(self.on_net_hover)
-
-        # Last known scene position per graph — used to refresh labels while mouse is stationary
-        self._cpu_last_pos  = None
-        self._mem_last_pos  = None
-        self._disk_last_pos = None
-        self._net_last_pos  = None
-
         self._hover_label_map = {
             self.cpu_plot.viewport():    self._cpu_hover_label,
             self.memory_plot.viewport(): self._mem_hover_label,
@@ -429,6 +478,7 @@ class WindowMixin:
         }
         for vp in self._hover_label_map:
             vp.installEventFilter(self)
+        self._hover_label_state = {}  # Label -> (text, position) last shown
 
     def eventFilter(self, obj, event):
         """Hide the overlay when the mouse leaves a plot viewport."""
@@ -438,17 +488,67 @@ class WindowMixin:
                 label.hide()
         return super().eventFilter(obj, event)
 
-    def _get_value_at_x(self, data, x_pos):
-        """Return the raw data value whose time index is nearest to x_pos."""
-        if not self.time_data or not data:
+    def _nearest_index(self, column, x_pos):
+        """Return the row of column whose relative time is nearest to x_pos.
+
+        Each column is indexed against its own source's timestamps, since
+        sources are sampled at different rates.
+        """
+        store = self.plot_store
+        group = store.group_of(column)
+        if group is None:
             return None
-        time_array = [t - self.time_data[-1] for t in self.time_data]
-        data_list = list(data)
-        n = min(len(time_array), len(data_list))
+        # Search the relative time axis drawn last frame while it still matches
+        # the store; otherwise the absolute timestamps (both are sorted)
+        axis, drawn_from, appended = self.time_axes.get(group, (None, None, None))
+        if axis is None or drawn_from is not store or appended != store.appended(column) \
+                or len(axis) != len(store[column]):
+            axis = store.times(column)
+            x_pos += store.latest_time()
+        n = len(axis)
         if n == 0:
             return None
-        nearest_idx = min(range(n), key=lambda i: abs(time_array[i] - x_pos))
-        return data_list[nearest_idx]
+        i = int(np.searchsorted(axis, x_pos))
+        if i == n or (i > 0 and x_pos - axis[i - 1] <= axis[i] - x_pos):
+            return i - 1
+        return i
+
+    def _get_value_at_x(self, column, x_pos):
+        """Return the raw value of column whose timestamp is nearest to x_pos."""
+        idx = self._nearest_index(column, x_pos)
+        if idx is None:
+            return None
+        return float(self.plot_store[column][idx])
+
+    def _hottest_cores_html(self, x_pos, count=3):
+        """Return HTML listing the busiest cores at the sample nearest x_pos."""
+        idx = self._nearest_index('cpu_cores', x_pos)
+        if idx is None:
+            return ''
+        row = np.nan_to_num(self.plot_store['cpu_cores'][idx], nan=-1.0)
+        hottest = np.argsort(row)[::-1][:count]
+        parts = [f'cpu{i}: {row[i]:.0f}%' for i in hottest if row[i] >= 0]
+        if not parts:
+            return ''
+        return '<br><span style="color:#888888;">Hottest: </span>' + '  |  '.join(parts)
+
+    def _busiest_devices_html(self, kind, x_pos, count=3):
+        """Return HTML listing the busiest devices at the sample nearest x_pos."""
+        columns = self.device_columns.get(kind)
+        if columns is None:
+            return ''
+        idx = self._nearest_index(columns.columns[0], x_pos)
+        if idx is None:
+            return ''
+        first, second = (self.plot_store[c][idx] for c in columns.columns)
+        totals = np.nan_to_num(first) + np.nan_to_num(second)
+        names = columns.slot_names()
+        busiest = [slot for slot in np.argsort(totals)[::-1][:count]
+                   if totals[slot] > 0 and slot in names]
+        if not busiest:
+            return ''
+        parts = [f'{names[slot]}: {totals[slot]:.2f}' for slot in busiest]
+        return '<br><span style="color:#888888;">Busiest MB/s: </span>' + '  |  '.join(parts)
 
     def _show_hover_label(self, label, plot, text, align='left'):
         """Show the hover label anchored to the top corner of the data canvas.
@@ -457,15 +557,19 @@ class WindowMixin:
         align='right' — top-right corner
         """
         vb = plot.getPlotItem().getViewBox()
-        if align == 'right':
-            pt = plot.mapFromScene(vb.sceneBoundingRect().topRight())
+        rect = vb.sceneBoundingRect()
+        pt = plot.mapFromScene(rect.topRight() if align == 'right' else rect.topLeft())
+        # Rich-text layout is the expensive part; skip it while the label is unchanged
+        state = (text, pt.x(), pt.y())
+        if label.isVisible() and self._hover_label_state.get(label) == state:
+            return
+        if self._hover_label_state.get(label, (None,))[0] != text:
             label.setText(text)
             label.adjustSize()
+        self._hover_label_state[label] = state
+        if align == 'right':
             label.move(pt.x() - label.width() - 4, pt.y() + 4)
         else:
-            pt = plot.mapFromScene(vb.sceneBoundingRect().topLeft())
-            label.setText(text)
-            label.adjustSize()
             label.move(pt.x() + 4, pt.y() + 4)
         label.show()
         label.raise_()
@@ -485,10 +589,12 @@ class WindowMixin:
             return
         self._cpu_last_pos = pos
         x = self.cpu_plot.getPlotItem().getViewBox().mapSceneToView(pos).x()
-        val = self._get_value_at_x(self.cpu_data, x)
+        val = self._get_value_at_x('cpu', x)
         if val is not None:
             c = self._pen_color(self.cpu_curve)
             html = f'<span style="color:{c};">CPU: {val:.1f}%</span>'
+            if self.cpu_per_core:
+                html += self._hottest_cores_html(x)
             self._show_hover_label(self._cpu_hover_label, self.cpu_plot, html)
 
     def on_memory_hover(self, pos):
@@ -499,8 +605,8 @@ class WindowMixin:
             return
         self._mem_last_pos = pos
         x = self.memory_plot.getPlotItem().getViewBox().mapSceneToView(pos).x()
-        ram  = self._get_value_at_x(self.ram_percent_data, x)
-        swap = self._get_value_at_x(self.swap_percent_data, x)
+        ram  = self._get_value_at_x('ram_percent', x)
+        swap = self._get_value_at_x('swap_percent', x)
         if ram is not None:
             cr = self._pen_color(self.mem_ram_curve)
             cs = self._pen_color(self.mem_swap_curve)
@@ -517,19 +623,20 @@ class WindowMixin:
             return
         self._disk_last_pos = pos
         x = self.disk_plot.getPlotItem().getViewBox().mapSceneToView(pos).x()
-        read  = self._get_value_at_x(self.disk_read_data, x)
-        write = self._get_value_at_x(self.disk_write_data, x)
+        read  = self._get_value_at_x('disk_read', x)
+        write = self._get_value_at_x('disk_write', x)
         if read is not None:
             cr = self._pen_color(self.disk_read_curve)
             cw = self._pen_color(self.disk_write_curve)
             html = f'<span style="color:{cr};">Read: {read:.2f} MB/s</span>'
             if write is not None:
                 html += f'<span style="color:#888888;">  |  </span><span style="color:{cw};">Write: {write:.2f} MB/s</span>'
-            total_read = sum(self.disk_read_mb_data)
-            total_write = sum(self.disk_write_mb_data)
+            total_read = self.plot_store.total('disk_read_mb')
+            total_write = self.plot_store.total('disk_write_mb')
             html += f'<br><span style="color:{cr};">R {_fmt_mb(total_read)}</span>'
             html += f'<span style="color:#888888;">  |  </span>'
             html += f'<span style="color:{cw};">W {_fmt_mb(total_write)}</span>'
+            html += self._busiest_devices_html('disk', x)
             self._show_hover_label(self._disk_hover_label, self.disk_plot, html, align='right')
 
     def on_net_hover(self, pos):
@@ -540,19 +647,20 @@ class WindowMixin:
             return
         self._net_last_pos = pos
         x = self.net_plot.getPlotItem().getViewBox().mapSceneToView(pos).x()
-        sent = self._get_value_at_x(self.net_sent_data, x)
-        recv = self._get_value_at_x(self.net_recv_data, x)
+        sent = self._get_value_at_x('net_sent', x)
+        recv = self._get_value_at_x('net_recv', x)
         if sent is not None:
             cs = self._pen_color(self.net_sent_curve)
             cr = self._pen_color(self.net_recv_curve)
             html = f'<span style="color:{cs};">Sent: {sent:.2f} MB/s</span>'
             if recv is not None:
                 html += f'<span style="color:#888888;">  |  </span><span style="color:{cr};">Recv: {recv:.2f} MB/s</span>'
-            total_sent = sum(self.net_sent_mb_data)
-            total_recv = sum(self.net_recv_mb_data)
+            total_sent = self.plot_store.total('net_sent_mb')
+            total_recv = self.plot_store.total('net_recv_mb')
             html += f'<br><span style="color:{cs};">↑ {_fmt_mb(total_sent)}</span>'
             html += f'<span style="color:#888888;">  |  </span>'
             html += f'<span style="color:{cr};">↓ {_fmt_mb(total_recv)}</span>'
+            html += self._busiest_devices_html('net', x)
             self._show_hover_label(self._net_hover_label, self.net_plot, html, align='right')
 
     def refresh_hover_labels(self):
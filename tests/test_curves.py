@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for the append-only scrolling live curve."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+pg = pytest.importorskip('pyqtgraph')
+
+from sysmon.curves import ScrollingCurve, set_curve_data
+from sysmon.store import TimeSeriesStore
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def segments(path, oldest=-np.inf):
+    """Line segments a QPainterPath draws, ignoring zero-length ones and those before ``oldest``"""
+    drawn = set()
+    point = None
+    for i in range(path.elementCount()):
+        element = path.elementAt(i)
+        current = (round(element.x, 9), round(element.y, 9))
+        if element.type == 1 and point is not None and point != current and point[0] >= oldest:
+            drawn.add((point, current))
+        point = current
+    return drawn
+
+
+def drawn(curve, store):
+    """Segments the scrolling curve draws inside the store's window"""
+    oldest = store['time'][0]
+    lines = set()
+    for path in [chunk.path for chunk in curve.chunks] + [curve.tail]:
+        lines |= segments(path, oldest)
+    return lines
+
+
+def expected(store):
+    """Segments set_curve_data() draws for the same series"""
+    reference = pg.PlotCurveItem()
+    set_curve_data(reference, store['time'], store['cpu'])
+    return segments(reference.getPath())
+
+
+def catch_up(curve, store, token=None):
+    curve.update_data(store['time'], store['cpu'], store, store.appended, token)
+
+
+@pytest.fixture
+def curve():
+    curve = ScrollingCurve(pg.PlotDataItem())
+    curve.CHUNK_POINTS = 4
+    return curve
+
+
+def test_scrolling_across_chunk_boundaries_matches_set_data(curve):
+    store = TimeSeriesStore(('time', 'cpu'), capacity=10)
+    t = 0
+    # Appends of 1-3 samples per frame, so chunks are sealed mid-batch too
+    for batch in [1, 2, 3, 1, 1, 3, 2, 2, 3, 1, 3, 3, 2, 1, 1, 2, 3, 3]:
+        for _ in range(batch):
+            store.append({'time': t * 0.5, 'cpu': float(t % 7)})
+            t += 1
+        catch_up(curve, store)
+        assert drawn(curve, store) == expected(store)
+        # Chunks that scrolled out are dropped; only one can straddle the left edge
+        assert all(chunk.x1 >= store['time'][0] for chunk in curve.chunks)
+        assert len(curve.chunks) <= store.capacity // curve.CHUNK_POINTS + 1
+
+
+def test_gaps_lift_the_pen_like_set_data(curve):
+    store = TimeSeriesStore(('time', 'cpu'), capacity=12)
+    values = [1, 2, np.nan, 4, 5, 6, np.nan, np.nan, 9, np.nan, 11, 12, 13, np.nan, 15, 16]
+    for t, value in enumerate(values):
+        store.append({'time': float(t), 'cpu': float(value)})
+        catch_up(curve, store)
+        assert drawn(curve, store) == expected(store)
+
+    # More new samples than the window holds: rebuilt from the arrays, same drawing
+    for t, value in enumerate(values * 2, start=len(values)):
+        store.append({'time': float(t), 'cpu': float(value)})
+    catch_up(curve, store)
+    assert drawn(curve, store) == expected(store)
+
+
+def test_window_and_smoothing_changes(curve):
+    store = TimeSeriesStore(('time', 'cpu'), capacity=20)
+    for t in range(20):
+        store.append({'time': float(t), 'cpu': float(t * t % 11)})
+    catch_up(curve, store)
+
+    # A narrower window drops the chunks that fell out of it right away
+    store.resize(6)
+    catch_up(curve, store)
+    assert drawn(curve, store) == expected(store)
+    assert all(chunk.x1 >= store['time'][0] for chunk in curve.chunks)
+
+    # A wider window keeps scrolling from what's there
+    store.resize(30)
+    for t in range(20, 31):
+        store.append({'time': float(t), 'cpu': float(t * t % 11)})
+        catch_up(curve, store)
+    assert drawn(curve, store) == expected(store)
+
+    # New smoothing settings mean new values for every point: rebuilt
+    store['cpu'][:] = store['cpu'] / 2
+    catch_up(curve, store, token=('sma', 3))
+    assert drawn(curve, store) == expected(store)
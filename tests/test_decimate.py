@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Tests for M4/LTTB decimation and the completed-bucket cache."""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.decimate import Decimator, lttb, m4
+from sysmon.store import TimeSeriesStore
+
+
+def test_m4_keeps_every_bucket_extreme():
+    rng = np.random.default_rng(4)
+    times = np.arange(10000) * 0.1
+    values = rng.random(10000)
+    values[1234] = 50.0
+    values[8765] = -50.0
+    x, y, _ = m4(times, values, 10.0)
+    assert len(x) <= 4 * 100
+    assert np.all(np.diff(x) > 0)
+    for b in range(100):
+        bucket = values[b * 100:(b + 1) * 100]
+        kept = y[(x >= b * 10.0) & (x < (b + 1) * 10.0)]
+        assert kept.max() == bucket.max() and kept.min() == bucket.min()
+
+
+def test_lttb_picks_one_point_per_bucket_and_keeps_spikes():
+    times = np.arange(1000, dtype=np.float64)
+    values = np.zeros(1000)
+    values[505] = 10.0
+    x, y, _ = lttb(times, values, 10.0)
+    assert len(x) == 99  # First sample + one per decided bucket (the last is open)
+    assert 10.0 in y
+
+
+def test_cached_frames_match_a_fresh_reduction():
+    rng = np.random.default_rng(5)
+    for method in ('m4', 'lttb'):
+        store = TimeSeriesStore(('time', 'cpu'), capacity=5000)
+        decimator = Decimator(method)
+        t = 0.0
+        for frame in range(300):
+            for _ in range(1 + frame % 4):
+                t += 0.1
+                store.append({'time': t, 'cpu': rng.random()})
+            out = decimator.decimate('cpu', store['time'], store['cpu'], 500.0, 100,
+                                     store, store.appended)
+        assert out is not None
+        assert np.all(np.diff(out[0]) > 0), method
+        fresh = Decimator(method).decimate('cpu', store['time'], store['cpu'], 500.0, 100)
+        np.testing.assert_array_equal(out[0], fresh[0], err_msg=method)
+
+
+def test_sparse_series_are_drawn_as_is():
+    times = np.arange(100, dtype=np.float64)
+    assert Decimator('m4').decimate('cpu', times, times, 100.0, 500) is None
+    assert Decimator('off').decimate('cpu', times, times, 100.0, 5) is None
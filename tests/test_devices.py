@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Tests for the per-device breakdowns: rates, store slots and pooled curves."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+pg = pytest.importorskip('pyqtgraph')
+from PyQt5.QtCore import Qt
+
+from sysmon.collectors import MB, DeviceRates
+from sysmon.curves import CurvePool
+from sysmon.data import MAX_DEVICE_CURVES, DataMixin
+from sysmon.store import DeviceColumns, MetricStore, TimeSeriesStore
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_device_rates_follow_devices_appearing_vanishing_and_resetting():
+    rates = DeviceRates()
+    assert rates.update(('sda', 'sdb'), np.array([[0, 0], [10, 10]]), 1.0) is None
+
+    sample = rates.update(('sda', 'sdb'), np.array([[MB, 2 * MB], [10 + MB, 10]]), 2.0)
+    assert sample.tolist() == [[1.0, 2.0], [1.0, 0.0]]
+
+    # sdb unplugged, sdc plugged in: sda keeps its baseline, sdc starts at zero
+    sample = rates.update(('sda', 'sdc'), np.array([[3 * MB, 2 * MB], [5 * MB, 5 * MB]]), 4.0)
+    assert sample.tolist() == [[1.0, 0.0], [0.0, 0.0]]
+
+    # A counter that goes backwards (driver reload, wrap) reads as idle, not negative
+    sample = rates.update(('sda', 'sdc'), np.array([[0, 0], [6 * MB, 5 * MB]]), 5.0)
+    assert sample.tolist() == [[0.0, 0.0], [1.0, 0.0]]
+
+    assert rates.update(('sda', 'sdc'), np.array([[0, 0], [6 * MB, 5 * MB]]), 5.0) is None
+
+
+def append(store, columns, t, names, values):
+    store.append({'time': float(t), **columns.rows(names, np.array(values, dtype=float))})
+
+
+def test_device_columns_widen_and_recycle_slots_of_departed_devices():
+    store = TimeSeriesStore(('time',), capacity=3)
+    columns = DeviceColumns(store, ('read', 'write'), initial_slots=2)
+    append(store, columns, 0, ('a', 'b'), [[1, 2], [3, 4]])
+    append(store, columns, 1, ('a', 'b', 'c'), [[1, 2], [3, 4], [5, 6]])
+    assert store.width('read') == 4 and store.width('write') == 4
+    assert columns.slots == {'a': 0, 'b': 1, 'c': 2}
+    assert np.isnan(store['read'][0, 2]) and store['write'][1, 2] == 6.0
+
+    # b leaves; its slot is kept while its history is still in the window
+    append(store, columns, 2, ('a', 'c'), [[1, 2], [5, 6]])
+    columns.recycle_idle()
+    assert 'b' in columns.slots
+    assert np.isnan(store['read'][-1, 1])
+
+    append(store, columns, 3, ('a', 'c'), [[1, 2], [5, 6]])
+    append(store, columns, 4, ('a', 'c'), [[1, 2], [5, 6]])
+    columns.recycle_idle()
+    assert 'b' not in columns.slots and columns.free == [1]
+
+    # The next new device takes the freed slot; the buffers don't grow
+    append(store, columns, 5, ('a', 'c', 'd'), [[1, 2], [5, 6], [7, 8]])
+    assert columns.slots['d'] == 1 and columns.slot_names()[1] == 'd'
+    assert store.width('read') == 4
+    assert store['read'][:, 1].tolist()[-1] == 7.0
+    assert np.isnan(store['read'][:-1, 1]).all()  # None of b's history shows as d's
+
+
+def test_only_the_busiest_devices_get_a_curve():
+    store = MetricStore({'disk': ('disk_read',)}, capacity=4)
+    columns = DeviceColumns(store.group('disk'), ('disk_dev_read', 'disk_dev_write'))
+    names = tuple(f'sd{i}' for i in range(MAX_DEVICE_CURVES + 4))
+    busy = [[i, 0] for i in range(len(names))]  # sd0 is idle
+    append(store.group('disk'), columns, 0, names, busy)
+    window = SimpleNamespace(store=store, device_columns={'disk': columns},
+                             _device_ranking={'disk': ([], 0.0)})
+
+    ranked = DataMixin.rank_devices(window, 'disk')
+    assert ranked == [columns.slots[f'sd{i}']
+                      for i in range(len(names) - 1, len(names) - 1 - MAX_DEVICE_CURVES, -1)]
+
+
+@pytest.fixture
+def plot():
+    widget = pg.PlotWidget()
+    widget.addLegend()
+    yield widget
+    widget.deleteLater()
+
+
+def test_curve_pool_reuses_retired_curves(plot):
+    pool = CurvePool(plot)
+    legend = plot.getPlotItem().legend
+    x = np.arange(3.0)
+    y = np.array([1.0, np.nan, 3.0])
+
+    def series(*keys):
+        return [(key, f'{key} read', '#ff6b6b', Qt.SolidLine, y) for key in keys]
+
+    pool.update(x, series('sda', 'sdb'))
+    sda = pool.active['sda'][0]
+    assert len(legend.items) == 2
+    assert np.isnan(sda.getData()[1][1])
+
+    pool.update(x, series('sdb'))
+    assert pool.free == [sda] and not sda.isVisible()
+    assert len(legend.items) == 1
+
+    pool.update(x, series('sdb', 'sdc'))
+    assert pool.active['sdc'][0] is sda and sda.isVisible() and not pool.free
+    assert len(plot.getPlotItem().listDataItems()) == 2
+    assert [label.text for _, label in legend.items] == ['sdb read', 'sdc read']
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for the throttled frame clock that redraws the plots."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+
+from sysmon import data
+from sysmon.data import DataMixin
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class FrameWindow(DataMixin, QtWidgets.QWidget):
+    """Just the frame clock of SystemMonitor, counting the frames it draws"""
+
+    def __init__(self):
+        super().__init__()
+        self.replay = None
+        self.frames = 0
+        self.setup_frame_clock()
+
+    def update_plots(self):
+        self.frames += 1
+
+
+def process_events(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def window(monkeypatch):
+    monkeypatch.setattr(data, 'HIDDEN_POLL_MS', 20)
+    window = FrameWindow()
+    window.show()
+    process_events(0.05)
+    yield window
+    window.frame_timer.stop()
+    window.close()
+    window.deleteLater()
+
+
+def test_requests_before_a_frame_coalesce_into_one_render(window):
+    for _ in range(5):
+        window.request_render()
+    process_events(0.1)
+    assert window.frames == 1 and not window.plots_dirty
+
+    # The next request waits out the rest of the frame interval, then renders once
+    window.request_render()
+    window.request_render()
+    assert window.frame_timer.isActive()
+    process_events(0.1)
+    assert window.frames == 2
+
+
+def test_hidden_window_renders_once_when_shown_again(window):
+    window.hide()
+    for _ in range(3):
+        window.request_render()
+        process_events(0.05)
+    assert window.frames == 0 and window.plots_dirty
+    assert window.frame_timer.isActive()  # Polling for the window to come back
+
+    window.show()
+    process_events(0.1)
+    assert window.frames == 1 and not window.plots_dirty
+    assert not window.frame_timer.isActive()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Tests for the memory-mapped on-disk history."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.history import HistoryStore
+
+GROUPS = {'cpu': ('cpu',), 'swap': ('swap_percent',)}
+
+
+def test_rotation_bounds_segments_and_reads_span_them(tmp_path):
+    history = HistoryStore(str(tmp_path), GROUPS, time_offset=100.0,
+                           segment_rows=4, max_segments=3)
+    for t in range(20):
+        history.append('cpu', {'time': float(t), 'cpu': t * 2.0})
+    assert len(os.listdir(tmp_path)) == 3
+    assert history.earliest_time() == 108.0
+
+    page = history.read('cpu', 109.5, 114.0)
+    assert page['time'].tolist() == [110.0, 111.0, 112.0, 113.0, 114.0]
+    assert page['cpu'].tolist() == [20.0, 22.0, 24.0, 26.0, 28.0]
+    assert len(history.read('swap', 0.0, 1e9)['time']) == 0
+    history.close()
+
+
+def test_reopen_continues_after_last_sample(tmp_path):
+    history = HistoryStore(str(tmp_path), GROUPS, segment_rows=8)
+    for t in range(5):
+        history.append('swap', {'time': float(t), 'swap_percent': 1.0})
+    history.close()
+
+    history = HistoryStore(str(tmp_path), GROUPS, segment_rows=8)
+    assert history.segments['swap'][-1].count == 5
+    history.append('swap', {'time': 5.0})
+    page = history.page(3.0, 10.0)
+    assert page.times('swap_percent').tolist() == [3.0, 4.0, 5.0]
+    assert page.latest_time() == 10.0
+    history.close()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Tests for the keyed, diff-updated process table model."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+from PyQt5.QtCore import Qt
+
+from sysmon.dialogs.process import CPU_COLUMNS
+from sysmon.dialogs.process_model import ProcessFilterProxyModel, ProcessTableModel
+from sysmon.processes import NO_CONNECTIONS, ProcessInfo
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def info(pid, cpu, name=None):
+    name = name or f'p{pid}'
+    return ProcessInfo(pid, name, name, cpu, 1.0, 0.0, 0.0, 0.0, *NO_CONNECTIONS)
+
+
+def record(model):
+    events = []
+    model.rowsInserted.connect(lambda parent, first, last: events.append(('insert', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(('remove', first, last)))
+    model.dataChanged.connect(lambda top, bottom, roles: events.append(
+        ('changed', top.row(), top.column(), bottom.column())))
+    return events
+
+
+def test_update_applies_keyed_row_diffs():
+    model = ProcessTableModel(CPU_COLUMNS)
+    model.update([info(1, 5.0), info(2, 3.0), info(3, 1.0)])
+    events = record(model)
+
+    # 2 exits, 1 is unchanged, 3's CPU changes, 4 is new
+    model.update([info(3, 2.0), info(1, 5.0), info(4, 9.0)])
+    assert events == [('remove', 1, 1), ('changed', 1, 2, 2), ('insert', 2, 2)]
+    assert model.pids == [1, 3, 4]
+    assert model.data(model.index(1, 2)) == '2.0%'
+    assert model.data(model.index(1, 2), Qt.FontRole) is model.data(model.index(0, 0), Qt.FontRole)
+
+    events.clear()
+    model.update([info(3, 2.0), info(1, 5.0), info(4, 9.0)])
+    assert events == []
+
+
+def test_proxy_sorts_on_values_and_filters_on_pid_or_command_line():
+    model = ProcessTableModel(CPU_COLUMNS)
+    proxy = ProcessFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.sort(2, Qt.DescendingOrder)
+    model.update([info(1, 9.0, 'bash'), info(2, 10.0, 'python3'), info(3, 100.0, 'make')])
+    shown = [proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())]
+    assert shown == ['3', '2', '1']  # As numbers: "9.0%" would sort above "10.0%" as text
+
+    model.update([info(1, 50.0, 'bash'), info(2, 10.0, 'python3'), info(3, 100.0, 'make')])
+    assert [proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())] == ['3', '1', '2']
+
+    proxy.set_filter_text('PY')
+    assert [proxy.data(proxy.index(row, 1)) for row in range(proxy.rowCount())] == ['python3']
+    proxy.set_filter_text('3')
+    assert {proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())} == {'2', '3'}
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Tests for the long-lived process table."""
+
+import os
+import socket
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon import processes
+from sysmon.processes import ProcessSnapshotSource, ProcessTable
+from sysmon.ranking import rank_snapshot
+
+
+def test_cpu_percent_is_measured_since_the_previous_refresh():
+    table = ProcessTable()
+    rows = table.refresh()
+    assert all(row['cpu_percent'] is None for row in rows)
+    end = time.perf_counter() + 0.3
+    while time.perf_counter() < end:
+        pass
+    rows = {row['pid']: row for row in table.refresh()}
+    assert rows[os.getpid()]['cpu_percent'] > 10
+    assert table.cmdline(rows[os.getpid()])
+
+
+class FakeProcess:
+    def __init__(self, pid, create_time, cpu, io=None):
+        self.pid = pid
+        self.info = {'pid': pid, 'name': f'p{pid}', 'memory_percent': 0.0,
+                     'cpu_times': SimpleNamespace(user=cpu, system=0.0),
+                     'io_counters': SimpleNamespace(read_bytes=io, write_bytes=0)
+                     if io is not None else None}
+        self._create_time = create_time
+        self.requested = []
+
+    def create_time(self):
+        return self._create_time
+
+    def name(self):
+        return self.info['name']
+
+    def as_dict(self, attrs, ad_value=None):
+        self.requested.append(attrs)
+        return {attr: self.info[attr] for attr in attrs}
+
+    def cmdline(self):
+        return ['cmd', str(self.pid)]
+
+
+def fake_iter(procs):
+    def process_iter():
+        return iter(procs)
+    return process_iter
+
+
+def fakes(*specs):
+    return [FakeProcess(*spec) for spec in specs]
+
+
+def test_reused_pids_start_over_and_dead_pids_are_evicted(monkeypatch):
+    table = ProcessTable()
+    monkeypatch.setattr(processes.psutil, 'process_iter', fake_iter(fakes((1, 10.0, 5.0), (2, 10.0, 1.0))))
+    table.refresh()
+    # PID 2 exited and was reused by a new process; PID 1 kept running
+    monkeypatch.setattr(processes.psutil, 'process_iter', fake_iter(fakes((1, 10.0, 5.5), (2, 99.0, 0.1))))
+    rows = {row['pid']: row for row in table.refresh()}
+    assert rows[1]['cpu_percent'] > 0
+    assert rows[2]['cpu_percent'] is None
+    assert set(table.entries) == {(1, 10.0), (2, 99.0)}
+
+
+def test_snapshot_joins_cpu_io_and_connections_from_one_scan(monkeypatch):
+    conn = lambda pid, status: SimpleNamespace(pid=pid, type=processes.socket.SOCK_STREAM,
+                                               status=status)
+    monkeypatch.setattr(processes.psutil, 'net_connections', lambda kind: [
+        conn(2, 'ESTABLISHED'), conn(2, 'LISTEN'), conn(None, 'TIME_WAIT')])
+    source = ProcessSnapshotSource()
+    source.sockets = None  # The psutil socket table, as off Linux
+    monkeypatch.setattr(processes.psutil, 'process_iter',
+                        fake_iter(fakes((1, 10.0, 5.0, 0), (2, 10.0, 1.0, 0), (3, 10.0, 0.0))))
+    first = source.sample(0.0)['snapshot']
+    assert rank_snapshot(first) == {}  # Nothing to take deltas against yet
+    monkeypatch.setattr(processes.psutil, 'process_iter',
+                        fake_iter(fakes((1, 10.0, 5.5, 0), (2, 10.0, 1.0, 8 * 1024 ** 2), (3, 10.0, 0.0))))
+    snapshot = source.sample(1.0)['snapshot']
+
+    assert [p.pid for p in snapshot.top('cpu', 1)] == [1]
+    assert [p.pid for p in snapshot.top('disk')] == [2]
+    assert snapshot.top('disk')[0].read_rate > 0
+    net = snapshot.top('net')
+    assert [(p.pid, p.connections, p.established_count, p.listen_count) for p in net] == [(2, 2, 1, 1)]
+    assert net[0].cmdline == 'cmd 2'
+    assert rank_snapshot(snapshot)['net'][0] == (2,)
+
+
+def test_views_switch_between_scans(monkeypatch):
+    monkeypatch.setattr(processes, 'open_socket_table', lambda: None)
+    monkeypatch.setattr(processes.psutil, 'net_connections', lambda kind: pytest.fail("sockets read"))
+    source = ProcessSnapshotSource(views=('cpu',))
+    procs = fakes((1, 10.0, 1.0, 0))
+    monkeypatch.setattr(processes.psutil, 'process_iter', fake_iter(procs))
+    assert source.sample(0.0)['snapshot'].views == ('cpu',)
+    assert 'io_counters' not in procs[0].requested[-1]
+
+    source.set_views(('cpu', 'disk'))
+    snapshot = source.sample(1.0)['snapshot']
+    assert snapshot.views == ('cpu', 'disk') and 'io_counters' in procs[0].requested[-1]
+
+
+def test_names_are_read_until_the_second_sighting_then_kept(monkeypatch):
+    table = ProcessTable()
+    procs = fakes((1, 10.0, 1.0), (2, 10.0, 1.0))
+    monkeypatch.setattr(processes.psutil, 'process_iter', fake_iter(procs))
+    for _ in range(3):
+        rows = table.refresh()
+    assert [row['name'] for row in rows] == ['p1', 'p2']
+    assert ['name' in attrs for attrs in procs[0].requested] == [True, True, False]
+
+    # A reused PID that psutil still reports the old create_time for
+    reused = fakes((2, 10.0, 0.2))
+    reused[0].info['name'] = 'new'
+    monkeypatch.setattr(processes.psutil, 'process_iter', fake_iter(procs[:1] + reused))
+    rows = table.refresh()
+    assert rows[1]['name'] == 'new' and rows[1]['cpu_percent'] is None
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="procfs socket tables")
+def test_procfs_socket_table_counts_own_sockets():
+    from sysmon.procfs import SocketTable
+    with socket.socket() as server, socket.socket() as client, \
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp:
+        server.bind(('127.0.0.1', 0))
+        server.listen()
+        udp.bind(('127.0.0.1', 0))  # Unbound UDP sockets aren't in the table yet
+        client.connect(server.getsockname())
+        accepted, _ = server.accept()
+        with accepted:
+            table = SocketTable()
+            counts = table.counts()[os.getpid()]
+            table.netlink = False  # The /proc/net tables must agree with sock_diag
+            assert table.counts()[os.getpid()] == counts
+    total, tcp, udp_count, established, listen = counts
+    assert (tcp, udp_count, established, listen) == (3, 1, 2, 1)
+    assert total == tcp + udp_count
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for the procfs collectors' file reads and counter parsing."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon import procfs
+from sysmon.collectors import MB
+from sysmon.procfs import ProcFile, ProcfsDiskSource, ProcfsNetworkSource, SECTOR_SIZE
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'preadv'), reason="needs os.preadv")
+
+PAGE = 4096
+DEVICES = 300  # Enough for either file to span several pages
+
+
+@pytest.fixture
+def seq_files(tmp_path, monkeypatch):
+    """Serve /proc paths from files in tmp_path, a page per read like a seq_file"""
+    preadv = os.preadv
+
+    def page_preadv(fd, buffers, offset):
+        view, = buffers
+        return preadv(fd, [memoryview(view)[:PAGE]], offset)
+
+    class FixtureFile(ProcFile):
+        def __init__(self, path, bufsize=4096):
+            super().__init__(str(tmp_path / os.path.basename(path)), bufsize)
+
+    monkeypatch.setattr(os, 'preadv', page_preadv)
+    monkeypatch.setattr(procfs, 'ProcFile', FixtureFile)
+    monkeypatch.setattr(procfs, 'is_whole_disk', lambda name: True)
+
+    def write(name, text):
+        (tmp_path / name).write_text(text)
+    return write
+
+
+def net_dev(scale, extra=''):
+    lines = ["Inter-|   Receive                            |  Transmit",
+             " face |bytes    packets errs drop fifo frame compressed multicast"
+             "|bytes    packets errs drop fifo colls carrier compressed"]
+    for i in range(DEVICES):
+        recv, sent = i * scale, 2 * i * scale
+        lines.append(f"veth{i:04d}: {recv} 10 0 0 0 0 0 0 {sent} 10 0 0 0 0 0 0")
+    return '\n'.join(lines) + '\n' + extra
+
+
+def diskstats(scale, extra=''):
+    lines = [f"   8 {i} sd{i:04d} 100 0 {i * scale} 50 200 0 {3 * i * scale} 70 0 80 120"
+             for i in range(DEVICES)]
+    return '\n'.join(lines) + '\n' + extra
+
+
+def test_read_continues_past_short_seq_file_reads(seq_files):
+    text = net_dev(1000)
+    assert len(text) > 3 * PAGE
+    seq_files('dev', text)
+    assert procfs.ProcFile('/proc/net/dev', bufsize=1024).read() == text.encode()
+
+
+def test_network_counts_every_interface_and_skips_cut_lines(seq_files):
+    seq_files('dev', net_dev(1000))
+    source = ProcfsNetworkSource(per_device=True)
+    seq_files('dev', net_dev(2000, extra="veth9999: 123 4\n"))
+    sample = source.sample(source.prev_time + 1.0)
+
+    total = sum(range(DEVICES)) * 1000
+    assert sample['net_recv'] == pytest.approx(total / MB)
+    assert sample['net_sent'] == pytest.approx(2 * total / MB)
+    names, rates = sample['net_devices']
+    assert len(names) == DEVICES and names[-1] == f'veth{DEVICES - 1:04d}'
+    assert rates[-1].tolist() == pytest.approx([2 * (DEVICES - 1) * 1000 / MB,
+                                                (DEVICES - 1) * 1000 / MB])
+
+
+def test_disk_counts_every_disk_and_skips_cut_lines(seq_files):
+    seq_files('diskstats', diskstats(10))
+    source = ProcfsDiskSource(per_device=True)
+    seq_files('diskstats', diskstats(20, extra="   8 0 sd9999 100 0 5"))
+    sample = source.sample(source.prev_time + 1.0)
+
+    total = sum(range(DEVICES)) * 10 * SECTOR_SIZE
+    assert sample['disk_read'] == pytest.approx(total / MB)
+    assert sample['disk_write'] == pytest.approx(3 * total / MB)
+    names, rates = sample['disk_devices']
+    assert len(names) == DEVICES
+    assert np.all(rates[1:] > 0)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Tests for the frame profiler's summaries and CSV export."""
+
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.profiler import FrameProfiler
+
+
+def test_flush_records_one_sample_per_frame():
+    profiler = FrameProfiler()
+    for frame in range(100):
+        profiler.add('smooth', 0.001)
+        profiler.add('smooth', 0.001)  # Two curves in the same frame
+        profiler.flush()
+    (section, count, p50, p95, peak), = profiler.summary()
+    assert (section, count) == ('smooth', 100)
+    assert p50 == pytest.approx(2.0) and p95 == pytest.approx(2.0) and peak == pytest.approx(2.0)
+
+
+def test_percentiles_and_history_limit():
+    profiler = FrameProfiler(history=100)
+    for ms in range(200):
+        profiler.record('collect:cpu', ms / 1000.0)
+    _, count, p50, p95, peak = profiler.summary()[0]
+    assert count == 100  # Only the newest samples are kept
+    assert p50 == pytest.approx(149.5)
+    assert p95 == pytest.approx(194.05)
+    assert peak == pytest.approx(199.0)
+
+
+def test_export_csv(tmp_path):
+    profiler = FrameProfiler()
+    profiler.record('ingest', 0.0005)
+    profiler.add('paint', 0.004)
+    profiler.flush()
+    path = tmp_path / 'timings.csv'
+    assert profiler.export_csv(path) == 2
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['time_s', 'section', 'ms']
+    assert [(r[1], float(r[2])) for r in rows[1:]] == [('ingest', 0.5), ('paint', 4.0)]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests for the per-interval process ranking rings."""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.processes import NO_CONNECTIONS, ProcessInfo, ProcessSnapshot
+from sysmon.ranking import ProcessRankings, rank_snapshot, top
+
+
+def test_window_returns_newest_rows_oldest_first():
+    rankings = ProcessRankings(capacity=3, top_n=2, metrics=('cpu',))
+    for t in range(5):
+        rankings.append(float(t), {'cpu': ((10 + t, 20), (f'p{t}', 'idle'), (50.0, 1.0))})
+    times, pids, name_ids, values = rankings.window('cpu')
+    assert times.tolist() == [2.0, 3.0, 4.0]
+    assert pids[:, 0].tolist() == [12, 13, 14]
+    assert [rankings.names[i] for i in name_ids[:, 0]] == ['p2', 'p3', 'p4']
+    assert rankings.window('cpu', start=3.0)[0].tolist() == [4.0]
+
+
+def test_short_rankings_leave_empty_ranks():
+    rankings = ProcessRankings(capacity=2, top_n=3, metrics=('cpu', 'disk'))
+    rankings.append(1.0, {'cpu': ((1,), ('init',), (5.0,))})
+    _, _, name_ids, values = rankings.window('cpu')
+    assert name_ids.tolist() == [[0, -1, -1]]
+    assert values.tolist() == [[5.0, 0.0, 0.0]]
+    assert rankings.window('disk')[2].tolist() == [[-1, -1, -1]]
+
+
+def test_name_table_stays_bounded():
+    rankings = ProcessRankings(capacity=4, top_n=1, metrics=('cpu',))
+    for t in range(50):  # Every interval a new short-lived process
+        rankings.append(float(t), {'cpu': ((t,), (f'job{t}',), (1.0,))})
+    assert len(rankings.names) <= rankings.max_names
+    _, _, name_ids, _ = rankings.window('cpu')
+    assert [rankings.names[i] for i in name_ids[:, 0]] == ['job46', 'job47', 'job48', 'job49']
+
+
+def test_top_drops_idle_processes():
+    pids, names, values = top([1, 2, 3, 4], ['a', 'b', 'c', 'd'],
+                              np.array([0.0, 7.0, 3.0, 0.0]), top_n=3)
+    assert pids == (2, 3) and names == ('b', 'c') and values == (7.0, 3.0)
+
+
+def test_only_scanned_views_are_ranked():
+    busy = ProcessInfo(1, 'busy', 'busy', 50.0, 1.0, 2.0, 0.0, 0.0, 3, 3, 0, 3, 0)
+    idle = ProcessInfo(2, 'idle', 'idle', 1.0, 1.0, 0.0, 0.0, 0.0, *NO_CONNECTIONS)
+    rankings = rank_snapshot(ProcessSnapshot(0.0, (busy, idle), 0, ('cpu', 'disk')))
+    assert set(rankings) == {'cpu', 'disk'}
+    assert rankings['cpu'][0] == (1, 2)
+    assert rank_snapshot(ProcessSnapshot(0.0, (busy, idle)))['net'][0] == (1,)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for the append-only binary recording format and headless imports."""
+
+import math
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC)
+
+from sysmon.recording import RecordingPlayer, RecordingReader, RecordingWriter
+
+GROUPS = {'cpu': ('cpu',), 'memory': ('ram_percent', 'ram_total')}
+
+
+def test_round_trip_and_append(tmp_path):
+    path = str(tmp_path / 'rec.bin')
+    with RecordingWriter(path, GROUPS, time_offset=1000.0) as writer:
+        writer.write('cpu', {'time': 0.5, 'cpu': 12.5})
+        writer.write('memory', {'time': 1.0, 'ram_percent': 40.0})
+        writer.write('unknown', {'time': 1.0})
+    with RecordingWriter(path, GROUPS, time_offset=2000.0) as writer:
+        writer.write('cpu', {'time': 0.0, 'cpu': 99.0})
+
+    records = list(RecordingReader(path))
+    assert [group for group, _ in records] == ['cpu', 'memory', 'cpu']
+    assert records[0][1] == {'time': 1000.5, 'cpu': 12.5}
+    assert records[1][1]['ram_percent'] == 40.0
+    assert math.isnan(records[1][1]['ram_total'])
+    assert records[2][1]['time'] == 2000.0
+
+
+def test_truncated_tail_is_ignored_and_trimmed(tmp_path):
+    path = str(tmp_path / 'rec.bin')
+    with RecordingWriter(path, GROUPS) as writer:
+        writer.write('cpu', {'time': 1.0, 'cpu': 1.0})
+        writer.write('cpu', {'time': 2.0, 'cpu': 2.0})
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 3)  # Simulate a crash mid-record
+    assert [s['cpu'] for _, s in RecordingReader(path)] == [1.0]
+
+    with RecordingWriter(path, GROUPS) as writer:
+        writer.write('cpu', {'time': 3.0, 'cpu': 3.0})
+    assert [s['cpu'] for _, s in RecordingReader(path)] == [1.0, 3.0]
+
+
+def test_mismatched_columns_are_rejected(tmp_path):
+    path = str(tmp_path / 'rec.bin')
+    RecordingWriter(path, GROUPS).close()
+    with pytest.raises(ValueError):
+        RecordingWriter(path, {'cpu': ('cpu', 'extra')})
+
+
+def test_player_steps_ticks_advances_clock_and_skips_gaps(tmp_path):
+    path = str(tmp_path / 'rec.bin')
+    with RecordingWriter(path, GROUPS, intervals={'cpu': 0.5}) as writer:
+        for t in (0.0, 0.5, 1.0, 60.0):
+            writer.write('cpu', {'time': t, 'cpu': t})
+            if t == 1.0:
+                writer.write('memory', {'time': t, 'ram_percent': 1.0})
+
+    player = RecordingPlayer(path)
+    assert player.intervals == {'cpu': 0.5}
+    assert [s['time'] for _, s in player.step()] == [0.0]
+    assert [s['time'] for _, s in player.advance(0.6)] == [0.5]
+    assert [g for g, _ in player.step()] == ['cpu', 'memory']
+    # The 59 s gap is skipped rather than replayed in real time
+    assert [s['time'] for _, s in player.advance(0.1)] == [60.0]
+    assert player.finished
+
+
+def test_headless_modules_do_not_import_qt():
+    code = ("import sys; import sysmon.headless; "
+            "sys.exit(any(m.split('.')[0] in ('PyQt5', 'pyqtgraph') for m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], env=dict(os.environ, PYTHONPATH=SRC))
+    assert result.returncode == 0
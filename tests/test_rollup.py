@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Tests for the min/max/avg/last rollup tiers."""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.rollup import RollupStore
+
+GROUPS = {'cpu': ('cpu',), 'disk': ('disk_read', 'disk_read_mb')}
+TIERS = ((1, 8), (10, 4))
+
+
+def test_buckets_keep_min_max_avg_last_and_sum(tmp_path):
+    rollups = RollupStore(str(tmp_path), GROUPS, time_offset=1000.0, tiers=TIERS)
+    for t, value in ((0.1, 5.0), (0.5, 1.0), (0.9, 3.0), (1.2, 7.0)):
+        rollups.append('cpu', {'time': t, 'cpu': value})
+    rollups.append('disk', {'time': 0.3, 'disk_read_mb': 2.0})
+
+    page = rollups.page(1000.0, 1001.9, 1)
+    assert page.times('cpu').tolist() == [1000.5, 1001.5]
+    assert page['cpu_min'].tolist() == [1.0, 7.0]
+    assert page['cpu_max'].tolist() == [5.0, 7.0]
+    assert page['cpu'].tolist() == [3.0, 7.0]
+    assert page['cpu_last'].tolist() == [3.0, 7.0]
+    assert page.total('disk_read_mb') == 2.0
+    assert math.isnan(page['disk_read'][0])
+
+    coarse = rollups.page(1000.0, 1009.0, 10)
+    assert coarse['cpu_max'].tolist() == [7.0]
+    assert coarse['cpu'].tolist() == [4.0]
+    rollups.close()
+
+
+def test_ring_drops_buckets_older_than_capacity(tmp_path):
+    rollups = RollupStore(str(tmp_path), GROUPS, tiers=TIERS)
+    for t in range(20):
+        rollups.append('cpu', {'time': float(t), 'cpu': float(t)})
+    page = rollups.page(0.0, 19.5, 1)
+    assert page['cpu'].tolist() == [float(t) for t in range(12, 20)]
+    rollups.close()
+
+    reopened = RollupStore(str(tmp_path), GROUPS, tiers=TIERS)
+    assert reopened.page(18.0, 19.5, 1)['cpu'].tolist() == [18.0, 19.0]
+    assert reopened.bucket_for(15.0) == 10
+    assert reopened.bucket_for(0.5) is None
+    reopened.close()
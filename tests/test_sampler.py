@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for on-demand sampling requests on the sampler thread."""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.sampler import Sampler
+
+
+class SlowSource:
+    """A source sampled once a minute that takes ``delay`` seconds per sample"""
+    name = 'slow'
+    interval = 60.0
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.started = threading.Event()
+
+    def sample(self, now):
+        self.started.set()
+        time.sleep(self.delay)
+        return {'value': 1.0}
+
+
+def wait_for(sampler, count, timeout=5.0):
+    """Drain until ``count`` samples have arrived; returns them"""
+    samples = []
+    end = time.monotonic() + timeout
+    while len(samples) < count and time.monotonic() < end:
+        samples.extend(sampler.drain())
+        time.sleep(0.01)
+    return samples
+
+
+def test_request_samples_now_with_its_generation():
+    sampler = Sampler([SlowSource()], 60000)
+    sampler.start()
+    try:
+        first, = wait_for(sampler, 1)
+        assert first['generation'] == 0
+        generation = sampler.request_sample()
+        requested, = wait_for(sampler, 1)  # Long before the next scheduled tick
+        assert requested['generation'] == generation == 1
+    finally:
+        sampler.stop()
+
+
+def test_requests_during_a_tick_coalesce_into_one():
+    source = SlowSource(delay=0.3)
+    sampler = Sampler([source], 60000)
+    sampler.start()
+    try:
+        assert source.started.wait(5.0)
+        generations = [sampler.request_sample() for _ in range(3)]
+        samples = wait_for(sampler, 2)
+        time.sleep(0.5)
+        samples.extend(sampler.drain())
+        # The tick in flight predates every request; one more tick serves them all
+        assert [s['generation'] for s in samples] == [0, generations[-1]]
+    finally:
+        sampler.stop()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Tests for the incremental smoothing filters."""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.smoothing import SMOOTHING_MODES, Smoother, ema, savgol, sma
+from sysmon.store import TimeSeriesStore
+
+
+def naive_sma(data, window):
+    return [np.mean(data[max(0, i - window + 1):i + 1]) for i in range(len(data))]
+
+
+def test_sma_matches_naive_average():
+    data = np.random.default_rng(1).random(50)
+    np.testing.assert_allclose(sma(data, 7), naive_sma(data, 7))
+
+
+def test_ema_matches_recurrence():
+    data = np.random.default_rng(2).random(600)  # Spans several EMA blocks
+    alpha = 2.0 / 11
+    expected = [data[0]]
+    for x in data[1:]:
+        expected.append(alpha * x + (1 - alpha) * expected[-1])
+    out, _ = ema(data, 10)
+    np.testing.assert_allclose(out, expected)
+
+
+def test_savgol_keeps_quadratics():
+    t = np.arange(30, dtype=np.float64)
+    data = 0.5 * t ** 2 - 3 * t + 2
+    np.testing.assert_allclose(savgol(data, 9), data, atol=1e-6)
+
+
+def test_incremental_matches_full_recompute():
+    rng = np.random.default_rng(3)
+    for mode in SMOOTHING_MODES:
+        store = TimeSeriesStore(('cpu',), capacity=40)
+        smoother = Smoother(mode, 5)
+        for step in range(120):
+            for _ in range(1 + step % 3):  # 1-3 samples per frame, wrapping the ring
+                value = np.nan if rng.random() < 0.05 else rng.random() * 100
+                store.append({'cpu': value})
+            out = smoother.smooth('cpu', store['cpu'], store, store.appended)
+        full = Smoother(mode, 5).smooth('cpu', store['cpu'])
+        # Only the oldest points may differ (their history has scrolled out);
+        # the EMA's memory of it fades geometrically instead of ending
+        skip = 30 if mode == 'ema' else 5
+        np.testing.assert_allclose(out[skip:], full[skip:], rtol=1e-4, err_msg=mode)
+
+
+def test_window_of_one_returns_the_input():
+    data = np.arange(5, dtype=np.float64)
+    assert Smoother('ema', 1).smooth('cpu', data) is data
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests for the preallocated ring-buffer time-series store."""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sysmon.store import MetricStore, TimeSeriesStore
+
+
+def fill(store, values):
+    for v in values:
+        store.append({'time': float(v), 'cpu': v * 10.0})
+
+
+def test_views_are_contiguous_and_ordered_after_wrap():
+    store = TimeSeriesStore(('time', 'cpu'), capacity=4)
+    fill(store, range(7))
+    assert len(store) == 4
+    view = store['time']
+    assert view.flags['C_CONTIGUOUS']
+    assert view.tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert store['cpu'].tolist() == [30.0, 40.0, 50.0, 60.0]
+    assert store.last('time') == 6.0
+
+
+def test_missing_columns_are_nan():
+    store = TimeSeriesStore(('time', 'cpu'), capacity=3)
+    store.append({'time': 1.0})
+    assert np.isnan(store['cpu'][0])
+
+
+def test_resize_keeps_newest_samples():
+    store = TimeSeriesStore(('time', 'cpu'), capacity=5)
+    fill(store, range(8))
+    store.resize(3)
+    assert store['time'].tolist() == [5.0, 6.0, 7.0]
+    store.append({'time': 8.0, 'cpu': 80.0})
+    assert store['time'].tolist() == [6.0, 7.0, 8.0]
+    store.resize(6)
+    fill(store, [9, 10])
+    assert store['time'].tolist() == [6.0, 7.0, 8.0, 9.0, 10.0]
+
+
+def test_clear():
+    store = TimeSeriesStore(('time',), capacity=2)
+    fill_time = [1.0, 2.0]
+    for t in fill_time:
+        store.append({'time': t})
+    store.clear()
+    assert len(store) == 0
+    assert store.last('time') is None
+    assert len(store['time']) == 0
+
+
+def test_matrix_column_rows_and_resize():
+    store = TimeSeriesStore(('time',), capacity=3)
+    store.append({'time': 0.0})
+    store.add_column('cpu_cores', 2)
+    for t in range(1, 5):
+        store.append({'time': float(t), 'cpu_cores': np.array([t, t * 2.0])})
+    cores = store['cpu_cores']
+    assert cores.shape == (3, 2)
+    assert cores[:, 1].tolist() == [4.0, 6.0, 8.0]
+    store.resize(2)
+    assert store['cpu_cores'].tolist() == [[3.0, 6.0], [4.0, 8.0]]
+    store.remove_column('cpu_cores')
+    assert 'cpu_cores' not in store
+
+
+def test_metric_store_groups_keep_their_own_timestamps():
+    store = MetricStore({'cpu': ('cpu',), 'swap': ('swap_percent',)}, capacity=4)
+    for t in range(6):
+        store.append('cpu', {'time': t * 0.5, 'cpu': float(t)})
+    store.append('swap', {'time': 2.0, 'swap_percent': 7.0})
+    store.resize({'swap': 2})
+    assert store['cpu'].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert store.times('cpu').tolist() == [1.0, 1.5, 2.0, 2.5]
+    assert store.times('swap_percent').tolist() == [2.0]
+    assert store.group('swap').capacity == 2
+    assert store.latest_time() == 2.5
+    assert 'swap_percent' in store and 'ram_percent' not in store
+
+
+def test_running_sums_follow_appends_evictions_and_resize():
+    store = TimeSeriesStore(('time', 'disk_read_mb'), capacity=4, summed=('disk_read_mb',))
+    for t in range(10):
+        store.append({'time': float(t), 'disk_read_mb': np.nan if t == 8 else t * 1.5})
+        assert store.sum('disk_read_mb') == np.nansum(store['disk_read_mb'])
+    store.resize(2)
+    assert store.sum('disk_read_mb') == 9 * 1.5
+    store.clear()
+    assert store.sum('disk_read_mb') == 0.0